@@ -0,0 +1,153 @@
+"""
+Execute whole action chunks (or interpolated physics substeps) in one call.
+
+`env.step` evaluates success, builds the observation and computes the reward
+after every control step, even when a chunked policy only looks at the
+observation after the last of its 16-50 actions. `ActionChunkExecutor`
+converts the whole chunk to one device tensor up front and runs the
+intermediate steps through the env's action/physics path only; info, reward
+and observations are computed just at the requested strides and at the end of
+the chunk.
+
+Because the intermediate steps bypass `env.step`, they also bypass every gym
+wrapper: RecordEpisode would miss frames, observation wrappers would not see
+the observations, and gymnasium's TimeLimit would stop counting. The executor
+therefore only accepts the wrappers gym.make adds to a ManiSkill env
+(order enforcing, env checker, ManiSkill's TimeLimitWrapper, which reads the
+base env's step counter) and raises for anything else; it reproduces the
+time limit truncation itself. Wrap the env with recorders etc. after the
+chunked rollout, or use env.step for those runs.
+
+For loops that drive a ManiSkillScene directly, `step_interpolated` moves the
+drive targets linearly to a goal over N physics substeps and only fetches GPU
+state after the last one.
+
+Usage:
+    executor = ActionChunkExecutor(env)
+    result = executor.step_chunk(actions)  # (H, num_envs, action_dim) or (H, action_dim)
+    obs = result.obs[-1]
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import gymnasium as gym
+import torch
+
+# wrappers whose per-step behaviour the executor reproduces or does not need
+SUPPORTED_WRAPPERS = ("OrderEnforcing", "PassiveEnvChecker", "TimeLimitWrapper")
+
+
+@dataclass
+class ChunkResult:
+    obs: List[Any] = field(default_factory=list)
+    """observations at the sampled steps (empty if obs were not requested)"""
+    steps: List[int] = field(default_factory=list)
+    """chunk index (0-based) of every sampled step"""
+    rewards: List[torch.Tensor] = field(default_factory=list)
+    """(num_envs,) reward at every sampled step"""
+    terminated: Optional[torch.Tensor] = None
+    truncated: Optional[torch.Tensor] = None
+    info: Dict[str, Any] = field(default_factory=dict)
+    """info of the last sampled step"""
+    num_steps: int = 0
+    """control steps actually executed (less than H if stopped on done)"""
+
+
+class ActionChunkExecutor:
+    """Runs H control steps of a ManiSkill env per call with per-step work kept to the physics."""
+
+    def __init__(self, env, max_episode_steps: Optional[int] = None):
+        wrapper = env
+        while isinstance(wrapper, gym.Wrapper):
+            name = type(wrapper).__name__
+            if name not in SUPPORTED_WRAPPERS:
+                raise ValueError(f"ActionChunkExecutor steps the unwrapped env and would bypass the {name} "
+                                 f"wrapper; only {', '.join(SUPPORTED_WRAPPERS)} are supported")
+            if name == "TimeLimitWrapper" and max_episode_steps is None:
+                max_episode_steps = wrapper._max_episode_steps
+            wrapper = wrapper.env
+        self.env = env.unwrapped
+        if max_episode_steps is None and env.spec is not None:
+            max_episode_steps = env.spec.max_episode_steps
+        self.max_episode_steps = max_episode_steps
+
+    def _terminated(self, info) -> torch.Tensor:
+        # same rule as BaseEnv.step
+        terminated = torch.zeros(self.env.num_envs, dtype=torch.bool, device=self.env.device)
+        if "success" in info:
+            terminated |= info["success"]
+        if "fail" in info:
+            terminated |= info["fail"]
+        return terminated
+
+    def step_chunk(self, actions, obs_stride: Optional[int] = None, return_obs: bool = True,
+                   stop_on_done: bool = True) -> ChunkResult:
+        """
+        Args:
+            actions: (H, num_envs, action_dim) or (H, action_dim), numpy or torch.
+            obs_stride: also evaluate info/reward/obs every `obs_stride` steps; None = only after the last step.
+            return_obs: compute observations at the sampled steps (info and reward are always computed there).
+            stop_on_done: end the chunk at the first sampled step where any env terminated or was truncated.
+        """
+        env = self.env
+        actions = torch.as_tensor(actions, dtype=torch.float32, device=env.device)
+        if actions.ndim == 2:
+            actions = actions[:, None].expand(-1, env.num_envs, -1)
+        horizon = actions.shape[0]
+
+        result = ChunkResult()
+        for t in range(horizon):
+            action = env._step_action(actions[t])
+            env._elapsed_steps += 1
+            last = t == horizon - 1
+            if not last and (obs_stride is None or (t + 1) % obs_stride != 0):
+                continue
+
+            info = env.get_info()
+            obs = env.get_obs(info) if return_obs else None
+            reward = env.get_reward(obs=obs, action=action, info=info)
+            terminated = self._terminated(info)
+            if self.max_episode_steps is not None:
+                truncated = torch.as_tensor(env._elapsed_steps >= self.max_episode_steps, device=env.device)
+                truncated = truncated.expand(env.num_envs)
+            else:
+                truncated = torch.zeros_like(terminated)
+
+            if return_obs:
+                result.obs.append(obs)
+                env._last_obs = obs
+            result.steps.append(t)
+            result.rewards.append(reward)
+            result.terminated, result.truncated, result.info = terminated, truncated, info
+            result.num_steps = t + 1
+            if stop_on_done and (terminated | truncated).any():
+                break
+        return result
+
+
+def step_interpolated(scene, robot, target_qpos: torch.Tensor, num_substeps: int,
+                      joint_indices: Optional[torch.Tensor] = None):
+    """
+    Move the drive targets of `robot` linearly from their current value to
+    `target_qpos` over `num_substeps` physics steps of `scene`.
+
+    Args:
+        target_qpos: (num_envs, dof) goal targets, or (num_envs, len(joint_indices)).
+        joint_indices: active joint indices `target_qpos` refers to; None = all active joints.
+    """
+    start = robot.get_drive_targets()
+    if joint_indices is not None:
+        start = start[:, joint_indices]
+    target_qpos = torch.as_tensor(target_qpos, dtype=start.dtype, device=start.device)
+    alphas = torch.arange(1, num_substeps + 1, dtype=start.dtype, device=start.device) / num_substeps
+    targets = start[None] + alphas[:, None, None] * (target_qpos - start)[None]
+
+    for k in range(num_substeps):
+        robot.set_joint_drive_targets(targets[k], joint_indices=joint_indices)
+        if scene.gpu_sim_enabled:
+            scene._gpu_apply_all()
+        scene.step()
+    # intermediate GPU states are never read, fetch once at the end
+    if scene.gpu_sim_enabled:
+        scene._gpu_fetch_all()
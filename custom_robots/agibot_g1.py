@@ -5,41 +5,82 @@ from mani_skill.agents.controllers import *
 from mani_skill.agents.registration import register_agent
 from mani_skill.sensors.camera import CameraConfig
 
-K_D455_1280x720 = np.array([
-    [925.0,   0.0, 640.0],
-    [  0.0, 925.0, 360.0],
-    [  0.0,   0.0,   1.0],
-    ], dtype=np.float32)
+from camera_registry import DEFAULT_SENSOR_CAMERAS, sensor_configs
+from collision_filter import apply_cached_filter
+from joint_freezing import (FrozenJointMap, freeze_joints_urdf, freeze_all_but, with_mimic_followers,
+                            G1_120S_ACTIVE_JOINTS, LEFT_ARM_JOINTS, LEFT_GRIPPER_120S_JOINTS)
+
+
+class AgibotG1Base(BaseAgent):
+    """Shared loading behaviour of the AgibotG1 variants."""
+    frozen_joints = {}
+    """active joints turned into fixed joints at load time, name -> frozen position (see joint_freezing.py)"""
+    full_joint_names = None
+    """active joints of the unfrozen URDF in qpos order, needed to map frozen qpos back to the full robot"""
+
+    def _load_articulation(self, *args, **kwargs):
+        # the URDF the variant is based on; _after_loading_articulation runs while urdf_path is swapped
+        self.full_urdf_path = self.urdf_path
+        if not self.frozen_joints:
+            return super()._load_articulation(*args, **kwargs)
+        if self.full_joint_names is None:
+            raise ValueError(f"{type(self).__name__} sets frozen_joints but not full_joint_names, "
+                             "which is needed to map frozen qpos back to the full robot")
+        full_urdf = self.urdf_path
+        # mimic followers of frozen joints get frozen as well
+        frozen = with_mimic_followers(str(full_urdf), self.frozen_joints)
+        self.urdf_path = freeze_joints_urdf(str(full_urdf), frozen)
+        try:
+            super()._load_articulation(*args, **kwargs)
+        finally:
+            self.urdf_path = full_urdf
+        self.joint_map = FrozenJointMap.for_robot(self.full_joint_names, self.robot, frozen)
+
+    def _after_loading_articulation(self):
+        super()._after_loading_articulation()
+        # prune never/always-touching link pairs if collision_filter.py has been run for this URDF;
+        # frozen variants reuse the full URDF's filter (same link names)
+        if apply_cached_filter(self.robot, str(self.full_urdf_path)):
+            print(f"Applied cached self-collision filter for {self.uid}")
+
     
 @register_agent()
-class AgibotG1OmniPicker(BaseAgent):
+class AgibotG1OmniPicker(AgibotG1Base):
     uid="agibot_g1_omni_picker"
     # urdf_path="robot_descriptions/agibot_g1_description/urdf/agibot_g1_omni-picker.urdf"
     urdf_path="robot_descriptions/manipulation/Agibot/agibot_g1_with_gripper_description/agibot_g1_with_omnipicker.urdf"
     fix_root_link=True
+    camera_uids=DEFAULT_SENSOR_CAMERAS
+    """registered cameras to mount (camera_registry.AGIBOT_G1_CAMERAS); add the wrist cameras in a subclass"""
+    camera_quality=None
+    """render quality tier for all cameras (see render_quality.py); None keeps the per-profile "fast" default"""
         
     @property
     def _sensor_configs(self):
-        return [
-            CameraConfig(
-                uid="head_camera",
-                pose=sapien.Pose(p=[0, 0, 0], q=[0.707, 0, 0.707, 0]),
-                width=1280,
-                height=720,
-                intrinsic=K_D455_1280x720,
-                # fov=np.pi / 2,
-                near=0.01,
-                far=10,
-                mount=self.robot.links_map["head_camera"],
-            )
-        ]
-    
+        # cameras described in camera_registry.AGIBOT_G1_CAMERAS; only the head camera by default
+        return sensor_configs(self.robot.links_map, self.camera_uids, quality=self.camera_quality)
+
+
+@register_agent()
+class AgibotG1OmniPickerWristCameras(AgibotG1OmniPicker):
+    """OmniPicker G1 that also mounts both wrist cameras (three renders per env and step)."""
+    uid="agibot_g1_omni_picker_wrist_cameras"
+    camera_uids=["head_camera", "left_wrist_camera", "right_wrist_camera"]
+
 @register_agent() 
-class AgibotG1120s(BaseAgent):
+class AgibotG1120s(AgibotG1Base):
     uid="agibot_g1_120s"
     urdf_path="robot_descriptions/agibot_g1_with_gripper_description/agibot_g1_with_120s.urdf"
     fix_root_link=True
-    
+    full_joint_names=G1_120S_ACTIVE_JOINTS
+
+
+@register_agent()
+class AgibotG1120sLeftArm(AgibotG1120s):
+    """Fixed-base G1 with only the left arm and gripper active; wheels, waist, head and right arm are frozen at 0."""
+    uid="agibot_g1_120s_left_arm"
+    frozen_joints=freeze_all_but(G1_120S_ACTIVE_JOINTS, LEFT_ARM_JOINTS + LEFT_GRIPPER_120S_JOINTS)
+
 # import mani_skill.envs
 # import gymnasium as gym
 # env = gym.make("EmptyEnv-v1", robot_uids="agibot_g1")
@@ -0,0 +1,267 @@
+"""
+Calibration registry for every camera mounted on the AgibotG1.
+
+Each camera is described once (intrinsics, distortion, resolution, clipping
+planes and mount transform relative to its link) and everything else is
+derived from that single entry:
+- `sensor_configs` builds the agent's CameraConfigs (shader pack from the
+  profile's render quality tier),
+- `add_registered_camera` adds the same camera to a bare ManiSkillScene,
+- `CameraRegistry` holds the stacked K / mount matrices as tensors and returns
+  world-from-camera matrices for all cameras and all envs in one batched op,
+  plus cached pixel rays for back-projecting depth into point clouds.
+
+Camera frames follow the OpenCV convention (x right, y down, z forward).
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+
+import numpy as np
+import sapien
+import torch
+from mani_skill.sensors.camera import CameraConfig
+
+from render_quality import RenderQualityTier, apply_shader_pack, get_tier
+
+K_D455_1280x720 = np.array([
+    [925.0,   0.0, 640.0],
+    [  0.0, 925.0, 360.0],
+    [  0.0,   0.0,   1.0],
+    ], dtype=np.float32)
+
+# Far clipping planes per camera profile (metres). The head camera only needs
+# the tabletop workspace in front of the robot and the wrist cameras only the
+# gripper's reach, so anything past these distances is never worth rendering.
+CAMERA_FAR = {
+    "head": 4.0,
+    "wrist": 1.5,
+}
+
+# Render quality tier per camera profile (see render_quality.py). All sensor
+# cameras default to "fast" (ManiSkill's "minimal" shader pack, no shadows) so
+# sensor_data rendering costs the same as with ManiSkill's defaults; higher
+# tiers are opt-in via the `quality` argument of sensor_configs /
+# add_registered_camera or an agent's `camera_quality`.
+CAMERA_QUALITY = {
+    "head": "fast",
+    "wrist": "fast",
+}
+
+# SAPIEN camera links look along +x with +z up; columns are the OpenCV axes
+# expressed in that frame
+SAPIEN_FROM_CV = np.array([
+    [ 0.0,  0.0, 1.0],
+    [-1.0,  0.0, 0.0],
+    [ 0.0, -1.0, 0.0],
+    ], dtype=np.float32)
+
+
+def rpy_to_quat(roll, pitch, yaw):
+    """Convert roll/pitch/yaw (URDF convention) to a wxyz quaternion."""
+    cy = np.cos(yaw * 0.5)
+    sy = np.sin(yaw * 0.5)
+    cp = np.cos(pitch * 0.5)
+    sp = np.sin(pitch * 0.5)
+    cr = np.cos(roll * 0.5)
+    sr = np.sin(roll * 0.5)
+
+    qw = cr * cp * cy + sr * sp * sy
+    qx = sr * cp * cy - cr * sp * sy
+    qy = cr * sp * cy + sr * cp * sy
+    qz = cr * cp * sy - sr * sp * cy
+
+    return np.array([qw, qx, qy, qz])
+
+
+def intrinsic_from_fovy(width: int, height: int, fovy: float) -> np.ndarray:
+    """Pinhole K with square pixels and a centered principal point."""
+    f = 0.5 * height / np.tan(0.5 * fovy)
+    return np.array([
+        [f, 0.0, 0.5 * width],
+        [0.0, f, 0.5 * height],
+        [0.0, 0.0, 1.0],
+        ], dtype=np.float32)
+
+
+@dataclass
+class CameraCalibration:
+    uid: str
+    mount_link: str
+    width: int
+    height: int
+    intrinsic: np.ndarray
+    mount_pose: sapien.Pose
+    """camera link pose relative to `mount_link` (SAPIEN camera convention)"""
+    profile: str
+    """key into CAMERA_FAR / CAMERA_QUALITY, e.g. "head" or "wrist" """
+    near: float = 0.01
+    distortion: np.ndarray = field(default_factory=lambda: np.zeros(5, dtype=np.float32))
+    """OpenCV (k1, k2, p1, p2, k3). SAPIEN renders an ideal pinhole, so this is only
+    carried along for consumers that need to match a real sensor."""
+
+    @property
+    def far(self) -> float:
+        return CAMERA_FAR[self.profile]
+
+    @property
+    def quality(self) -> RenderQualityTier:
+        return get_tier(CAMERA_QUALITY[self.profile])
+
+    def resized(self, width: Optional[int] = None, height: Optional[int] = None) -> "CameraCalibration":
+        """The same camera rendering at another resolution (intrinsics scaled accordingly)."""
+        width = self.width if width is None else width
+        height = self.height if height is None else height
+        scale = np.array([[width / self.width], [height / self.height], [1.0]], dtype=np.float32)
+        return replace(self, width=width, height=height, intrinsic=self.intrinsic * scale)
+
+    def mount_matrix(self) -> np.ndarray:
+        """4x4 transform from the OpenCV camera frame to the mount link frame."""
+        T = self.mount_pose.to_transformation_matrix().astype(np.float32)
+        T[:3, :3] = T[:3, :3] @ SAPIEN_FROM_CV
+        return T
+
+
+# Ref: https://github.com/fiveages-sim/robot_descriptions/blob/main/humanoid/Agibot/agibot_g1_description/xacro/omnipicker_camera_stand.xacro
+_WRIST_MOUNT = sapien.Pose(p=[0, -0.07754, 0.028618], q=rpy_to_quat(0, -1.117, 1.5708))
+
+AGIBOT_G1_CAMERAS: Dict[str, CameraCalibration] = {
+    "head_camera": CameraCalibration(
+        uid="head_camera",
+        mount_link="head_camera",
+        width=1280,
+        height=720,
+        intrinsic=K_D455_1280x720,
+        # +90 degree around Y axis
+        mount_pose=sapien.Pose(p=[0, 0, 0], q=[0.707, 0, 0.707, 0]),
+        profile="head",
+    ),
+    "left_wrist_camera": CameraCalibration(
+        uid="left_wrist_camera",
+        mount_link="left_camera_stand",
+        width=640,
+        height=480,
+        intrinsic=intrinsic_from_fovy(640, 480, np.pi / 2),
+        mount_pose=_WRIST_MOUNT,
+        profile="wrist",
+    ),
+    "right_wrist_camera": CameraCalibration(
+        uid="right_wrist_camera",
+        mount_link="right_camera_stand",
+        width=640,
+        height=480,
+        intrinsic=intrinsic_from_fovy(640, 480, np.pi / 2),
+        mount_pose=_WRIST_MOUNT,
+        profile="wrist",
+    ),
+}
+
+
+# cameras an agent mounts unless it asks for more; every extra camera is one
+# more render per env per step, so the wrist cameras are opt-in
+DEFAULT_SENSOR_CAMERAS = ["head_camera"]
+
+
+def sensor_configs(links_map, uids: Optional[List[str]] = None, quality: Optional[str] = None) -> List[CameraConfig]:
+    """
+    CameraConfigs for the registered cameras `uids` (default: DEFAULT_SENSOR_CAMERAS),
+    mounted on links from `links_map`.
+    `quality` overrides the per-profile render quality tier for all cameras.
+    """
+    uids = DEFAULT_SENSOR_CAMERAS if uids is None else uids
+    configs = []
+    for uid in uids:
+        calib = AGIBOT_G1_CAMERAS[uid]
+        tier = calib.quality if quality is None else get_tier(quality)
+        configs.append(CameraConfig(
+            uid=uid,
+            pose=calib.mount_pose,
+            width=calib.width,
+            height=calib.height,
+            intrinsic=calib.intrinsic,
+            near=calib.near,
+            far=calib.far,
+            mount=links_map[calib.mount_link],
+            shader_pack=tier.shader_pack,
+        ))
+    return configs
+
+
+def add_registered_camera(scene, robot, uid: str, quality: Optional[str] = None,
+                          width: Optional[int] = None, height: Optional[int] = None):
+    """Add a registered camera to a ManiSkillScene, mounted on `robot`, optionally at another resolution."""
+    calib = AGIBOT_G1_CAMERAS[uid].resized(width, height)
+    tier = calib.quality if quality is None else get_tier(quality)
+    apply_shader_pack(tier)
+    camera = scene.add_camera(
+        name=uid,
+        mount=robot.links_map[calib.mount_link],
+        pose=calib.mount_pose,
+        width=calib.width,
+        height=calib.height,
+        intrinsic=calib.intrinsic,
+        near=calib.near,
+        far=calib.far,
+    )
+    # render_quality.read_texture picks the textures this pack provides
+    camera.shader_pack = tier.shader_pack
+    return camera
+
+
+class CameraRegistry:
+    """Stacked, device-resident calibration for a fixed set of cameras."""
+
+    def __init__(self, uids: Optional[List[str]] = None, device="cpu"):
+        self.uids = list(AGIBOT_G1_CAMERAS.keys()) if uids is None else list(uids)
+        self.calibs = [AGIBOT_G1_CAMERAS[uid] for uid in self.uids]
+        self.device = torch.device(device)
+        self.intrinsics = torch.as_tensor(np.stack([c.intrinsic for c in self.calibs]), device=self.device)
+        self.mounts = torch.as_tensor(np.stack([c.mount_matrix() for c in self.calibs]), device=self.device)
+        self._rays: Dict[str, torch.Tensor] = {}
+
+    def index(self, uid: str) -> int:
+        return self.uids.index(uid)
+
+    def mount_link_poses(self, robot) -> torch.Tensor:
+        """(C, N, 4, 4) world poses of every camera's mount link."""
+        return torch.stack([
+            robot.links_map[c.mount_link].pose.to_transformation_matrix() for c in self.calibs
+        ]).to(self.device)
+
+    def world_from_camera(self, link_poses: torch.Tensor) -> torch.Tensor:
+        """(C, N, 4, 4) world-from-OpenCV-camera matrices from stacked mount link poses."""
+        return link_poses @ self.mounts[:, None]
+
+    def camera_from_world(self, link_poses: torch.Tensor) -> torch.Tensor:
+        """(C, N, 4, 4) extrinsics (inverse of `world_from_camera`), using the rigid-transform inverse."""
+        T = self.world_from_camera(link_poses)
+        R_t = T[..., :3, :3].transpose(-1, -2)
+        out = torch.zeros_like(T)
+        out[..., :3, :3] = R_t
+        out[..., :3, 3] = -(R_t @ T[..., :3, 3:4])[..., 0]
+        out[..., 3, 3] = 1
+        return out
+
+    def pixel_rays(self, uid: str) -> torch.Tensor:
+        """(H, W, 3) rays K^-1 [u, v, 1] for a camera, computed once and cached."""
+        if uid not in self._rays:
+            calib = AGIBOT_G1_CAMERAS[uid]
+            v, u = torch.meshgrid(
+                torch.arange(calib.height, device=self.device, dtype=torch.float32) + 0.5,
+                torch.arange(calib.width, device=self.device, dtype=torch.float32) + 0.5,
+                indexing="ij",
+            )
+            pixels = torch.stack([u, v, torch.ones_like(u)], dim=-1)
+            self._rays[uid] = pixels @ torch.linalg.inv(self.intrinsics[self.index(uid)]).T
+        return self._rays[uid]
+
+    def depth_to_pointcloud(self, uid: str, depth: torch.Tensor, world_from_camera: Optional[torch.Tensor] = None):
+        """
+        Back-project (N, H, W) z-depth in metres into (N, H, W, 3) points, in the
+        camera frame or, if `world_from_camera` (N, 4, 4) is given, in the world frame.
+        """
+        points = self.pixel_rays(uid) * depth[..., None]
+        if world_from_camera is None:
+            return points
+        R, t = world_from_camera[:, :3, :3], world_from_camera[:, None, None, :3, 3]
+        return torch.einsum("nij,nhwj->nhwi", R, points) + t
@@ -0,0 +1,261 @@
+"""
+Automatic self-collision filtering for the G1 articulation.
+
+Many link pairs of the 36-joint G1 can never touch (left gripper vs. right
+wheel) or touch in every configuration (gripper finger pairs), yet PhysX
+keeps generating broadphase pairs / contacts for them. This tool
+
+1. samples the configuration space once (random qpos within joint limits,
+   one physics step each) and counts, per link pair, in how many samples
+   the pair was in contact,
+2. marks pairs that were never or always in contact as filtered,
+3. covers the filtered pairs with cliques and assigns each clique one bit of
+   collision group 2 (shapes sharing a group-2 bit do not collide),
+4. caches the result as JSON next to the URDF (invalidated when the URDF
+   changes) and applies it at load time.
+
+Pairs that would need more cliques than `max_bits` stay enabled, which is
+always safe. The highest group-2 bits are left free because ManiSkill uses
+them for robot/ground filtering.
+
+Group-2 bits are not scoped to one articulation: PhysX skips contacts between
+any two shapes that share a bit (and the same group-3 value, which ManiSkill
+leaves at 0 for the robot/ground rule). So the filter is for scenes with a
+single filtered G1 per (sub-)scene; `apply_collision_filter` raises if other
+shapes already in the scene (a second G1, actors using group-2 bits) carry
+any of its bits. Actors added after the robot are not checked.
+
+Usage:
+    python custom_robots/collision_filter.py --urdf robot_descriptions/.../agibot_g1_with_120s.urdf
+    # afterwards AgibotG1 agents apply the cached filter automatically
+"""
+
+import hashlib
+import itertools
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+CACHE_SUFFIX = ".collision_filter.json"
+GROUP = 2
+
+
+def cache_path(urdf_path: str) -> str:
+    return os.path.splitext(urdf_path)[0] + CACHE_SUFFIX
+
+
+def urdf_hash(urdf_path: str) -> str:
+    with open(urdf_path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def sample_contact_counts(urdf_path: str, num_samples: int = 2000, seed: int = 0,
+                          separation: float = 0.0) -> Tuple[List[str], np.ndarray]:
+    """
+    Count, for every link pair, in how many random configurations it is in contact.
+
+    Returns the link names and a symmetric (L, L) int matrix of counts.
+    """
+    from mani_skill.envs.scene import ManiSkillScene
+    from mani_skill.envs.utils.system.backend import BackendInfo
+    from mani_skill.utils.structs.types import SimConfig
+
+    backend = BackendInfo(device="cpu", sim_device="cpu", sim_backend="physx", render_backend="none", render_device=None)
+    scene = ManiSkillScene(sim_config=SimConfig(sim_freq=100, control_freq=100), backend=backend)
+    loader = scene.create_urdf_loader()
+    loader.fix_root_link = True
+    robot = loader.load(urdf_path)
+
+    link_names = [link.name for link in robot.links]
+    index = {link._objs[0]: i for i, link in enumerate(robot.links)}
+    qlimits = robot.get_qlimits()[0].cpu().numpy()
+    # unbounded (continuous) joints get one full turn
+    low = np.where(np.isfinite(qlimits[:, 0]), qlimits[:, 0], -np.pi)
+    high = np.where(np.isfinite(qlimits[:, 1]), qlimits[:, 1], np.pi)
+
+    rng = np.random.default_rng(seed)
+    counts = np.zeros((len(link_names), len(link_names)), dtype=np.int64)
+    for _ in range(num_samples):
+        robot.set_qpos(rng.uniform(low, high)[None].astype(np.float32))
+        robot.set_qvel(np.zeros((1, len(low)), dtype=np.float32))
+        scene.step()
+        touching = np.zeros_like(counts, dtype=bool)
+        for contact in scene.px.get_contacts():
+            a, b = index.get(contact.bodies[0]), index.get(contact.bodies[1])
+            if a is None or b is None or a == b:
+                continue
+            if any(p.separation <= separation for p in contact.points):
+                touching[a, b] = touching[b, a] = True
+        counts += touching
+    return link_names, counts
+
+
+def filtered_pairs(counts: np.ndarray, num_samples: int) -> List[Tuple[int, int]]:
+    """Pairs that were in contact in none or in all of the samples."""
+    n = counts.shape[0]
+    return [(i, j) for i, j in itertools.combinations(range(n), 2)
+            if counts[i, j] == 0 or counts[i, j] == num_samples]
+
+
+def clique_cover(num_links: int, pairs: List[Tuple[int, int]], max_bits: int) -> List[List[int]]:
+    """
+    Greedily cover the filtered-pair graph with at most `max_bits` cliques.
+    Each clique becomes one collision bit, so every pair inside it is filtered.
+    """
+    adjacent = np.zeros((num_links, num_links), dtype=bool)
+    for i, j in pairs:
+        adjacent[i, j] = adjacent[j, i] = True
+    uncovered = adjacent.copy()
+    cliques = []
+    while uncovered.any() and len(cliques) < max_bits:
+        # seed with the link that has the most uncovered filtered pairs
+        seed = int(uncovered.sum(axis=1).argmax())
+        clique = [seed]
+        # prefer candidates that cover many uncovered pairs
+        candidates = sorted(np.flatnonzero(adjacent[seed]),
+                            key=lambda k: -int(uncovered[seed, k]) - uncovered[k].sum() * 1e-3)
+        for k in candidates:
+            if all(adjacent[k, m] for m in clique):
+                clique.append(int(k))
+        for a, b in itertools.combinations(clique, 2):
+            uncovered[a, b] = uncovered[b, a] = False
+        cliques.append(sorted(clique))
+    return cliques
+
+
+@dataclass
+class CollisionFilter:
+    link_names: List[str]
+    link_bits: Dict[str, int]
+    """group-2 bitmask per link name"""
+    num_samples: int
+    num_filtered_pairs: int
+    num_covered_pairs: int
+    urdf_sha1: str
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.__dict__, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "CollisionFilter":
+        with open(path) as f:
+            return cls(**json.load(f))
+
+
+def build_collision_filter(urdf_path: str, num_samples: int = 2000, seed: int = 0, max_bits: int = 24) -> CollisionFilter:
+    link_names, counts = sample_contact_counts(urdf_path, num_samples, seed)
+    return filter_from_counts(link_names, counts, num_samples, max_bits, urdf_hash(urdf_path))
+
+
+def filter_from_counts(link_names: List[str], counts: np.ndarray, num_samples: int, max_bits: int,
+                       urdf_sha1: str) -> CollisionFilter:
+    pairs = filtered_pairs(counts, num_samples)
+    cliques = clique_cover(len(link_names), pairs, max_bits)
+    masks = [0] * len(link_names)
+    covered = set()
+    for bit, clique in enumerate(cliques):
+        for link in clique:
+            masks[link] |= 1 << bit
+        covered.update(itertools.combinations(clique, 2))
+    return CollisionFilter(
+        link_names=link_names,
+        link_bits={name: mask for name, mask in zip(link_names, masks) if mask != 0},
+        num_samples=num_samples,
+        num_filtered_pairs=len(pairs),
+        num_covered_pairs=len(covered),
+        urdf_sha1=urdf_sha1,
+    )
+
+
+def load_cached_filter(urdf_path: str) -> Optional[CollisionFilter]:
+    """The cached filter for `urdf_path`, or None if missing or built from a different URDF."""
+    path = cache_path(urdf_path)
+    if not os.path.exists(path):
+        return None
+    collision_filter = CollisionFilter.load(path)
+    if collision_filter.urdf_sha1 != urdf_hash(urdf_path):
+        return None
+    return collision_filter
+
+
+def _collision_shapes(struct):
+    """Collision shapes of a ManiSkill actor or link struct, in every sub-scene."""
+    for obj in struct._objs:
+        for component in getattr(obj, "components", [obj]):
+            yield from getattr(component, "collision_shapes", [])
+
+
+def scene_group_bits(scene) -> int:
+    """OR of the group-2 bits of every collision shape currently in `scene`."""
+    bits = 0
+    structs = list(scene.actors.values())
+    for articulation in scene.articulations.values():
+        structs += articulation.links
+    for struct in structs:
+        for shape in _collision_shapes(struct):
+            bits |= shape.get_collision_groups()[GROUP]
+    return bits
+
+
+def apply_collision_filter(robot, collision_filter: CollisionFilter):
+    """
+    OR each link's bitmask into collision group 2 of all its collision shapes (every sub-scene).
+    Raises if another shape in the scene already uses one of the bits, since it
+    would then stop colliding with the robot's links.
+    """
+    filter_bits = 0
+    for mask in collision_filter.link_bits.values():
+        filter_bits |= mask
+    clash = scene_group_bits(robot.scene) & filter_bits
+    if clash:
+        raise RuntimeError(f"Collision group-2 bits {clash:#x} of the self-collision filter are already used in the "
+                           "scene (e.g. by another filtered robot); the filter only supports one robot per scene")
+    for link in robot.links:
+        mask = collision_filter.link_bits.get(link.name, 0)
+        if mask == 0:
+            continue
+        for component in link._objs:
+            for shape in component.collision_shapes:
+                groups = shape.get_collision_groups()
+                groups[GROUP] |= mask
+                shape.set_collision_groups(groups)
+
+
+def apply_cached_filter(robot, urdf_path: str) -> bool:
+    """Apply the cached filter if there is a valid one; returns whether it was applied."""
+    collision_filter = load_cached_filter(urdf_path)
+    if collision_filter is None:
+        return False
+    apply_collision_filter(robot, collision_filter)
+    return True
+
+
+@dataclass
+class Args:
+    urdf: str = "robot_descriptions/agibot_g1_with_gripper_description/agibot_g1_with_120s.urdf"
+    num_samples: int = 2000
+    seed: int = 0
+    max_bits: int = 24
+    """group-2 bits to use, starting from bit 0"""
+
+
+def main(args: Args):
+    collision_filter = build_collision_filter(args.urdf, args.num_samples, args.seed, args.max_bits)
+    path = cache_path(args.urdf)
+    collision_filter.save(path)
+    n = len(collision_filter.link_names)
+    print(f"{n} links, {n * (n - 1) // 2} pairs")
+    print(f"never/always in contact over {args.num_samples} samples: {collision_filter.num_filtered_pairs} pairs")
+    num_bits = max((m.bit_length() for m in collision_filter.link_bits.values()), default=0)
+    print(f"filtered with {num_bits} collision bits: {collision_filter.num_covered_pairs} pairs")
+    print(f"Saved to {path}")
+
+
+if __name__ == "__main__":
+    import tyro
+
+    main(tyro.cli(Args))
@@ -0,0 +1,122 @@
+"""
+Batched contact / grasp-force readout for the G1 gripper links.
+
+`GripperContactSensor` reports, every step, the contact force between each
+gripper link (the child links of the `idx..._gripper_...` joints) and each
+tracked object as one (N, L, O, 3) tensor for all envs:
+
+- GPU sim: one contact-pair impulse query over every (link, object, env)
+  body pair is created once; each update is a single
+  `gpu_query_contact_pair_impulses` call and a reshape.
+- CPU sim: one `scene.px.get_contacts()` pass, with the bodies looked up in a
+  prebuilt dict instead of per-pair checks.
+
+Forces are the summed contact impulses over the last physics step divided by
+the timestep, signed like ManiSkill's pairwise contact queries for the
+(link, object) pair on both backends. Grasp checks and tactile
+observations are derived from that tensor.
+
+Usage:
+    sensor = GripperContactSensor(env.unwrapped.scene, env.agent.robot, [cube])
+    env.step(action)
+    forces = sensor.update()            # (N, L, O, 3)
+    grasped = sensor.is_grasping("left")  # (N, O)
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import torch
+
+from joint_freezing import LEFT_GRIPPER_120S_JOINTS, RIGHT_GRIPPER_120S_JOINTS
+
+GRIPPER_JOINTS = LEFT_GRIPPER_120S_JOINTS + RIGHT_GRIPPER_120S_JOINTS
+
+
+class GripperContactSensor:
+    """Per gripper link, per object contact forces for every env from one contact query."""
+
+    def __init__(self, scene, robot, objects: Sequence, joint_names: Optional[List[str]] = None):
+        """
+        Args:
+            scene: the ManiSkillScene.
+            robot: the G1 articulation.
+            objects: ManiSkill Actors (one handle covering all envs) to measure contacts with.
+            joint_names: gripper joints whose child links are sensed; defaults to all gripper joints.
+        """
+        self.scene = scene
+        self.joint_names = GRIPPER_JOINTS if joint_names is None else list(joint_names)
+        self.links = [robot.active_joints_map[name].child_link for name in self.joint_names]
+        self.objects = list(objects)
+        self.num_envs = scene.num_envs
+        self.forces = torch.zeros((self.num_envs, len(self.links), len(self.objects), 3), device=scene.device)
+        self._query = None
+
+        if not scene.gpu_sim_enabled:
+            # physx body -> (env, link index) / (env, object index)
+            self._link_index: Dict = {}
+            self._object_index: Dict = {}
+            for j, obj in enumerate(self.objects):
+                for env_idx, body in zip(obj._scene_idxs.tolist(), obj._bodies):
+                    self._object_index[body] = (env_idx, j)
+            for i, link in enumerate(self.links):
+                for env_idx, body in zip(link._scene_idxs.tolist(), link._bodies):
+                    self._link_index[body] = (env_idx, i)
+
+    def _gpu_query(self):
+        # body pairs ordered (link, object, env) so the result reshapes to (L, O, N, 3)
+        pairs = [
+            (link_body, obj_body)
+            for link in self.links
+            for obj in self.objects
+            for link_body, obj_body in zip(link._bodies, obj._bodies)
+        ]
+        return self.scene.px.gpu_create_contact_pair_impulse_query(pairs)
+
+    def update(self) -> torch.Tensor:
+        """Read the contacts of the last physics step; returns the (N, L, O, 3) link/object forces."""
+        dt = self.scene.timestep
+        if self.scene.gpu_sim_enabled:
+            if self._query is None:
+                self._query = self._gpu_query()
+            self.scene.px.gpu_query_contact_pair_impulses(self._query)
+            impulses = self._query.cuda_impulses.torch().clone()
+            impulses = impulses.view(len(self.links), len(self.objects), self.num_envs, 3)
+            self.forces = impulses.permute(2, 0, 1, 3) / dt
+            return self.forces
+
+        forces = torch.zeros_like(self.forces)
+        for contact in self.scene.px.get_contacts():
+            body0, body1 = contact.bodies
+            if body0 in self._link_index and body1 in self._object_index:
+                (env_idx, i), (_, j), sign = self._link_index[body0], self._object_index[body1], 1.0
+            elif body1 in self._link_index and body0 in self._object_index:
+                (env_idx, i), (_, j), sign = self._link_index[body1], self._object_index[body0], -1.0
+            else:
+                continue
+            # same sign rule as mani_skill's get_pairwise_contact_impulse(contacts, link, obj)
+            impulse = sum(point.impulse for point in contact.points)
+            forces[env_idx, i, j] += sign * torch.as_tensor(impulse, dtype=torch.float32, device=forces.device)
+        self.forces = forces / dt
+        return self.forces
+
+    def force_norms(self) -> torch.Tensor:
+        """(N, L, O) contact force magnitudes, e.g. as a tactile observation."""
+        return torch.linalg.norm(self.forces, dim=-1)
+
+    def in_contact(self, min_force: float = 0.5) -> torch.Tensor:
+        """(N, L, O) whether each link touches each object with at least `min_force` newtons."""
+        return self.force_norms() >= min_force
+
+    def _link_mask(self, keyword: str) -> torch.Tensor:
+        return torch.tensor([keyword in name for name in self.joint_names], device=self.forces.device)
+
+    def is_grasping(self, side: str = "left", min_force: float = 0.5) -> torch.Tensor:
+        """
+        (N, O) whether the `side` ("left" / "right") gripper holds each object:
+        some outer-finger link and some inner-finger link both touch it.
+        """
+        contact = self.in_contact(min_force)
+        hand = self._link_mask(f"_gripper_{side[0]}_")
+        outer = contact[:, hand & self._link_mask("_outer_")].any(dim=1)
+        inner = contact[:, hand & self._link_mask("_inner_")].any(dim=1)
+        return outer & inner
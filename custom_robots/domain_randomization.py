@@ -0,0 +1,201 @@
+"""
+Lighting, material and camera-pose randomization without rebuilding the scene.
+
+Rebuilding actors to get new colors or lights costs more than an episode.
+`DomainRandomizer` instead keeps handles to the existing render objects of
+every sub-scene (lights, render materials, cameras) and, between episodes,
+samples new parameters for all parallel envs in one batched draw and writes
+them straight into those objects:
+
+- ambient light, light colors and directional light directions
+- material base color (multiplicative jitter around the original), roughness
+  and metallic
+- camera mount poses (position / small-angle rotation noise around the
+  original local pose)
+
+All draws come from one seeded numpy Generator so runs are reproducible.
+
+Materials that are shared between sub-scenes (ManiSkill's ActorBuilder reuses
+one RenderMaterial for every copy it builds) can only take one value, so they
+are randomized per material rather than per env; build actors per scene_idx
+with their own materials if per-env colors are needed.
+
+Usage:
+    randomizer = DomainRandomizer(scene, cameras=list(agent.sensors.values()), seed=0)
+    for episode in range(n):
+        env.reset()
+        randomizer.randomize()
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+import sapien
+
+
+@dataclass
+class RandomizationConfig:
+    ambient: Tuple[float, float] = (0.2, 0.6)
+    """range of the (grey) ambient light intensity"""
+    light_color_jitter: float = 0.2
+    """relative per-channel jitter of every light's original color"""
+    light_direction_cone: float = 0.35
+    """max angle (rad) between the original and randomized directional light direction"""
+    base_color_jitter: float = 0.15
+    """relative per-channel jitter of material base colors"""
+    roughness: Optional[Tuple[float, float]] = (0.2, 0.9)
+    metallic: Optional[Tuple[float, float]] = (0.0, 0.3)
+    camera_pos_std: float = 0.005
+    """std (m) of camera position noise"""
+    camera_rot_std: float = 0.01
+    """std (rad) of camera rotation noise"""
+
+
+def quat_multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Batched wxyz quaternion product a * b."""
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack([
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ], axis=-1)
+
+
+def axis_angle_to_quat(rotvec: np.ndarray) -> np.ndarray:
+    """Batched rotation vectors (..., 3) to wxyz quaternions (..., 4)."""
+    angle = np.linalg.norm(rotvec, axis=-1, keepdims=True)
+    axis = rotvec / np.maximum(angle, 1e-12)
+    return np.concatenate([np.cos(angle / 2), axis * np.sin(angle / 2)], axis=-1)
+
+
+def _shape_materials(shape):
+    if isinstance(shape, sapien.render.RenderShapeTriangleMesh):
+        return [part.material for part in shape.get_parts()]
+    return [shape.material]
+
+
+class DomainRandomizer:
+    """Batched in-place randomization of lights, materials and cameras for all envs."""
+
+    def __init__(self, scene, actors: Optional[List] = None, cameras: Optional[List] = None,
+                 config: Optional[RandomizationConfig] = None, seed: Optional[int] = None):
+        """
+        Args:
+            scene: the ManiSkillScene to randomize.
+            actors: actors whose materials are randomized; defaults to all actors in the scene.
+            cameras: ManiSkill Camera sensors or RenderCameras whose local pose is jittered.
+            config: randomization ranges.
+            seed: seed for the numpy Generator.
+        """
+        self.scene = scene
+        self.config = RandomizationConfig() if config is None else config
+        self.rng = np.random.default_rng(seed)
+        self.num_envs = len(scene.sub_scenes)
+
+        # lights per env with their original parameters
+        self.render_systems = [s.render_system for s in scene.sub_scenes]
+        self.ambient_lights = [list(rs.ambient_light) for rs in self.render_systems]
+        self.lights = [list(rs.lights) for rs in self.render_systems]
+        self.light_colors = [[np.asarray(l.color, dtype=np.float64) for l in lights] for lights in self.lights]
+        self.light_poses = [[l.pose for l in lights] for lights in self.lights]
+
+        # unique materials (see module docstring) with their original base color
+        actors = list(scene.actors.values()) if actors is None else actors
+        self.materials, self.base_colors = [], []
+        seen = set()
+        for actor in actors:
+            for entity in actor._objs:
+                body = entity.find_component_by_type(sapien.render.RenderBodyComponent)
+                if body is None:
+                    continue
+                for shape in body.render_shapes:
+                    for material in _shape_materials(shape):
+                        if id(material) in seen:
+                            continue
+                        seen.add(id(material))
+                        self.materials.append(material)
+                        self.base_colors.append(np.asarray(material.base_color, dtype=np.float64))
+        self.base_colors = np.array(self.base_colors).reshape(-1, 4)
+        self.roughness = [m.roughness for m in self.materials]
+        self.metallic = [m.metallic for m in self.materials]
+
+        # per-env camera components with their original local pose
+        self.cameras = []
+        for camera in cameras or []:
+            camera = getattr(camera, "camera", camera)
+            for component in camera._render_cameras:
+                self.cameras.append((component, component.local_pose))
+
+    def randomize_lights(self):
+        cfg = self.config
+        ambient = self.rng.uniform(*cfg.ambient, size=self.num_envs)
+        num_lights = sum(len(lights) for lights in self.lights)
+        jitter = 1 + self.rng.uniform(-cfg.light_color_jitter, cfg.light_color_jitter, size=(num_lights, 3))
+        # random rotation inside a cone around the original direction
+        rotvec = self.rng.normal(size=(num_lights, 3))
+        rotvec *= (self.rng.uniform(0, cfg.light_direction_cone, size=(num_lights, 1))
+                   / np.linalg.norm(rotvec, axis=-1, keepdims=True))
+        dq = axis_angle_to_quat(rotvec)
+
+        k = 0
+        for env_idx, rs in enumerate(self.render_systems):
+            rs.ambient_light = [float(ambient[env_idx])] * 3
+            for i, light in enumerate(self.lights[env_idx]):
+                light.color = np.clip(self.light_colors[env_idx][i] * jitter[k], 0, None).tolist()
+                if isinstance(light, sapien.render.RenderDirectionalLightComponent):
+                    pose = self.light_poses[env_idx][i]
+                    light.pose = sapien.Pose(pose.p, quat_multiply(dq[k], pose.q))
+                k += 1
+
+    def randomize_materials(self):
+        cfg = self.config
+        n = len(self.materials)
+        if n == 0:
+            return
+        jitter = 1 + self.rng.uniform(-cfg.base_color_jitter, cfg.base_color_jitter, size=(n, 3))
+        colors = self.base_colors.copy()
+        colors[:, :3] = np.clip(colors[:, :3] * jitter, 0, 1)
+        roughness = self.rng.uniform(*cfg.roughness, size=n) if cfg.roughness is not None else None
+        metallic = self.rng.uniform(*cfg.metallic, size=n) if cfg.metallic is not None else None
+        for i, material in enumerate(self.materials):
+            material.base_color = colors[i].tolist()
+            if roughness is not None:
+                material.roughness = float(roughness[i])
+            if metallic is not None:
+                material.metallic = float(metallic[i])
+
+    def randomize_cameras(self):
+        cfg = self.config
+        n = len(self.cameras)
+        if n == 0:
+            return
+        dp = self.rng.normal(scale=cfg.camera_pos_std, size=(n, 3))
+        dq = axis_angle_to_quat(self.rng.normal(scale=cfg.camera_rot_std, size=(n, 3)))
+        for i, (component, pose) in enumerate(self.cameras):
+            component.local_pose = sapien.Pose(pose.p + dp[i], quat_multiply(pose.q, dq[i]))
+
+    def randomize(self, lights: bool = True, materials: bool = True, cameras: bool = True):
+        """Draw and apply new parameters for every env; call between episodes."""
+        if lights:
+            self.randomize_lights()
+        if materials:
+            self.randomize_materials()
+        if cameras:
+            self.randomize_cameras()
+
+    def restore(self):
+        """Put every light, material and camera back to its original parameters."""
+        for env_idx, lights in enumerate(self.lights):
+            self.render_systems[env_idx].ambient_light = self.ambient_lights[env_idx]
+            for i, light in enumerate(lights):
+                light.color = self.light_colors[env_idx][i].tolist()
+                light.pose = self.light_poses[env_idx][i]
+        for i, material in enumerate(self.materials):
+            material.base_color = self.base_colors[i].tolist()
+            material.roughness = self.roughness[i]
+            material.metallic = self.metallic[i]
+        for component, pose in self.cameras:
+            component.local_pose = pose
@@ -0,0 +1,134 @@
+"""
+Asynchronous, double-buffered device -> host transfer of observations.
+
+`.cpu().numpy()` blocks the sim loop until the copy finishes. `AsyncHostTransfer`
+instead copies every tensor of a (possibly nested) observation dict into
+preallocated host buffers and returns a Future that resolves to the same dict
+structure holding numpy arrays, so the next step can be simulated while the
+previous one is still being transferred.
+
+- CUDA tensors are copied into pinned buffers on a side stream with
+  non_blocking=True; a worker thread waits on the copy's event and resolves
+  the future.
+- CPU tensors (CPU render device) are copied into the buffers by a worker
+  thread, so the source tensors must not be modified in place until the
+  future resolves (ManiSkill returns fresh observation tensors every step).
+
+Buffers are reused in a ring of `num_buffers` slots, so the arrays returned by
+a future are only valid until `num_buffers` more observations were submitted.
+Consumers that keep frames longer (e.g. recorders holding a whole episode)
+must copy them.
+
+Usage:
+    transfer = AsyncHostTransfer()
+    pending = None
+    for step in range(n):
+        obs, *_ = env.step(action)
+        if pending is not None:
+            recorder.add(pending.result())
+        pending = transfer.submit(obs)
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+import numpy as np
+import torch
+
+
+def flatten_tensors(data, prefix=""):
+    """Flatten a nested dict into {"a/b/c": tensor}, keeping only tensors and arrays."""
+    out = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            out.update(flatten_tensors(value, f"{prefix}{key}/"))
+    elif isinstance(data, (torch.Tensor, np.ndarray)):
+        out[prefix[:-1]] = data
+    return out
+
+
+def unflatten(flat: Dict[str, np.ndarray]):
+    out = {}
+    for path, value in flat.items():
+        node = out
+        keys = path.split("/")
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = value
+    return out
+
+
+class AsyncHostTransfer:
+    """Copy observation tensors to host without blocking the caller."""
+
+    def __init__(self, num_buffers: int = 2, num_workers: int = 1):
+        """
+        Args:
+            num_buffers: number of host buffer slots; 2 gives classic double buffering.
+            num_workers: worker threads resolving futures / doing CPU copies.
+        """
+        self.num_buffers = num_buffers
+        self._executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="host_transfer")
+        self._slots = [dict() for _ in range(num_buffers)]
+        self._slot_futures = [None] * num_buffers
+        self._next = 0
+        self._stream: Optional[torch.cuda.Stream] = None
+
+    def _host_buffer(self, slot: Dict[str, torch.Tensor], key: str, src: torch.Tensor) -> torch.Tensor:
+        buf = slot.get(key)
+        if buf is None or buf.shape != src.shape or buf.dtype != src.dtype:
+            buf = torch.empty(src.shape, dtype=src.dtype, pin_memory=src.is_cuda)
+            slot[key] = buf
+        return buf
+
+    def submit(self, data) -> Future:
+        """Start copying all tensors in `data` to host; returns a Future of the same structure as numpy."""
+        idx = self._next
+        self._next = (self._next + 1) % self.num_buffers
+        # a slot can only be refilled once its previous transfer has landed
+        if self._slot_futures[idx] is not None:
+            self._slot_futures[idx].result()
+        slot = self._slots[idx]
+
+        flat = flatten_tensors(data)
+        ready = {k: v for k, v in flat.items() if isinstance(v, np.ndarray)}
+        cpu_jobs, event = [], None
+        cuda_tensors = {k: v for k, v in flat.items() if isinstance(v, torch.Tensor) and v.is_cuda}
+        if len(cuda_tensors) > 0:
+            if self._stream is None:
+                self._stream = torch.cuda.Stream()
+            self._stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(self._stream):
+                for key, src in cuda_tensors.items():
+                    # keep the source alive for the side stream until the copy is done
+                    src.record_stream(self._stream)
+                    self._host_buffer(slot, key, src).copy_(src, non_blocking=True)
+                event = torch.cuda.Event()
+                event.record(self._stream)
+        for key, src in flat.items():
+            if isinstance(src, torch.Tensor) and not src.is_cuda:
+                cpu_jobs.append((key, src))
+
+        def finish():
+            for key, src in cpu_jobs:
+                self._host_buffer(slot, key, src).copy_(src)
+            if event is not None:
+                event.synchronize()
+            out = dict(ready)
+            for key in flat:
+                if key not in out:
+                    out[key] = slot[key].numpy()
+            return unflatten(out)
+
+        future = self._executor.submit(finish)
+        self._slot_futures[idx] = future
+        return future
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,119 @@
+"""
+Batched crop / resize / dtype conversion of camera observations on the render device.
+
+Policies usually want e.g. 224x224 inputs, yet the full 1280x720 head frame is
+copied to the host and shrunk afterwards. `ObservationPostprocessor` applies a
+per-camera `PostprocessConfig` to ManiSkill's `obs["sensor_data"]` while it is
+still on the device, one batched op per camera and texture for all envs:
+
+1. crop a region of interest (a view, no copy),
+2. resize (antialiased bilinear for RGB, nearest for every other texture --
+   depth, segmentation, position, normals, albedo -- so no values are invented
+   across object edges; these keep their input dtype),
+3. convert dtype (e.g. keep uint8, or float16 in [0, 1]).
+
+A 1280x720 uint8 head frame (2.7 MB) becomes 150 KB at 224x224, so the host
+copy (host_transfer.py) and everything downstream shrink accordingly.
+`transformed_intrinsic` gives the matching K for back-projection (pixel
+centers at integer coordinates, as in OpenCV).
+
+Usage:
+    postprocess = ObservationPostprocessor()   # CAMERA_POSTPROCESS defaults
+    pending = transfer.submit(postprocess(obs["sensor_data"]))
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+# textures resized with (antialiased) bilinear interpolation; all others use nearest
+# so depth, ids, positions and normals are never blended across object edges
+BILINEAR_TEXTURES = ("rgb",)
+
+
+@dataclass
+class PostprocessConfig:
+    crop: Optional[Tuple[int, int, int, int]] = None
+    """(x, y, width, height) region of interest in the rendered image"""
+    size: Optional[Tuple[int, int]] = None
+    """(height, width) after resizing"""
+    rgb_dtype: str = "uint8"
+    """"uint8", "float16" or "float32" ([0, 1] for float)"""
+
+
+CAMERA_POSTPROCESS: Dict[str, PostprocessConfig] = {
+    # center square of the 16:9 head image
+    "head_camera": PostprocessConfig(crop=(280, 0, 720, 720), size=(224, 224)),
+    "left_wrist_camera": PostprocessConfig(crop=(80, 0, 480, 480), size=(224, 224)),
+    "right_wrist_camera": PostprocessConfig(crop=(80, 0, 480, 480), size=(224, 224)),
+}
+
+
+def postprocess_image(image: torch.Tensor, config: PostprocessConfig, texture: str = "rgb") -> torch.Tensor:
+    """(N, H, W, C) image -> cropped, resized, converted (N, h, w, C) on the same device."""
+    scale = 255.0 if image.dtype == torch.uint8 else 1.0
+    if config.crop is not None:
+        x, y, w, h = config.crop
+        image = image[:, y:y + h, x:x + w]
+    if config.size is not None and tuple(image.shape[1:3]) != tuple(config.size):
+        nchw = image.permute(0, 3, 1, 2)
+        if texture in BILINEAR_TEXTURES:
+            nchw = F.interpolate(nchw.to(torch.float32), size=config.size, mode="bilinear",
+                                 align_corners=False, antialias=True)
+        else:
+            # nearest on the float copy of the integer values is exact for |v| < 2^24
+            nchw = F.interpolate(nchw.to(torch.float32), size=config.size, mode="nearest-exact").to(image.dtype)
+        image = nchw.permute(0, 2, 3, 1)
+    if texture == "rgb":
+        if config.rgb_dtype == "uint8":
+            if image.dtype != torch.uint8:
+                image = (image.to(torch.float32) * (255.0 / scale)).round().clamp(0, 255).to(torch.uint8)
+        else:
+            image = (image.to(torch.float32) / scale).to(getattr(torch, config.rgb_dtype))
+    return image.contiguous()
+
+
+def transformed_intrinsic(intrinsic: np.ndarray, original_size: Tuple[int, int], config: PostprocessConfig) -> np.ndarray:
+    """
+    K of the post-processed image, given the (height, width) it was rendered at.
+    Resizing uses align_corners=False, i.e. pixel edges scale, so the principal
+    point moves by half a pixel: c' = (c + 0.5) * s - 0.5.
+    """
+    K = np.array(intrinsic, dtype=np.float32)
+    height, width = original_size
+    if config.crop is not None:
+        x, y, width, height = config.crop
+        K[0, 2] -= x
+        K[1, 2] -= y
+    if config.size is not None:
+        sx, sy = config.size[1] / width, config.size[0] / height
+        K[0, 0] *= sx
+        K[1, 1] *= sy
+        K[0, 1] *= sx
+        K[0, 2] = (K[0, 2] + 0.5) * sx - 0.5
+        K[1, 2] = (K[1, 2] + 0.5) * sy - 0.5
+    return K
+
+
+class ObservationPostprocessor:
+    """Applies per-camera PostprocessConfigs to a ManiSkill sensor_data dict."""
+
+    def __init__(self, configs: Optional[Dict[str, PostprocessConfig]] = None):
+        self.configs = CAMERA_POSTPROCESS if configs is None else configs
+
+    def __call__(self, sensor_data: Dict[str, Dict[str, torch.Tensor]]) -> Dict[str, Dict[str, torch.Tensor]]:
+        """Returns a new dict; cameras without a config pass through unchanged."""
+        out = {}
+        for uid, textures in sensor_data.items():
+            config = self.configs.get(uid)
+            if config is None:
+                out[uid] = textures
+                continue
+            out[uid] = {
+                name: postprocess_image(value, config, name) if value.ndim == 4 else value
+                for name, value in textures.items()
+            }
+        return out
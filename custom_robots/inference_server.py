@@ -0,0 +1,212 @@
+"""
+Local batched policy inference shared by many simulation workers.
+
+One `InferenceServer` process holds the model. Simulation workers connect
+with `PolicyClient` over a Unix socket and send observations (a dict of numpy
+arrays with a leading env dimension); the server collects requests until
+`max_batch_size` rows are pending or the oldest request has waited
+`max_latency`, concatenates them, runs a single forward pass and sends every
+worker its slice of the actions.
+
+Observations and actions are pickled numpy arrays (multiprocessing.connection),
+which is cheap next to a forward pass for state / small image observations.
+Since unpickling runs code, connections are authenticated with an authkey:
+by default the multiprocessing authkey, which worker processes started with
+multiprocessing inherit; unrelated processes share one via G1_POLICY_AUTHKEY.
+
+Usage:
+    # server
+    InferenceServer(policy_fn, "/tmp/g1_policy.sock", max_batch_size=64, max_latency=0.005).serve_forever()
+    # worker
+    with PolicyClient("/tmp/g1_policy.sock") as client:
+        action = client.act({"state": obs})
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+Observation = Dict[str, np.ndarray]
+AUTHKEY_ENV = "G1_POLICY_AUTHKEY"
+
+
+def default_authkey() -> bytes:
+    key = os.environ.get(AUTHKEY_ENV)
+    return key.encode() if key else bytes(multiprocessing.current_process().authkey)
+
+
+def request_rows(obs) -> int:
+    """Leading (env) dimension of a request; raises ValueError for malformed requests."""
+    if not isinstance(obs, dict) or not obs:
+        raise ValueError("Request must be a non-empty dict of arrays")
+    rows = {len(v) for v in obs.values()}
+    if len(rows) != 1:
+        raise ValueError(f"All observation arrays need the same leading dimension, got {sorted(rows)}")
+    return rows.pop()
+
+
+class InferenceServer:
+    """Dynamic batching front end for `policy_fn(obs_batch) -> actions`."""
+
+    def __init__(self, policy_fn: Callable[[Observation], np.ndarray], address: str,
+                 max_batch_size: int = 64, max_latency: float = 0.005, authkey: Optional[bytes] = None):
+        """
+        Args:
+            policy_fn: maps a dict of stacked observations (B, ...) to actions (B, action_dim).
+                Runs on the batching thread only, so it does not need to be thread-safe.
+            address: path of the Unix socket.
+            max_batch_size: rows (envs) per forward pass; a single larger request is run on its own.
+            max_latency: seconds the oldest pending request may wait for more to arrive.
+            authkey: shared secret clients must present; defaults to `default_authkey()`.
+        """
+        self.policy_fn = policy_fn
+        self.address = address
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.authkey = default_authkey() if authkey is None else authkey
+        self._carry: Optional[Tuple[Observation, int, Future]] = None
+        """request that did not fit into the previous batch"""
+        self.requests: "queue.Queue[Tuple[Observation, int, Future]]" = queue.Queue()
+        self.stop_event = threading.Event()
+        self.stats = {"requests": 0, "batches": 0, "rows": 0}
+        self.listener: Optional[Listener] = None
+
+    def _handle_client(self, conn):
+        with conn:
+            while not self.stop_event.is_set():
+                try:
+                    obs = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    rows = request_rows(obs)
+                except (TypeError, ValueError) as e:
+                    conn.send(ValueError(f"Bad request: {e}"))
+                    continue
+                future = Future()
+                self.requests.put((obs, rows, future))
+                try:
+                    conn.send(future.result())
+                except Exception as e:
+                    conn.send(e)
+
+    def _collect_batch(self) -> List[Tuple[Observation, int, Future]]:
+        if self._carry is not None:
+            batch, self._carry = [self._carry], None
+        else:
+            try:
+                batch = [self.requests.get(timeout=0.1)]
+            except queue.Empty:
+                return []
+        rows = batch[0][1]
+        deadline = time.perf_counter() + self.max_latency
+        while rows < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if rows + request[1] > self.max_batch_size:
+                # starts the next batch instead of overfilling this one
+                self._carry = request
+                break
+            batch.append(request)
+            rows += request[1]
+        return batch
+
+    def _run_batches(self):
+        while not self.stop_event.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            try:
+                obs = {k: np.concatenate([o[k] for o, _, _ in batch]) for k in batch[0][0]}
+                actions = np.asarray(self.policy_fn(obs))
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            start = 0
+            for _, rows, future in batch:
+                future.set_result(actions[start:start + rows])
+                start += rows
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["rows"] += start
+
+    def serve_forever(self):
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        self.listener = Listener(self.address, family="AF_UNIX", authkey=self.authkey)
+        batcher = threading.Thread(target=self._run_batches, daemon=True)
+        batcher.start()
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    conn = self.listener.accept()
+                except AuthenticationError:
+                    continue
+                except OSError:
+                    break
+                threading.Thread(target=self._handle_client, args=(conn,), daemon=True).start()
+        finally:
+            self.stop()
+
+    def start(self) -> threading.Thread:
+        """Serve on a background thread (for running the server inside another process)."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        while self.listener is None:
+            time.sleep(0.001)
+        return thread
+
+    def stop(self):
+        self.stop_event.set()
+        if self.listener is not None:
+            self.listener.close()
+            if os.path.exists(self.address):
+                os.remove(self.address)
+
+
+class PolicyClient:
+    """Worker side connection to an InferenceServer."""
+
+    def __init__(self, address: str, timeout: float = 30.0, authkey: Optional[bytes] = None):
+        authkey = default_authkey() if authkey is None else authkey
+        deadline = time.perf_counter() + timeout
+        # the server may still be loading its model
+        while True:
+            try:
+                self.conn = Client(address, family="AF_UNIX", authkey=authkey)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.perf_counter() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    def act(self, obs: Observation) -> np.ndarray:
+        """Send (num_envs, ...) observations, block until the batched actions come back."""
+        self.conn.send({k: np.asarray(v) for k, v in obs.items()})
+        actions = self.conn.recv()
+        if isinstance(actions, Exception):
+            raise actions
+        return actions
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
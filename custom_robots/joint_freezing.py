@@ -0,0 +1,194 @@
+"""
+Freeze unused active joints of the G1 into fixed joints at load time.
+
+Tasks that fix the base and only use one arm still simulate (and expose in
+qpos / actions) the wheels, waist, head and the other arm. `freeze_joints_urdf`
+writes a copy of the URDF in which the chosen joints are `fixed`, with the
+frozen position baked into the joint origin, so PhysX builds a smaller
+articulation with fewer solver DOFs. `FrozenJointMap` maps between the
+reduced and the full robot's qpos layout.
+
+The generated URDF lives next to the original (so relative mesh paths keep
+working) and is reused while the original and the frozen values are unchanged.
+
+Usage:
+    @register_agent()
+    class MyLeftArmG1(AgibotG1120s):
+        uid = "my_left_arm_g1"
+        frozen_joints = freeze_all_but(G1_120S_ACTIVE_JOINTS, LEFT_ARM_JOINTS + LEFT_GRIPPER_120S_JOINTS)
+    # env.agent.joint_map.expand_qpos(env.agent.robot.get_qpos()) -> full-robot qpos
+"""
+
+import hashlib
+import json
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import torch
+
+# Active joints of agibot_g1_with_120s.urdf in SAPIEN's qpos order (see scripts/list_active_joints_map.py)
+G1_120S_ACTIVE_JOINTS = [
+    'left_wheel_joint', 'right_wheel_joint', 'body_joint1', 'body_joint2', 'head_joint1', 'head_joint2',
+    'left_joint1', 'right_joint1', 'left_joint2', 'right_joint2', 'left_joint3', 'right_joint3',
+    'left_joint4', 'right_joint4', 'left_joint5', 'right_joint5', 'left_joint6', 'right_joint6',
+    'left_joint7', 'right_joint7',
+    'idx41_gripper_l_outer_joint1', 'idx49_gripper_l_outer_joint2', 'idx39_gripper_l_inner_joint2',
+    'idx31_gripper_l_inner_joint1', 'idx81_gripper_r_outer_joint1', 'idx89_gripper_r_outer_joint2',
+    'idx79_gripper_r_inner_joint2', 'idx71_gripper_r_inner_joint1', 'idx42_gripper_l_outer_joint3',
+    'idx32_gripper_l_inner_joint3', 'idx82_gripper_r_outer_joint3', 'idx72_gripper_r_inner_joint3',
+    'idx43_gripper_l_outer_joint4', 'idx33_gripper_l_inner_joint4', 'idx83_gripper_r_outer_joint4',
+    'idx73_gripper_r_inner_joint4',
+]
+BASE_JOINTS = ['left_wheel_joint', 'right_wheel_joint', 'body_joint1', 'body_joint2', 'head_joint1', 'head_joint2']
+LEFT_ARM_JOINTS = [f'left_joint{i}' for i in range(1, 8)]
+RIGHT_ARM_JOINTS = [f'right_joint{i}' for i in range(1, 8)]
+LEFT_GRIPPER_120S_JOINTS = [j for j in G1_120S_ACTIVE_JOINTS if '_gripper_l_' in j]
+RIGHT_GRIPPER_120S_JOINTS = [j for j in G1_120S_ACTIVE_JOINTS if '_gripper_r_' in j]
+
+
+def freeze_all_but(all_joints: Sequence[str], keep: Sequence[str], value: float = 0.0) -> Dict[str, float]:
+    """Frozen-joint spec that freezes every joint in `all_joints` not in `keep` at `value`."""
+    return {name: value for name in all_joints if name not in keep}
+
+
+def rpy_to_matrix(rpy) -> np.ndarray:
+    """URDF fixed-axis roll/pitch/yaw to a rotation matrix (R = Rz(yaw) Ry(pitch) Rx(roll))."""
+    r, p, y = rpy
+    cr, sr, cp, sp, cy, sy = np.cos(r), np.sin(r), np.cos(p), np.sin(p), np.cos(y), np.sin(y)
+    return np.array([
+        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+        [-sp, cp * sr, cp * cr],
+    ])
+
+
+def matrix_to_rpy(R: np.ndarray) -> np.ndarray:
+    pitch = np.arcsin(-np.clip(R[2, 0], -1.0, 1.0))
+    if abs(np.cos(pitch)) > 1e-8:
+        roll = np.arctan2(R[2, 1], R[2, 2])
+        yaw = np.arctan2(R[1, 0], R[0, 0])
+    else:
+        # gimbal lock: put all rotation about z into yaw
+        roll = 0.0
+        yaw = np.arctan2(-R[0, 1], R[1, 1])
+    return np.array([roll, pitch, yaw])
+
+
+def axis_angle_matrix(axis: np.ndarray, angle: float) -> np.ndarray:
+    axis = axis / np.linalg.norm(axis)
+    K = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]])
+    return np.eye(3) + np.sin(angle) * K + (1 - np.cos(angle)) * K @ K
+
+
+def _floats(text: Optional[str], default) -> np.ndarray:
+    return np.array([float(v) for v in text.split()]) if text else np.array(default, dtype=np.float64)
+
+
+def frozen_urdf_path(urdf_path: str, frozen: Dict[str, float]) -> str:
+    with open(urdf_path, "rb") as f:
+        digest = hashlib.sha1(f.read() + json.dumps(sorted(frozen.items())).encode()).hexdigest()[:10]
+    return os.path.splitext(urdf_path)[0] + f".frozen_{digest}.urdf"
+
+
+def with_mimic_followers(urdf_path: str, frozen: Dict[str, float]) -> Dict[str, float]:
+    """
+    `frozen` plus every joint that (transitively) mimics a frozen joint, held at
+    multiplier * frozen value + offset, so freezing never leaves a free follower.
+    """
+    joints = {j.get("name"): j for j in ET.parse(urdf_path).getroot().findall("joint")}
+    frozen = dict(frozen)
+    changed = True
+    while changed:
+        changed = False
+        for name, joint in joints.items():
+            mimic = joint.find("mimic")
+            if name in frozen or mimic is None or mimic.get("joint") not in frozen:
+                continue
+            frozen[name] = (float(mimic.get("multiplier", 1.0)) * frozen[mimic.get("joint")]
+                            + float(mimic.get("offset", 0.0)))
+            changed = True
+    return frozen
+
+
+def freeze_joints_urdf(urdf_path: str, frozen: Dict[str, float]) -> str:
+    """
+    Write (or reuse) a copy of `urdf_path` where every joint in `frozen` is a
+    fixed joint held at the given position. Joints mimicking a frozen joint are
+    frozen at their mimicked position too (see `with_mimic_followers`).
+    Returns the new URDF's path.
+    """
+    frozen = with_mimic_followers(urdf_path, frozen)
+    out_path = frozen_urdf_path(urdf_path, frozen)
+    if os.path.exists(out_path):
+        return out_path
+
+    tree = ET.parse(urdf_path)
+    root = tree.getroot()
+    joints = {j.get("name"): j for j in root.findall("joint")}
+    missing = set(frozen) - set(joints)
+    if missing:
+        raise ValueError(f"Joints {sorted(missing)} not found in {urdf_path}")
+
+    for name, value in frozen.items():
+        joint = joints[name]
+        joint_type = joint.get("type")
+        if joint_type == "fixed":
+            continue
+        if joint_type not in ("revolute", "continuous", "prismatic"):
+            raise ValueError(f"Cannot freeze joint {name} of type {joint_type}")
+        origin = joint.find("origin")
+        if origin is None:
+            origin = ET.SubElement(joint, "origin")
+        xyz = _floats(origin.get("xyz"), [0, 0, 0])
+        R = rpy_to_matrix(_floats(origin.get("rpy"), [0, 0, 0]))
+        axis_el = joint.find("axis")
+        axis = _floats(axis_el.get("xyz") if axis_el is not None else None, [1, 0, 0])
+        # child frame = origin * motion(value), with motion along/about the joint axis
+        if joint_type == "prismatic":
+            xyz = xyz + R @ (axis / np.linalg.norm(axis) * value)
+        else:
+            R = R @ axis_angle_matrix(axis, value)
+        origin.set("xyz", " ".join(f"{v:.9g}" for v in xyz))
+        origin.set("rpy", " ".join(f"{v:.9g}" for v in matrix_to_rpy(R)))
+        joint.set("type", "fixed")
+        for tag in ("axis", "limit", "dynamics", "mimic", "safety_controller", "calibration"):
+            for el in joint.findall(tag):
+                joint.remove(el)
+
+    tmp_path = out_path + ".tmp"
+    tree.write(tmp_path, xml_declaration=True, encoding="utf-8")
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+@dataclass
+class FrozenJointMap:
+    """Index mapping between a reduced (frozen) articulation and the full robot."""
+    full_joint_names: List[str]
+    active_joint_names: List[str]
+    frozen: Dict[str, float]
+
+    def __post_init__(self):
+        index = {name: i for i, name in enumerate(self.full_joint_names)}
+        self.active_to_full = torch.tensor([index[name] for name in self.active_joint_names], dtype=torch.long)
+        frozen_idx = [index[name] for name in self.frozen]
+        self.frozen_idx = torch.tensor(frozen_idx, dtype=torch.long)
+        self.frozen_values = torch.tensor([self.frozen[name] for name in self.frozen], dtype=torch.float32)
+
+    @classmethod
+    def for_robot(cls, full_joint_names: Sequence[str], robot, frozen: Dict[str, float]) -> "FrozenJointMap":
+        return cls(list(full_joint_names), [j.name for j in robot.active_joints], dict(frozen))
+
+    def expand_qpos(self, qpos: torch.Tensor) -> torch.Tensor:
+        """(N, reduced_dof) -> (N, full_dof), frozen joints filled with their frozen value."""
+        full = torch.empty((qpos.shape[0], len(self.full_joint_names)), dtype=qpos.dtype, device=qpos.device)
+        full[:, self.frozen_idx.to(qpos.device)] = self.frozen_values.to(qpos)
+        full[:, self.active_to_full.to(qpos.device)] = qpos
+        return full
+
+    def reduce_qpos(self, full_qpos: torch.Tensor) -> torch.Tensor:
+        """(N, full_dof) -> (N, reduced_dof)."""
+        return full_qpos[:, self.active_to_full.to(full_qpos.device)]
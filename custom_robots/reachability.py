@@ -0,0 +1,230 @@
+"""
+Precomputed reachability / manipulability maps for the two G1 arms.
+
+Offline, for each arm, this tool
+
+1. samples the arm's joint space (`left_joint1..7` / `right_joint1..7`,
+   every other joint at 0) uniformly within the URDF limits,
+2. computes the end-effector pose and Jacobian with the articulation's
+   Pinocchio model (poses are in the robot base frame),
+3. bins the EE position into voxels and the EE approach axis into one of
+   `num_directions` directions spread over the sphere, and stores per bin how
+   many samples landed there and the best Yoshikawa manipulability
+   sqrt(det(J J^T)) seen,
+4. caches the map as npz next to the URDF (invalidated when the URDF changes).
+
+`ReachabilityMap` loads a cached map onto a device and answers batched
+"is this EE position (+ approach direction) reachable, and how well" queries
+with a couple of tensor ops.
+
+Usage:
+    python custom_robots/reachability.py --urdf robot_descriptions/.../agibot_g1_with_120s.urdf
+    reach = ReachabilityMap.load(urdf_path, "left", device="cuda")
+    ok, manip = reach.query(positions, approach_dirs)   # (B, 3), (B, 3) in the base frame
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+import torch
+
+from collision_filter import urdf_hash
+from joint_freezing import LEFT_ARM_JOINTS, RIGHT_ARM_JOINTS
+
+ARM_JOINTS = {"left": LEFT_ARM_JOINTS, "right": RIGHT_ARM_JOINTS}
+# the end effector is the link the gripper's first finger joint hangs off
+EE_PARENT_JOINT = {"left": "idx41_gripper_l_outer_joint1", "right": "idx81_gripper_r_outer_joint1"}
+
+
+def cache_path(urdf_path: str, arm: str) -> str:
+    return os.path.splitext(urdf_path)[0] + f".reach_{arm}.npz"
+
+
+def sphere_directions(n: int) -> np.ndarray:
+    """(n, 3) unit vectors spread evenly over the sphere (Fibonacci lattice)."""
+    i = np.arange(n) + 0.5
+    z = 1 - 2 * i / n
+    r = np.sqrt(1 - z ** 2)
+    phi = np.pi * (1 + 5 ** 0.5) * i
+    return np.stack([r * np.cos(phi), r * np.sin(phi), z], axis=-1).astype(np.float32)
+
+
+def sample_arm_workspace(urdf_path: str, arm: str, num_samples: int, seed: int = 0,
+                         approach_axis: int = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    EE positions (S, 3), approach axes (S, 3) and manipulability (S,) for random
+    configurations of one arm.
+    """
+    from mani_skill.envs.scene import ManiSkillScene
+    from mani_skill.envs.utils.system.backend import BackendInfo
+    from mani_skill.utils.structs.types import SimConfig
+
+    backend = BackendInfo(device="cpu", sim_device="cpu", sim_backend="physx", render_backend="none", render_device=None)
+    scene = ManiSkillScene(sim_config=SimConfig(sim_freq=100, control_freq=100), backend=backend)
+    loader = scene.create_urdf_loader()
+    loader.fix_root_link = True
+    robot = loader.load(urdf_path)
+    model = robot.create_pinocchio_model()
+
+    ee_link = robot.active_joints_map[EE_PARENT_JOINT[arm]].parent_link
+    ee_index = robot.links.index(ee_link)
+    arm_idx = np.array([robot.active_joints_map[name].active_index[0].item() for name in ARM_JOINTS[arm]])
+    qlimits = robot.get_qlimits()[0].cpu().numpy()[arm_idx]
+    low = np.where(np.isfinite(qlimits[:, 0]), qlimits[:, 0], -np.pi)
+    high = np.where(np.isfinite(qlimits[:, 1]), qlimits[:, 1], np.pi)
+
+    rng = np.random.default_rng(seed)
+    qpos = np.zeros(robot.max_dof, dtype=np.float64)
+    positions = np.empty((num_samples, 3), dtype=np.float32)
+    approach = np.empty((num_samples, 3), dtype=np.float32)
+    manipulability = np.empty(num_samples, dtype=np.float32)
+    for s in range(num_samples):
+        qpos[arm_idx] = rng.uniform(low, high)
+        model.compute_forward_kinematics(qpos)
+        pose = model.get_link_pose(ee_index)
+        positions[s] = pose.p
+        approach[s] = pose.to_transformation_matrix()[:3, approach_axis]
+        model.compute_full_jacobian(qpos)
+        J = model.get_link_jacobian(ee_index, local=False)[:, arm_idx]
+        manipulability[s] = np.sqrt(max(np.linalg.det(J @ J.T), 0.0))
+    return positions, approach, manipulability
+
+
+@dataclass
+class ReachabilityMapData:
+    origin: np.ndarray
+    """(3,) base-frame position of the corner of voxel (0, 0, 0)"""
+    voxel_size: float
+    directions: np.ndarray
+    """(D, 3) approach direction bins"""
+    counts: np.ndarray
+    """(X, Y, Z, D) samples per bin"""
+    manipulability: np.ndarray
+    """(X, Y, Z, D) best manipulability per bin (0 where unreachable)"""
+    urdf_sha1: str
+
+
+def build_reachability_map(urdf_path: str, arm: str, num_samples: int = 200000, voxel_size: float = 0.05,
+                           num_directions: int = 32, seed: int = 0, approach_axis: int = 2) -> ReachabilityMapData:
+    positions, approach, manipulability = sample_arm_workspace(urdf_path, arm, num_samples, seed, approach_axis)
+    directions = sphere_directions(num_directions)
+    origin = positions.min(axis=0) - voxel_size
+    shape = np.ceil((positions.max(axis=0) + voxel_size - origin) / voxel_size).astype(int) + 1
+    voxel = np.floor((positions - origin) / voxel_size).astype(int)
+    direction = (approach @ directions.T).argmax(axis=1)
+    flat = np.ravel_multi_index((*voxel.T, direction), (*shape, num_directions))
+
+    size = int(np.prod(shape)) * num_directions
+    counts = np.bincount(flat, minlength=size)
+    best = np.zeros(size, dtype=np.float32)
+    np.maximum.at(best, flat, manipulability)
+    return ReachabilityMapData(
+        origin=origin.astype(np.float32),
+        voxel_size=voxel_size,
+        directions=directions,
+        counts=counts.reshape(*shape, num_directions).astype(np.int32),
+        manipulability=best.reshape(*shape, num_directions),
+        urdf_sha1=urdf_hash(urdf_path),
+    )
+
+
+def save_map(data: ReachabilityMapData, path: str):
+    np.savez_compressed(path, **data.__dict__)
+
+
+def load_map(path: str) -> ReachabilityMapData:
+    with np.load(path) as f:
+        return ReachabilityMapData(
+            origin=f["origin"], voxel_size=float(f["voxel_size"]), directions=f["directions"],
+            counts=f["counts"], manipulability=f["manipulability"], urdf_sha1=str(f["urdf_sha1"]),
+        )
+
+
+class ReachabilityMap:
+    """Device-resident reachability map answering batched queries."""
+
+    def __init__(self, data: ReachabilityMapData, device="cpu", min_count: int = 1):
+        """
+        Args:
+            data: a built or loaded map.
+            device: torch device for the lookup tables.
+            min_count: samples a bin needs to count as reachable.
+        """
+        self.device = torch.device(device)
+        self.origin = torch.as_tensor(data.origin, device=self.device)
+        self.voxel_size = data.voxel_size
+        self.directions = torch.as_tensor(data.directions, device=self.device)
+        self.shape = torch.tensor(data.counts.shape[:3], device=self.device)
+        self.reachable = torch.as_tensor(data.counts >= min_count, device=self.device)
+        self.manipulability = torch.as_tensor(data.manipulability, device=self.device)
+        # per-voxel values for position-only queries
+        self.reachable_any = self.reachable.any(dim=-1)
+        self.manipulability_any = self.manipulability.amax(dim=-1)
+
+    @classmethod
+    def load(cls, urdf_path: str, arm: str, device="cpu", min_count: int = 1) -> "ReachabilityMap":
+        """Load the cached map of `arm`; raises if it is missing or was built from another URDF."""
+        path = cache_path(urdf_path, arm)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No reachability map at {path}, run reachability.py first")
+        data = load_map(path)
+        if data.urdf_sha1 != urdf_hash(urdf_path):
+            raise ValueError(f"{path} was built from a different URDF, rebuild it with reachability.py")
+        return cls(data, device, min_count)
+
+    def query(self, positions: torch.Tensor, directions: Optional[torch.Tensor] = None):
+        """
+        Args:
+            positions: (..., 3) EE positions in the robot base frame.
+            directions: optional (..., 3) unit approach directions; None = any direction.
+        Returns:
+            reachable (...,) bool and manipulability (...,) float (0 outside the map).
+        """
+        positions = torch.as_tensor(positions, dtype=torch.float32, device=self.device)
+        voxel = torch.floor((positions - self.origin) / self.voxel_size).long()
+        inside = ((voxel >= 0) & (voxel < self.shape)).all(dim=-1)
+        voxel = torch.minimum(voxel.clamp(min=0), self.shape - 1)
+        x, y, z = voxel.unbind(-1)
+        if directions is None:
+            reachable = self.reachable_any[x, y, z]
+            manipulability = self.manipulability_any[x, y, z]
+        else:
+            directions = torch.as_tensor(directions, dtype=torch.float32, device=self.device)
+            d = (directions @ self.directions.T).argmax(dim=-1)
+            reachable = self.reachable[x, y, z, d]
+            manipulability = self.manipulability[x, y, z, d]
+        return reachable & inside, torch.where(inside, manipulability, torch.zeros_like(manipulability))
+
+
+@dataclass
+class Args:
+    urdf: str = "robot_descriptions/agibot_g1_with_gripper_description/agibot_g1_with_120s.urdf"
+    arms: List[str] = field(default_factory=lambda: ["left", "right"])
+    num_samples: int = 200000
+    voxel_size: float = 0.05
+    num_directions: int = 32
+    """approach direction bins over the sphere"""
+    approach_axis: int = 2
+    """EE link axis (0=x, 1=y, 2=z) used as the approach direction"""
+    seed: int = 0
+
+
+def main(args: Args):
+    for arm in args.arms:
+        data = build_reachability_map(args.urdf, arm, args.num_samples, args.voxel_size,
+                                      args.num_directions, args.seed, args.approach_axis)
+        path = cache_path(args.urdf, arm)
+        save_map(data, path)
+        reachable = data.counts > 0
+        print(f"{arm} arm: {reachable.any(axis=-1).sum()} reachable voxels of {np.prod(data.counts.shape[:3])}, "
+              f"{reachable.sum()} reachable (voxel, direction) bins, "
+              f"max manipulability {data.manipulability.max():.4f}")
+        print(f"Saved to {path}")
+
+
+if __name__ == "__main__":
+    import tyro
+
+    main(tyro.cli(Args))
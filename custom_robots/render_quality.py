@@ -0,0 +1,148 @@
+"""
+Named render quality tiers with lighting and shadow budgets.
+
+A tier bundles the shader pack a camera renders with and the lighting budget
+of the scene it is in:
+
+    fast       minimal shader (no lighting pass, hence no shadow pass), one light
+    balanced   default shader, one shadowed directional light at 1024^2 + one point light
+    photoreal  ray-traced shader, shadowed directional light at 4096^2 + one point light
+
+Shadow maps are rendered by every camera whose shader has a lighting pass, so
+policy cameras on the `fast` tier do not pay for shadows even when another
+camera in the scene uses `balanced`. The lights themselves are a scene
+property: `setup_lighting` builds them for the most expensive tier in use.
+
+Tiers are assigned per camera profile in `camera_registry.CAMERA_QUALITY`.
+Run scripts/benchmark_render_quality.py to see what each tier costs.
+
+Shader packs expose different textures: "minimal" only renders "Color" and
+"PositionSegmentation" (int16 xyz in millimetres + actor/link id), the others
+"Position" (float metres) and "Segmentation" as well. `read_texture` hides the
+difference for consumers that need depth, positions or segmentation.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Union
+
+
+@dataclass(frozen=True)
+class RenderQualityTier:
+    name: str
+    shader_pack: str
+    """ManiSkill shader pack the cameras render with"""
+    shadows: bool
+    """whether the directional light casts shadows"""
+    shadow_map_size: int
+    max_lights: int
+    """directional light plus up to max_lights - 1 point lights"""
+
+
+RENDER_QUALITY_TIERS: Dict[str, RenderQualityTier] = {
+    "fast": RenderQualityTier("fast", shader_pack="minimal", shadows=False, shadow_map_size=512, max_lights=1),
+    "balanced": RenderQualityTier("balanced", shader_pack="default", shadows=True, shadow_map_size=1024, max_lights=2),
+    "photoreal": RenderQualityTier("photoreal", shader_pack="rt", shadows=True, shadow_map_size=4096, max_lights=2),
+}
+TIER_ORDER = ["fast", "balanced", "photoreal"]
+
+# outputs of read_texture -> SAPIEN textures they come from, per shader pack
+_MINIMAL_TEXTURES = {"rgb": "Color", "position": "PositionSegmentation", "depth": "PositionSegmentation",
+                     "segmentation": "PositionSegmentation"}
+_FULL_TEXTURES = {"rgb": "Color", "position": "Position", "depth": "Position", "segmentation": "Segmentation"}
+
+
+def get_tier(tier: Union[str, RenderQualityTier]) -> RenderQualityTier:
+    if isinstance(tier, RenderQualityTier):
+        return tier
+    if tier not in RENDER_QUALITY_TIERS:
+        raise ValueError(f"Unknown render quality tier '{tier}', choose from {TIER_ORDER}")
+    return RENDER_QUALITY_TIERS[tier]
+
+
+def highest_tier(tiers: Iterable[Union[str, RenderQualityTier]]) -> RenderQualityTier:
+    """The most expensive of the given tiers; the scene lighting has to satisfy it."""
+    return max((get_tier(t) for t in tiers), key=lambda t: TIER_ORDER.index(t.name))
+
+
+def setup_lighting(scene, tier: Union[str, RenderQualityTier], ambient=(0.5, 0.5, 0.5)):
+    """
+    Add the standard scene lighting (ambient, directional, optional point light)
+    within the budget of `tier`.
+    """
+    tier = get_tier(tier)
+    scene.set_ambient_light(list(ambient))
+    scene.add_directional_light(
+        direction=[1, -1, -1],
+        color=[1.0, 1.0, 1.0],
+        shadow=tier.shadows,
+        shadow_map_size=tier.shadow_map_size,
+    )
+    if tier.max_lights > 1:
+        scene.add_point_light(
+            position=[1, 1, 2],
+            color=[0.8, 0.8, 0.8],
+            shadow=False,
+        )
+    return tier
+
+
+def apply_shader_pack(tier: Union[str, RenderQualityTier]) -> RenderQualityTier:
+    """Make cameras added with scene.add_camera from now on render with `tier`'s shader pack."""
+    # imported here so the cache setup in warmup.py can run before sapien loads
+    from mani_skill.render.shaders import PREBUILT_SHADER_CONFIGS, set_shader_pack
+
+    tier = get_tier(tier)
+    set_shader_pack(PREBUILT_SHADER_CONFIGS[tier.shader_pack])
+    return tier
+
+
+def camera_shader_pack(camera) -> str:
+    """
+    Shader pack of a ManiSkill Camera sensor (from its config) or of a camera
+    added with camera_registry.add_registered_camera (tagged `shader_pack`).
+    """
+    pack = getattr(camera, "shader_pack", None)
+    if pack is None:
+        pack = getattr(getattr(camera, "config", None), "shader_pack", None)
+    if pack is None:
+        raise ValueError(f"Unknown shader pack for camera {getattr(camera, 'name', camera)}; "
+                         "add it with camera_registry.add_registered_camera")
+    return pack
+
+
+def texture_names(shader_pack: str, outputs: Iterable[str] = ("rgb", "depth", "segmentation")) -> List[str]:
+    """SAPIEN textures `read_texture` needs for `outputs` under `shader_pack`."""
+    textures = _MINIMAL_TEXTURES if shader_pack == "minimal" else _FULL_TEXTURES
+    return sorted({textures[o] for o in outputs})
+
+
+def read_texture(camera, output: str):
+    """
+    One output of `camera`'s last picture, whatever its shader pack:
+
+        rgb           (N, H, W, 3) uint8
+        position      (N, H, W, 3) float32 metres, OpenGL camera frame (looks along -z)
+        depth         (N, H, W) float32 metres, 0 where nothing was hit
+        segmentation  (N, H, W) actor/link id (see segmentation.py)
+
+    Under "minimal", positions come in whole millimetres.
+    """
+    import torch
+
+    pack = camera_shader_pack(camera)
+    texture = texture_names(pack, [output])[0]
+    picture = getattr(camera, "camera", camera).get_picture(texture)
+    if isinstance(picture, list):
+        picture = picture[0]
+    if output == "rgb":
+        rgb = picture[..., :3]
+        if rgb.dtype != torch.uint8:
+            rgb = (rgb.clamp(0, 1) * 255).round().to(torch.uint8)
+        return rgb
+    if output == "segmentation":
+        # the full packs' Segmentation holds the per-mesh id in channel 0, the actor/link id in channel 1
+        return picture[..., 3] if texture == "PositionSegmentation" else picture[..., 1]
+    position = picture[..., :3].to(torch.float32)
+    if texture == "PositionSegmentation":
+        position = position / 1000.0
+    return position if output == "position" else -position[..., 2]
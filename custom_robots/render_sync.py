@@ -0,0 +1,133 @@
+"""
+Dirty-tracked render sync for ManiSkillScene.
+
+`scene.update_render()` pushes the pose of every body to the renderer each time
+it is called, even when the scene has not moved since the last sync (a robot
+holding still, static ground and kinematic props). `IncrementalRenderSync`
+keeps a snapshot of the body poses from the last sync and only calls into the
+renderer when at least one body moved beyond a position/rotation threshold.
+
+Bodies are tracked in the cheapest form available:
+- GPU sim: all rigid body and link poses are fetched and compared in one op
+  on `cuda_rigid_body_data`
+- CPU sim: non-static actors by pose, articulations by root pose + qpos (one
+  call per articulation instead of one per link)
+Camera poses are tracked too, so moving a free camera alone makes the frame
+dirty. The scene's sensors and human render cameras are found automatically;
+cameras created with `scene.add_camera` and not registered there are passed
+via `cameras`.
+
+SAPIEN only exposes pose sync per render system, so a dirty frame still syncs
+every body; clean frames skip the sync entirely.
+
+Usage:
+    sync = IncrementalRenderSync(scene)
+    for step in range(n):
+        scene.step()
+        if step % 50 == 0:
+            sync.update_render()   # only when a picture is actually taken
+            camera.take_picture()
+    print(sync.stats())
+"""
+
+from typing import Dict, List, Optional
+
+import torch
+
+
+def _camera_components(camera) -> list:
+    """SAPIEN RenderCameraComponents behind a ManiSkill Camera sensor or RenderCamera."""
+    camera = getattr(camera, "camera", camera)
+    return list(getattr(camera, "_render_cameras", [camera]))
+
+
+class IncrementalRenderSync:
+    """Skip `scene.update_render()` when no body moved since the last sync."""
+
+    def __init__(self, scene, pos_threshold: float = 1e-4, rot_threshold: float = 1e-4, qpos_threshold: float = 1e-4,
+                 cameras: Optional[List] = None):
+        """
+        Args:
+            scene: the ManiSkillScene to sync.
+            cameras: cameras whose poses are tracked in addition to the scene's sensors / human render cameras.
+            pos_threshold: translation (metres) beyond which a body is dirty.
+            rot_threshold: rotation threshold expressed as 1 - |<q_last, q_now>|.
+            qpos_threshold: joint displacement (rad or m) beyond which an articulation is dirty.
+        """
+        self.scene = scene
+        self.pos_threshold = pos_threshold
+        self.rot_threshold = rot_threshold
+        self.qpos_threshold = qpos_threshold
+
+        # static actors can never become dirty, so they are not tracked at all
+        self.actors = [a for a in scene.actors.values() if a.px_body_type != "static"]
+        self.articulations = list(scene.articulations.values())
+        cameras = list(cameras or [])
+        cameras += [sensor for sensor in getattr(scene, "sensors", {}).values() if hasattr(sensor, "camera")]
+        cameras += list(getattr(scene, "human_render_cameras", {}).values())
+        self.camera_components = [c for camera in cameras for c in _camera_components(camera)]
+
+        self._last = None
+        self._num_syncs = 0
+        self._num_skipped = 0
+
+    def _snapshot(self) -> Dict[str, torch.Tensor]:
+        snapshot = {}
+        if self.camera_components:
+            poses = [c.get_global_pose() for c in self.camera_components]
+            snapshot["cameras"] = torch.tensor([[*pose.p, *pose.q] for pose in poses], dtype=torch.float32)
+        if self.scene.gpu_sim_enabled:
+            # the buffer is only current after a fetch; stale poses would skip needed syncs
+            self.scene.px.gpu_fetch_rigid_dynamic_data()
+            self.scene.px.gpu_fetch_articulation_link_pose()
+            snapshot["bodies"] = self.scene.px.cuda_rigid_body_data.torch()[:, :7].clone()
+            return snapshot
+        if len(self.actors) > 0:
+            snapshot["bodies"] = torch.cat([a.pose.raw_pose for a in self.actors], dim=0)
+        if len(self.articulations) > 0:
+            snapshot["roots"] = torch.cat([a.pose.raw_pose for a in self.articulations], dim=0)
+            snapshot["qpos"] = [a.get_qpos().clone() for a in self.articulations]
+        return snapshot
+
+    def _pose_moved(self, last: torch.Tensor, now: torch.Tensor) -> torch.Tensor:
+        moved = torch.linalg.norm(now[:, :3] - last[:, :3], dim=-1) > self.pos_threshold
+        rot_delta = 1 - torch.abs((now[:, 3:7] * last[:, 3:7]).sum(dim=-1))
+        return moved | (rot_delta > self.rot_threshold)
+
+    def dirty_mask(self, snapshot: Dict[str, torch.Tensor]) -> torch.Tensor:
+        """Boolean mask over all tracked entries, True where the pose changed beyond the thresholds."""
+        masks = []
+        for key in ("bodies", "roots", "cameras"):
+            if key in snapshot:
+                masks.append(self._pose_moved(self._last[key], snapshot[key]))
+        for last, now in zip(self._last.get("qpos", []), snapshot.get("qpos", [])):
+            masks.append((torch.abs(now - last) > self.qpos_threshold).any(dim=-1))
+        if len(masks) == 0:
+            return torch.zeros(0, dtype=torch.bool)
+        return torch.cat([m.flatten() for m in masks])
+
+    def update_render(self, force: bool = False, **kwargs) -> bool:
+        """
+        Sync poses to the renderer if anything moved; kwargs are forwarded to
+        `scene.update_render`. Returns True if a sync happened.
+        """
+        snapshot = self._snapshot()
+        if not force and self._last is not None and not self.dirty_mask(snapshot).any():
+            self._num_skipped += 1
+            return False
+        self.scene.update_render(**kwargs)
+        self._last = snapshot
+        self._num_syncs += 1
+        return True
+
+    def mark_dirty(self):
+        """Force the next update_render() to sync, e.g. after changing lights or materials."""
+        self._last = None
+
+    def stats(self) -> Dict[str, float]:
+        total = self._num_syncs + self._num_skipped
+        return {
+            "syncs": self._num_syncs,
+            "skipped": self._num_skipped,
+            "skip_ratio": self._num_skipped / total if total > 0 else 0.0,
+        }
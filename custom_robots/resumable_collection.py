@@ -0,0 +1,222 @@
+"""
+Checkpointed, resumable data collection.
+
+Long rollouts that keep episodes in memory lose everything on a crash or
+preemption. `ResumableCollector` writes episodes into shards of a
+trajectory_dataset.py dataset as they finish and, every `checkpoint_every`
+episodes and at every shard boundary, atomically (write + fsync + rename)
+saves a checkpoint with
+
+- the ids of completed episodes and shards,
+- the numpy / torch / python RNG states,
+- the writer offset (episodes committed) of the shard in progress.
+
+On restart with the same output directory, completed shards are skipped,
+episodes the in-progress shard received after the last checkpoint are rolled
+back, the RNG states are restored, and collection continues with the next
+episode, so the resumed run produces the same data as an uninterrupted one.
+
+Usage:
+    def run_episode(episode_id, rng) -> dict:   # arrays with a leading step dim
+        ...
+    collector = ResumableCollector("/workspace/g1_data", fields, num_episodes=1000, episodes_per_shard=50)
+    collector.run(run_episode)
+
+    python custom_robots/resumable_collection.py --out-dir /workspace/g1_rollouts   # rerun to resume
+"""
+
+import base64
+import json
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+
+from trajectory_dataset import TrajectoryWriter
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def shard_dir(root: str, shard: int) -> str:
+    return os.path.join(root, f"shard_{shard:05d}")
+
+
+def save_json_atomic(path: str, data: Dict):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def get_rng_states(rng: np.random.Generator) -> Dict:
+    states = {
+        "numpy": rng.bit_generator.state,
+        "torch": base64.b64encode(torch.get_rng_state().numpy().tobytes()).decode(),
+        "python": [list(x) if isinstance(x, tuple) else x for x in random.getstate()],
+    }
+    if torch.cuda.is_available() and torch.cuda.is_initialized():
+        states["torch_cuda"] = [base64.b64encode(s.numpy().tobytes()).decode() for s in torch.cuda.get_rng_state_all()]
+    return states
+
+
+def set_rng_states(rng: np.random.Generator, states: Dict):
+    rng.bit_generator.state = states["numpy"]
+    torch.set_rng_state(torch.frombuffer(bytearray(base64.b64decode(states["torch"])), dtype=torch.uint8))
+    version, internal, gauss = states["python"]
+    random.setstate((version, tuple(internal), gauss))
+    if "torch_cuda" in states and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all([
+            torch.frombuffer(bytearray(base64.b64decode(s)), dtype=torch.uint8) for s in states["torch_cuda"]
+        ])
+
+
+class ResumableCollector:
+    """Runs `episode_fn` for every episode id not yet collected, checkpointing as it goes."""
+
+    def __init__(self, root: str, fields: Dict[str, Tuple[Sequence[int], str]], num_episodes: int,
+                 episodes_per_shard: int = 50, checkpoint_every: int = 5, seed: int = 0):
+        """
+        Args:
+            root: output directory; shards go to root/shard_<k>, the checkpoint to root/checkpoint.json.
+            fields: TrajectoryWriter fields (name -> (per-step shape, dtype)).
+            num_episodes: total episodes to collect.
+            episodes_per_shard: episodes per dataset shard; shard k holds ids [k * n, (k + 1) * n).
+            checkpoint_every: checkpoint after this many episodes (and always at shard ends).
+            seed: seed of the collector's numpy Generator on a fresh start.
+        """
+        self.root = root
+        self.fields = fields
+        self.num_episodes = num_episodes
+        self.episodes_per_shard = episodes_per_shard
+        self.checkpoint_every = checkpoint_every
+        self.rng = np.random.default_rng(seed)
+        self.checkpoint_path = os.path.join(root, CHECKPOINT_FILE)
+        os.makedirs(root, exist_ok=True)
+
+        self.completed_episodes = set()
+        self.completed_shards = set()
+        self.shard_offset = 0
+        """episodes of the current shard covered by the checkpoint"""
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+            if checkpoint["num_episodes"] != num_episodes or checkpoint["episodes_per_shard"] != episodes_per_shard:
+                raise ValueError(f"{self.checkpoint_path} was written for a different collection setup")
+            self.completed_episodes = set(checkpoint["completed_episodes"])
+            self.completed_shards = set(checkpoint["completed_shards"])
+            self.shard_offset = checkpoint["shard_offset"]
+            set_rng_states(self.rng, checkpoint["rng"])
+            print(f"Resuming: {len(self.completed_episodes)}/{num_episodes} episodes, "
+                  f"{len(self.completed_shards)} shards done")
+
+    def save_checkpoint(self):
+        save_json_atomic(self.checkpoint_path, {
+            "num_episodes": self.num_episodes,
+            "episodes_per_shard": self.episodes_per_shard,
+            "completed_episodes": sorted(self.completed_episodes),
+            "completed_shards": sorted(self.completed_shards),
+            "shard_offset": self.shard_offset,
+            "rng": get_rng_states(self.rng),
+        })
+
+    def run(self, episode_fn: Callable[[int, np.random.Generator], Dict[str, np.ndarray]],
+            on_episode: Optional[Callable[[int], None]] = None):
+        """
+        Args:
+            episode_fn: collects one episode given its id and the collector's Generator;
+                returns TrajectoryWriter arrays.
+            on_episode: called with the episode id after it was written.
+        """
+        num_shards = -(-self.num_episodes // self.episodes_per_shard)
+        since_checkpoint = 0
+        for shard in range(num_shards):
+            if shard in self.completed_shards:
+                continue
+            first = shard * self.episodes_per_shard
+            ids = range(first, min(first + self.episodes_per_shard, self.num_episodes))
+            with TrajectoryWriter(shard_dir(self.root, shard), self.fields) as writer:
+                # drop episodes written after the last checkpoint; they are redone with the restored RNG
+                writer.rollback(self.shard_offset)
+                for episode_id in ids:
+                    if episode_id in self.completed_episodes:
+                        continue
+                    writer.add_episode(**episode_fn(episode_id, self.rng))
+                    self.completed_episodes.add(episode_id)
+                    self.shard_offset += 1
+                    since_checkpoint += 1
+                    if on_episode is not None:
+                        on_episode(episode_id)
+                    if since_checkpoint >= self.checkpoint_every:
+                        self.save_checkpoint()
+                        since_checkpoint = 0
+            self.completed_shards.add(shard)
+            self.shard_offset = 0
+            self.save_checkpoint()
+            since_checkpoint = 0
+
+
+@dataclass
+class Args:
+    out_dir: str = "/workspace/g1_rollouts"
+    """rerunning with the same directory resumes the job"""
+    env_id: str = "PickCube-v1"
+    robot_uid: str = "agibot_g1_omni_picker"
+    num_episodes: int = 1000
+    episodes_per_shard: int = 50
+    checkpoint_every: int = 5
+    max_steps: int = 100
+    seed: int = 0
+
+
+def main(args: Args):
+    import gymnasium as gym
+    import mani_skill.envs  # Required to register environments
+    import agibot_g1  # Register the AgibotG1 agents
+    from image_postprocess import CAMERA_POSTPROCESS, ObservationPostprocessor
+
+    env = gym.make(args.env_id, robot_uids=args.robot_uid, obs_mode="rgbd", control_mode="pd_joint_pos",
+                   num_envs=1, sim_backend="cpu")
+    robot = env.unwrapped.agent.robot
+    dof = robot.max_dof
+    postprocess = ObservationPostprocessor({"head_camera": CAMERA_POSTPROCESS["head_camera"]})
+    height, width = CAMERA_POSTPROCESS["head_camera"].size
+    fields = {
+        "qpos": ((dof,), "float32"),
+        "action": ((dof,), "float32"),
+        "head_rgb": ((height, width, 3), "uint8"),
+    }
+
+    low, high = env.action_space.low, env.action_space.high
+
+    def run_episode(episode_id: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        # derive the env seed from the collector's RNG so a resumed run replays the same episodes
+        obs, _ = env.reset(seed=int(rng.integers(2 ** 31)))
+        steps = {name: [] for name in fields}
+        for _ in range(args.max_steps):
+            # actions also come from the checkpointed RNG (the action space has its own, unsaved one)
+            action = rng.uniform(low, high).astype(np.float32)
+            steps["qpos"].append(robot.get_qpos()[0].cpu().numpy())
+            steps["action"].append(np.asarray(action, dtype=np.float32).reshape(dof))
+            steps["head_rgb"].append(postprocess(obs["sensor_data"])["head_camera"]["rgb"][0].cpu().numpy())
+            obs, _, terminated, truncated, _ = env.step(action)
+            if bool(terminated.any()) or bool(truncated.any()):
+                break
+        return {name: np.stack(values) for name, values in steps.items()}
+
+    collector = ResumableCollector(args.out_dir, fields, args.num_episodes, args.episodes_per_shard,
+                                   args.checkpoint_every, args.seed)
+    start = time.perf_counter()
+    collector.run(run_episode, on_episode=lambda i: print(f"episode {i} done ({time.perf_counter() - start:.1f} s)"))
+    env.close()
+
+
+if __name__ == "__main__":
+    import tyro
+
+    main(tyro.cli(Args))
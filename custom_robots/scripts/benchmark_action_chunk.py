@@ -0,0 +1,58 @@
+"""
+Benchmark: env.step per action vs. ActionChunkExecutor for chunked policies
+
+Runs the same random action chunks through a ManiSkill task twice, once with
+one env.step per action and once with ActionChunkExecutor.step_chunk
+(observations only at the end of each chunk), and reports control steps/s.
+
+Usage:
+    python custom_robots/scripts/benchmark_action_chunk.py
+"""
+
+import time
+
+import gymnasium as gym
+import numpy as np
+import mani_skill.envs  # Required to register environments
+import sys
+sys.path.insert(0, '/workspace/custom_robots')
+from action_chunk import ActionChunkExecutor
+
+ENV_ID = "PickCube-v1"
+OBS_MODE = "state"
+CHUNK_SIZE = 16
+NUM_CHUNKS = 50
+
+
+def make_env():
+    return gym.make(ENV_ID, obs_mode=OBS_MODE, control_mode="pd_joint_pos", sim_backend="cpu")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    env = make_env()
+    low, high = env.action_space.low, env.action_space.high
+    chunks = rng.uniform(low, high, size=(NUM_CHUNKS, CHUNK_SIZE, *low.shape)).astype(np.float32)
+
+    env.reset(seed=0)
+    start = time.perf_counter()
+    for chunk in chunks:
+        for action in chunk:
+            env.step(action)
+    per_step = NUM_CHUNKS * CHUNK_SIZE / (time.perf_counter() - start)
+
+    env.reset(seed=0)
+    executor = ActionChunkExecutor(env)
+    start = time.perf_counter()
+    for chunk in chunks:
+        executor.step_chunk(chunk, stop_on_done=False)
+    chunked = NUM_CHUNKS * CHUNK_SIZE / (time.perf_counter() - start)
+    env.close()
+
+    print(f"{ENV_ID}, obs_mode={OBS_MODE}, chunks of {CHUNK_SIZE}")
+    print(f"env.step per action: {per_step:8.0f} steps/s")
+    print(f"step_chunk:          {chunked:8.0f} steps/s ({chunked / per_step:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: cost of each render quality tier for the AgibotG1 cameras
+
+For every tier in render_quality.py, builds the same tabletop scene (lights
+within the tier's budget) with the head and wrist cameras rendering at that
+tier, and reports the mean time per frame of update_render + take_picture +
+reading back the Color texture.
+
+Usage:
+    python custom_robots/scripts/benchmark_render_quality.py
+"""
+
+import time
+
+import numpy as np
+import sapien
+from mani_skill.envs.scene import ManiSkillScene
+from mani_skill.utils.structs.types import SimConfig
+from mani_skill.envs.utils.system.backend import BackendInfo
+import sys
+sys.path.insert(0, '/workspace/custom_robots')
+from camera_registry import AGIBOT_G1_CAMERAS, add_registered_camera
+from render_quality import TIER_ORDER, setup_lighting
+
+RENDER_DEVICE = "cuda"  # or "cpu"
+WARMUP_FRAMES = 5
+BENCH_FRAMES = 50
+NUM_CUBES = 20
+
+
+def build_scene(quality: str):
+    backend = BackendInfo(
+        device="cpu",
+        sim_device="cpu",
+        sim_backend="physx",
+        render_backend="auto",
+        render_device=RENDER_DEVICE,
+    )
+    scene = ManiSkillScene(
+        sim_config=SimConfig(sim_freq=100, control_freq=20),
+        backend=backend,
+    )
+    setup_lighting(scene, quality)
+
+    ground_builder = scene.create_actor_builder()
+    ground_builder.add_box_collision(half_size=[10, 10, 0.1])
+    ground_builder.add_box_visual(half_size=[10, 10, 0.1], material=[0.7, 0.7, 0.7, 1.0])
+    ground = ground_builder.build_static(name="ground")
+    ground.set_pose(sapien.Pose(p=[0, 0, -0.1]))
+
+    # a cluttered table in front of the robot
+    rng = np.random.default_rng(0)
+    for i in range(NUM_CUBES):
+        cube_builder = scene.create_actor_builder()
+        cube_builder.add_box_visual(half_size=[0.03, 0.03, 0.03], material=[*rng.uniform(0, 1, 3), 1.0])
+        cube = cube_builder.build_kinematic(name=f"cube_{i}")
+        cube.set_pose(sapien.Pose(p=[rng.uniform(0.3, 0.8), rng.uniform(-0.4, 0.4), 0.7]))
+
+    loader = scene.create_urdf_loader()
+    loader.fix_root_link = True
+    robot = loader.load("robot_descriptions/agibot_g1_with_gripper_description/agibot_g1_with_omnipicker.urdf")
+
+    cameras = {uid: add_registered_camera(scene, robot, uid, quality=quality) for uid in AGIBOT_G1_CAMERAS}
+    scene.step()
+    return scene, cameras
+
+
+def time_camera(scene, camera, frames: int) -> float:
+    start = time.perf_counter()
+    for _ in range(frames):
+        scene.update_render()
+        camera.take_picture()
+        camera.get_picture("Color")
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    results = {}
+    for quality in TIER_ORDER:
+        try:
+            scene, cameras = build_scene(quality)
+        except RuntimeError as e:
+            print(f"{quality}: skipped ({e})")
+            continue
+        results[quality] = {}
+        for uid, camera in cameras.items():
+            time_camera(scene, camera, WARMUP_FRAMES)
+            results[quality][uid] = time_camera(scene, camera, BENCH_FRAMES)
+
+    uids = list(AGIBOT_G1_CAMERAS)
+    print(f"\nms per frame (update_render + take_picture + Color readback), {BENCH_FRAMES} frames")
+    print(f"{'tier':<12}" + "".join(f"{uid:>22}" for uid in uids) + f"{'all cameras':>16}")
+    for quality, per_camera in results.items():
+        row = "".join(f"{per_camera[uid] * 1000:>22.2f}" for uid in uids)
+        print(f"{quality:<12}{row}{sum(per_camera.values()) * 1000:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,11 @@ from mani_skill.utils.structs.types import SimConfig
 from mani_skill.envs.utils.system.backend import BackendInfo
 import matplotlib.pyplot as plt
 import numpy as np
+import sys
+sys.path.insert(0, '/workspace/custom_robots')
+from camera_registry import AGIBOT_G1_CAMERAS, add_registered_camera
+from render_quality import highest_tier, read_texture, setup_lighting
+from culling import FrustumCuller
 
 print("=" * 70)
 print("Robot Head Camera Example - Direct Scene Access")
@@ -36,16 +41,9 @@ scene = ManiSkillScene(
 
 print("2. Adding lighting to scene...")
 # Add lighting (important for rendering!)
-scene.set_ambient_light([0.6, 0.6, 0.6])
-scene.add_directional_light(
-    direction=[1, -1, -1],
-    color=[1.0, 1.0, 1.0],
-    shadow=True,
-)
-scene.add_point_light(
-    position=[1, 1, 2],
-    color=[0.8, 0.8, 0.8],
-)
+# The lights must satisfy the most expensive camera tier in the scene (all
+# registered cameras default to "fast", which has no shadow pass)
+setup_lighting(scene, highest_tier(c.quality for c in AGIBOT_G1_CAMERAS.values()), ambient=[0.6, 0.6, 0.6])
 
 # Add ground plane for visual reference
 ground_builder = scene.create_actor_builder()
@@ -84,69 +82,12 @@ if head_camera_link is None:
     print(f"   Available links: {[link.name for link in robot.get_links()]}")
     exit(1)
 
-print("5. Adding camera mounted on head_camera link...")
-# Create a camera mounted on the head_camera link
-# The camera configuration matches what's in agibot_g1.py _sensor_configs
-head_camera = scene.add_camera(
-    name="head_camera",
-    mount=head_camera_link,  # Mount to the head_camera link
-    # +90 degree around Y axis
-    pose=sapien.Pose(p=[0, 0, 0], q=[0.707, 0, 0.707, 0]),  # Identity pose relative to link
-    width=1280,  # Higher resolution for better visualization
-    height=720,
-    fovy=np.pi / 2,  # 90 degree field of view
-    near=0.01,
-    far=100,
-)
-
-rpy = [0, -1.117, 1.5708] # Ref: https://github.com/fiveages-sim/robot_descriptions/blob/main/humanoid/Agibot/agibot_g1_description/xacro/omnipicker_camera_stand.xacro
-# convert rpy to quaternion
-def rpy_to_quat(roll, pitch, yaw):
-    cy = np.cos(yaw * 0.5)
-    sy = np.sin(yaw * 0.5)
-    cp = np.cos(pitch * 0.5)
-    sp = np.sin(pitch * 0.5)
-    cr = np.cos(roll * 0.5)
-    sr = np.sin(roll * 0.5)
-
-    qw = cr * cp * cy + sr * sp * sy
-    qx = sr * cp * cy - cr * sp * sy
-    qy = cr * sp * cy + sr * cp * sy
-    qz = cr * cp * sy - sr * sp * cy
-
-    return np.array([qw, qx, qy, qz])
-
-    
-def get_link_by_name(robot, link_name):
-    for link in robot.get_links():
-        if link.name == link_name:
-            return link
-    return None
-
-left_wrist_camera = scene.add_camera(
-    name="left_wrist_camera",
-    mount=get_link_by_name(robot, "left_camera_stand"),  # Mount to the left_wrist_camera link
-    pose=sapien.Pose(p=[0, -0.07754, 0.028618], 
-                     q=rpy_to_quat(*rpy)
-                    #  q=[1, 0, 0, 0]
-                     ),  # Identity pose relative to link
-    width=640,
-    height=480,
-    fovy=np.pi / 2,
-    near=0.01,
-    far=100,
-)
-
-right_wrist_camera = scene.add_camera(
-    name="right_wrist_camera",
-    mount=get_link_by_name(robot, "right_camera_stand"),  # Mount to the right_wrist_camera link
-    pose=sapien.Pose(p=[0, -0.07754, 0.028618], q=rpy_to_quat(*rpy)),  # Identity pose relative to link
-    width=640,
-    height=480,
-    fovy=np.pi / 2,
-    near=0.01,
-    far=100,
-)
+print("5. Adding cameras mounted on head_camera / camera stand links...")
+# All three cameras come from camera_registry, the same calibration the
+# agent's _sensor_configs in agibot_g1.py uses
+head_camera = add_registered_camera(scene, robot, "head_camera")
+left_wrist_camera = add_registered_camera(scene, robot, "left_wrist_camera")
+right_wrist_camera = add_registered_camera(scene, robot, "right_wrist_camera")
 
 print(f"   ✓ Camera added: {head_camera.name}")
 print(f"   Camera type: {type(head_camera)}")
@@ -155,6 +96,10 @@ print(f"   Camera type: {type(left_wrist_camera)}")
 print(f"   ✓ Camera added: {right_wrist_camera.name}")
 print(f"   Camera type: {type(right_wrist_camera)}")
 
+# Wrist cameras only see a small part of the scene; hide everything outside
+# their frustum while they render
+culler = FrustumCuller(scene)
+
 print("6. Stepping simulation and rendering...")
 # Step simulation
 scene.step()
@@ -211,33 +156,27 @@ if isinstance(rgb_data, list) and len(rgb_data) > 0:
     # Also try to get depth
     print("9. (Optional) Capturing depth image...")
     try:
-        position_data = head_camera.get_picture("Position")
-        if isinstance(position_data, list) and len(position_data) > 0:
-            depth_image = position_data[0]
-            if len(depth_image.shape) == 4 and depth_image.shape[0] == 1:
-                depth_image = depth_image[0]
-            
-            # Extract Z component (depth) from position
-            if depth_image.shape[-1] >= 3:
-                depth_image = depth_image[..., 2]  # Z channel
-            
-            if hasattr(depth_image, 'cpu'):
-                depth_image = depth_image.cpu().numpy()
-            
-            print(f"   Depth image shape: {depth_image.shape}")
-            print(f"   Depth range: [{depth_image.min():.3f}, {depth_image.max():.3f}] meters")
-            
-            # Save depth visualization
-            plt.figure(figsize=(10, 7.5))
-            im = plt.imshow(depth_image, cmap='viridis')
-            plt.title("Head Camera - Depth Map", fontsize=14, fontweight='bold')
-            plt.colorbar(im, label='Depth (meters)')
-            plt.axis('off')
-            plt.tight_layout()
-            depth_output_path = '/workspace/head_camera_depth.png'
-            plt.savefig(depth_output_path, bbox_inches='tight', dpi=150)
-            plt.close()
-            print(f"   ✓ Depth image saved to: {depth_output_path}")
+        # read_texture follows the camera's shader pack ("minimal" has no Position texture)
+        depth_image = read_texture(head_camera, "depth")
+        depth_image = depth_image[0]  # Remove batch dimension: (1, H, W) -> (H, W)
+        
+        if hasattr(depth_image, 'cpu'):
+            depth_image = depth_image.cpu().numpy()
+        
+        print(f"   Depth image shape: {depth_image.shape}")
+        print(f"   Depth range: [{depth_image.min():.3f}, {depth_image.max():.3f}] meters")
+        
+        # Save depth visualization
+        plt.figure(figsize=(10, 7.5))
+        im = plt.imshow(depth_image, cmap='viridis')
+        plt.title("Head Camera - Depth Map", fontsize=14, fontweight='bold')
+        plt.colorbar(im, label='Depth (meters)')
+        plt.axis('off')
+        plt.tight_layout()
+        depth_output_path = '/workspace/head_camera_depth.png'
+        plt.savefig(depth_output_path, bbox_inches='tight', dpi=150)
+        plt.close()
+        print(f"   ✓ Depth image saved to: {depth_output_path}")
     except Exception as e:
         print(f"   Depth capture failed: {e}")
     
@@ -247,7 +186,8 @@ else:
 # Get wrist camera images as well
 for wrist_camera, name in [(left_wrist_camera, "Left Wrist Camera"), (right_wrist_camera, "Right Wrist Camera")]:
     print(f"7. Capturing image from {name}...")
-    wrist_camera.take_picture()
+    visible = culler.take_picture(wrist_camera)
+    print(f"   Rendered {int(visible.sum())}/{visible.size} actors")
     rgb_data = wrist_camera.get_picture("Color")
     print(f"   RGB data type: {type(rgb_data)}")
 
@@ -14,6 +14,7 @@ from mani_skill.envs.sapien_env import BaseEnv
 import sys
 sys.path.append('/workspace/custom_robots')
 import agibot_g1
+from threaded_viewer import ThreadedViewer
 
 def main():
     # Create environment with human render mode for interactive viewer
@@ -56,15 +57,11 @@ def main():
     print(f"Action space shape: {env.action_space.shape}")
     
     # Simple control loop - oscillate joints
-    step = 0
+    # The env steps on a worker thread at full speed while the window renders
+    # the latest state at up to 30 FPS; press 'P' in the viewer to pause it
     max_steps = 500
     
-    while step < max_steps:
-        # Check if viewer is closed
-        if viewer and viewer.closed:
-            print("Viewer closed by user.")
-            break
-        
+    def sim_step(step):
         # Create an action - use action space to sample or create proper shape
         # For pd_joint_pos, action is the target joint positions for controllable joints
         action = env.action_space.sample()  # Get properly shaped action
@@ -76,15 +73,14 @@ def main():
             action[i] = amplitude * np.sin(frequency * step + i)
         
         # Step the environment
-        obs, reward, terminated, truncated, info = env.step(action)
-        
-        # Render the viewer
-        viewer = env.render()
+        env.step(action)
         
         if step % 50 == 0:
             print(f"Step {step}/{max_steps}")
-        
-        step += 1
+    
+    stats = ThreadedViewer(env.unwrapped.scene, viewer, max_fps=30).run(sim_step, num_steps=max_steps)
+    print(f"Ran {stats['sim_steps']} steps at {stats['sim_steps_per_second']:.0f} steps/s "
+          f"while rendering at {stats['fps']:.1f} FPS")
     
     print("\nClosing environment...")
     env.close()
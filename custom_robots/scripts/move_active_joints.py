@@ -9,12 +9,18 @@ from typing import Dict, List
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
+import sys
+sys.path.insert(0, '/workspace/custom_robots')
+from render_quality import apply_shader_pack, setup_lighting
+from video_sink import VideoSink
 
 # Rendering options
 RENDER_ON = True
 USE_VIEWER = False  # ManiSkillScene doesn't support interactive viewer directly
                     # Set to False and use RGB capture, or use gymnasium env for viewer
 SAVE_IMAGES = True  # Save RGB images if rendering
+RENDER_QUALITY = "fast"  # "fast" (no shadows), "balanced" or "photoreal", see render_quality.py
+RECORD_VIDEO = True  # Encode every frame to /workspace/videos/main_camera/ in a background process
 
 def move_specific_joints(
     robot,
@@ -75,17 +81,8 @@ def main():
     robot = loader.load("robot_descriptions/agibot_g1_with_gripper_description/agibot_g1_with_120s.urdf")
     
     # Add lighting to the scene (important for rendering!)
-    scene.set_ambient_light([0.3, 0.3, 0.3])  # Ambient light
-    scene.add_directional_light(
-        direction=[1, -1, -1],  # Light direction
-        color=[1.0, 1.0, 1.0],  # White light
-        shadow=True,
-    )
-    scene.add_point_light(
-        position=[2, 0, 2],  # Light position above
-        color=[1.0, 1.0, 1.0],  # White light
-        shadow=False,
-    )
+    # Shadows and extra lights are only added if the quality tier asks for them
+    setup_lighting(scene, RENDER_QUALITY, ambient=[0.3, 0.3, 0.3])
     
     # Add a ground plane for reference
     ground_builder = scene.create_actor_builder()
@@ -134,6 +131,7 @@ def main():
         quat_xyzw = Rotation.from_matrix(rot_mat).as_quat()  # Returns [x, y, z, w]
         quat_wxyz = np.array([quat_xyzw[3], quat_xyzw[0], quat_xyzw[1], quat_xyzw[2]])  # Convert to [w, x, y, z]
         
+        apply_shader_pack(RENDER_QUALITY)
         camera = scene.add_camera(
             name="main_camera",
             pose=sapien.Pose(p=cam_pos.tolist(), q=quat_wxyz.tolist()),
@@ -144,6 +142,12 @@ def main():
             far=10,
         )
         print(f"Camera added at position {cam_pos}, looking at {look_at}")
+
+    video_sink = None
+    if RENDER_ON and RECORD_VIDEO:
+        # drop frames rather than slow down the loop if the encoder can't keep up
+        video_sink = VideoSink('/workspace/videos', ["main_camera"], fps=30, policy="drop")
+        video_sink.start_episode(0)
     
     # 4. Init qpos
     qpos = robot.get_qpos()
@@ -182,11 +186,17 @@ def main():
         
         if RENDER_ON:
             scene.update_render()
+
+            save_image = SAVE_IMAGES and step % 50 == 0 and camera is not None
+            if video_sink is not None or save_image:
+                camera.take_picture()  # one picture serves both the video and the saved image
+                rgb_list = camera.get_picture("Color")  # Returns list of tensors
+
+            if video_sink is not None:
+                video_sink.put("main_camera", rgb_list[0][0])
             
             # Capture image every 50 steps
-            if SAVE_IMAGES and step % 50 == 0 and camera is not None:
-                camera.take_picture()
-                rgb_list = camera.get_picture("Color")  # Returns list of tensors
+            if save_image:
                 if len(rgb_list) > 0:
                     rgb = rgb_list[0]  # Get first (and only) image from list
                     # RGB is shape (batch, H, W, 4) with RGBA
@@ -205,6 +215,10 @@ def main():
         
         step += 1
         time.sleep(dt)
+
+    if video_sink is not None:
+        video_sink.close()
+        print(f"Video frames: {video_sink.stats()['main_camera']}")
     
     # Save captured images
     if SAVE_IMAGES and len(saved_images) > 0:
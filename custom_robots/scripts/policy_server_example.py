@@ -0,0 +1,72 @@
+"""
+Example: several AgibotG1 simulation workers sharing one batched policy
+
+Starts an InferenceServer holding a small torch MLP and NUM_WORKERS worker
+processes, each running its own EmptyEnv-v1 with the agibot_g1_120s robot and
+asking the server for actions every step. The server reports how many
+requests it merged into each forward pass.
+
+Usage:
+    python custom_robots/scripts/policy_server_example.py
+"""
+
+import multiprocessing as mp
+import time
+
+import numpy as np
+import torch
+import sys
+sys.path.insert(0, '/workspace/custom_robots')
+from inference_server import InferenceServer, PolicyClient
+
+ADDRESS = "/tmp/agibot_g1_policy.sock"
+NUM_WORKERS = 4
+NUM_STEPS = 200
+
+
+def worker(worker_id: int):
+    import gymnasium as gym
+    import mani_skill.envs  # Required to register environments
+    import agibot_g1  # Register the AgibotG1 agents
+
+    env = gym.make("EmptyEnv-v1", robot_uids="agibot_g1_120s", obs_mode="state",
+                   control_mode="pd_joint_pos", sim_backend="cpu")
+    obs, _ = env.reset(seed=worker_id)
+    with PolicyClient(ADDRESS) as client:
+        for _ in range(NUM_STEPS):
+            action = client.act({"state": obs.cpu().numpy()})
+            obs, *_ = env.step(action[0] if action.shape[0] == 1 else action)
+    env.close()
+
+
+def main():
+    action_dim = 36
+    # stand-in for a trained policy; the point is one copy of it for all workers
+    # (LazyLinear picks up the state dimension on the first batch)
+    model = torch.nn.Sequential(
+        torch.nn.LazyLinear(256), torch.nn.ReLU(), torch.nn.Linear(256, action_dim), torch.nn.Tanh(),
+    )
+
+    @torch.no_grad()
+    def policy_fn(obs):
+        return model(torch.as_tensor(obs["state"], dtype=torch.float32)).numpy() * 0.1
+
+    server = InferenceServer(policy_fn, ADDRESS, max_batch_size=NUM_WORKERS, max_latency=0.002)
+    server.start()
+
+    start = time.perf_counter()
+    workers = [mp.get_context("spawn").Process(target=worker, args=(i,)) for i in range(NUM_WORKERS)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join()
+    elapsed = time.perf_counter() - start
+    server.stop()
+
+    stats = server.stats
+    print(f"{stats['requests']} requests in {stats['batches']} forward passes "
+          f"({stats['requests'] / max(stats['batches'], 1):.2f} requests/batch), {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Example: simulate without cameras, re-render the rollout afterwards
+
+Runs the G1 tabletop scene at physics speed (render_backend="none"),
+recording only actor poses and qpos with StateRecorder, then re-renders the
+recording through the head and wrist cameras at 640x360 in a process pool.
+`build_scene` is what the re-render workers import to rebuild the scene.
+
+Usage:
+    python custom_robots/scripts/record_states_example.py
+"""
+
+import time
+
+import numpy as np
+import sapien
+from mani_skill.envs.scene import ManiSkillScene
+from mani_skill.utils.structs.types import SimConfig
+from mani_skill.envs.utils.system.backend import BackendInfo
+import sys
+sys.path.insert(0, '/workspace/custom_robots')
+sys.path.insert(0, '/workspace/custom_robots/scripts')
+from render_quality import setup_lighting
+from state_recording import StateRecorder, rerender
+
+NUM_STEPS = 400
+STATES_PATH = '/workspace/g1_states.npz'
+OUT_DIR = '/workspace/g1_rerender'
+
+
+def build_scene(backend):
+    scene = ManiSkillScene(sim_config=SimConfig(sim_freq=100, control_freq=20), backend=backend)
+    if backend.render_backend != "none":
+        setup_lighting(scene, "balanced")
+
+    ground_builder = scene.create_actor_builder()
+    ground_builder.add_box_collision(half_size=[10, 10, 0.1])
+    ground_builder.add_box_visual(half_size=[10, 10, 0.1], material=[0.7, 0.7, 0.7, 1.0])
+    ground = ground_builder.build_static(name="ground")
+    ground.set_pose(sapien.Pose(p=[0, 0, -0.1]))
+
+    cube_builder = scene.create_actor_builder()
+    cube_builder.add_box_collision(half_size=[0.03, 0.03, 0.03])
+    cube_builder.add_box_visual(half_size=[0.03, 0.03, 0.03], material=[1.0, 0.2, 0.2, 1.0])
+    cube = cube_builder.build(name="cube")
+    cube.set_pose(sapien.Pose(p=[0.5, 0, 0.9]))
+
+    loader = scene.create_urdf_loader()
+    loader.fix_root_link = True
+    robot = loader.load("robot_descriptions/agibot_g1_with_gripper_description/agibot_g1_with_omnipicker.urdf")
+    return scene, robot
+
+
+def main():
+    backend = BackendInfo(device="cpu", sim_device="cpu", sim_backend="physx",
+                          render_backend="none", render_device=None)
+    scene, robot = build_scene(backend)
+    recorder = StateRecorder(scene)
+
+    qlimits = robot.get_qlimits()[0].cpu().numpy()
+    low = np.where(np.isfinite(qlimits[:, 0]), qlimits[:, 0], -np.pi)
+    high = np.where(np.isfinite(qlimits[:, 1]), qlimits[:, 1], np.pi)
+    start = time.perf_counter()
+    for step in range(NUM_STEPS):
+        # slow sweep through the joint ranges (set directly, like move_active_joints.py)
+        alpha = 0.5 + 0.5 * np.sin(step / 50)
+        robot.set_qpos((low + alpha * (high - low))[None].astype(np.float32))
+        scene.step()
+        recorder.record()
+    sim_time = time.perf_counter() - start
+    recorder.save(STATES_PATH)
+    print(f"Simulated and recorded {NUM_STEPS} steps in {sim_time:.2f}s -> {STATES_PATH}")
+
+    start = time.perf_counter()
+    rendered = rerender(STATES_PATH, "record_states_example:build_scene", OUT_DIR,
+                        width=640, height=360, num_workers=4)
+    print(f"Re-rendered {rendered} steps in {time.perf_counter() - start:.2f}s -> {OUT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
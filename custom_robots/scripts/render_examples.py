@@ -13,6 +13,10 @@ import time
 import numpy as np
 from typing import Dict, List
 import matplotlib.pyplot as plt
+import sys
+sys.path.insert(0, '/workspace/custom_robots')
+from render_sync import IncrementalRenderSync
+from threaded_viewer import ThreadedViewer
 
 # Choose rendering mode
 RENDER_MODE = "viewer"  # Options: "viewer", "rgb_image", "headless"
@@ -84,21 +88,17 @@ def example_viewer_window():
     print("Viewer window opened. Moving robot joints...")
     print("Close the viewer window to exit.")
     
-    # Simulation loop
-    dt = 1/60.0  # Lower frequency for viewer
-    step = 0
-    while not viewer.closed:
+    # Simulation runs at full speed on a worker thread; the window renders
+    # the latest synced state at up to 60 FPS
+    def sim_step(step):
         if step < 300:
             move_specific_joints(robot, active_joints_to_move, delta=0.01)
-        
         scene.step()
-        scene.update_render()
-        viewer.render()
-        
-        step += 1
-        time.sleep(dt)
     
-    print("Viewer closed.")
+    stats = ThreadedViewer(scene, viewer, max_fps=60).run(sim_step, keep_open=True)
+    
+    print(f"Viewer closed. {stats['sim_steps']} sim steps at {stats['sim_steps_per_second']:.0f} steps/s, "
+          f"{stats['frames']} frames at {stats['fps']:.1f} FPS")
 
 
 def example_rgb_image_capture():
@@ -160,16 +160,19 @@ def example_rgb_image_capture():
     # Simulation loop - capture images at intervals
     dt = 1/240.0
     captured_images = []
+    # Only push poses to the renderer when a picture is taken and something
+    # actually moved since the last one
+    render_sync = IncrementalRenderSync(scene, cameras=[camera_front, camera_side])
     
     for step in range(300):
         if step < 200:
             move_specific_joints(robot, active_joints_to_move, delta=0.01)
         
         scene.step()
-        scene.update_render()
         
         # Capture images every 50 steps
         if step % 50 == 0:
+            render_sync.update_render()
             # Take picture from front camera
             camera_front.take_picture()
             rgb_front = camera_front.get_picture("Color")[..., :3]  # Get RGB, drop alpha
@@ -194,6 +197,7 @@ def example_rgb_image_capture():
     
     # Display captured images
     print(f"\nTotal images captured: {len(captured_images)}")
+    print(f"Render sync stats: {render_sync.stats()}")
     
     # Show first and last frames
     fig, axes = plt.subplots(2, 2, figsize=(12, 10))
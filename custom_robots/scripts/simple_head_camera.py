@@ -12,6 +12,7 @@ sys.path.insert(0, '/workspace/custom_robots')
 # Import robot registration
 import agibot_g1
 import mani_skill.envs
+from host_transfer import AsyncHostTransfer
 
 # Create environment with robot that has head_camera
 env = gym.make(
@@ -26,12 +27,13 @@ env = gym.make(
 # Reset to initialize
 obs, info = env.reset()
 
-# Access head_camera RGB image
-rgb_image = obs["sensor_data"]["head_camera"]["rgb"][0]  # [0] to get first env
+# Copy the observation to host in the background; the sim could keep stepping
+# here while the transfer is in flight
+transfer = AsyncHostTransfer()
+pending = transfer.submit(obs["sensor_data"])
 
-# Convert to numpy if needed
-if hasattr(rgb_image, 'cpu'):
-    rgb_image = rgb_image.cpu().numpy()
+# Access head_camera RGB image (as numpy, once the transfer has landed)
+rgb_image = pending.result()["head_camera"]["rgb"][0]  # [0] to get first env
 
 # Save image
 plt.figure(figsize=(8, 6))
@@ -43,4 +45,5 @@ print(f"✓ Saved image: /workspace/head_camera_simple.png")
 print(f"  Image shape: {rgb_image.shape}")
 print(f"  Value range: [{rgb_image.min():.3f}, {rgb_image.max():.3f}]")
 
+transfer.close()
 env.close()
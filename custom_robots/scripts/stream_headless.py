@@ -0,0 +1,89 @@
+"""
+Example: watch a headless run live in the browser
+
+Streams the head, wrist and a free camera as MJPEG while the left arm moves.
+Start the container with docker/start_headless.sh (which publishes the
+stream port) and open http://localhost:8080/ on the host.
+"""
+
+import sapien
+from mani_skill.envs.scene import ManiSkillScene
+from mani_skill.utils.structs.types import SimConfig
+from mani_skill.envs.utils.system.backend import BackendInfo
+import sys
+sys.path.insert(0, '/workspace/custom_robots')
+from camera_registry import add_registered_camera
+from stream_viewer import StreamViewer
+
+# Inside docker bind all interfaces; the port is only published to the host's localhost
+STREAM_HOST = "0.0.0.0"
+STREAM_PORT = 8080
+STREAM_FPS = 10
+STREAM_WIDTH = 320
+MAX_STEPS = 100000
+
+
+def main():
+    backend = BackendInfo(
+        device="cpu",
+        sim_device="cpu",
+        sim_backend="physx",
+        render_backend="auto",
+        render_device="cpu",
+    )
+    scene = ManiSkillScene(
+        sim_config=SimConfig(sim_freq=240, control_freq=240),
+        backend=backend,
+    )
+
+    scene.set_ambient_light([0.5, 0.5, 0.5])
+    scene.add_directional_light(direction=[1, -1, -1], color=[1.0, 1.0, 1.0])
+
+    ground_builder = scene.create_actor_builder()
+    ground_builder.add_box_collision(half_size=[10, 10, 0.1])
+    ground_builder.add_box_visual(half_size=[10, 10, 0.1], material=[0.5, 0.5, 0.5, 1.0])
+    ground = ground_builder.build_static(name="ground")
+    ground.set_pose(sapien.Pose(p=[0, 0, -0.1]))
+
+    loader = scene.create_urdf_loader()
+    loader.fix_root_link = True
+    robot = loader.load("robot_descriptions/agibot_g1_with_gripper_description/agibot_g1_with_omnipicker.urdf")
+
+    cameras = {
+        uid: add_registered_camera(scene, robot, uid)
+        for uid in ["head_camera", "left_wrist_camera", "right_wrist_camera"]
+    }
+    cameras["free_camera"] = scene.add_camera(
+        name="free_camera",
+        pose=sapien.Pose(p=[2, 0, 1], q=[0.924, 0, 0.383, 0]),
+        width=640,
+        height=480,
+        fovy=1.0,
+        near=0.01,
+        far=10,
+    )
+
+    left_arm = [robot.active_joints_map[f"left_joint{i}"].active_index[0].item() for i in range(1, 8)]
+
+    streamer = StreamViewer(host=STREAM_HOST, port=STREAM_PORT, max_fps=STREAM_FPS, width=STREAM_WIDTH)
+    with streamer:
+        print(f"Open http://localhost:{STREAM_PORT}/ to watch, Ctrl+C to stop")
+        try:
+            for step in range(MAX_STEPS):
+                qpos = robot.get_qpos()
+                qpos[0, left_arm] += 0.002 if (step // 500) % 2 == 0 else -0.002
+                robot.set_qpos(qpos)
+                scene.step()
+
+                # only render when at least one stream wants a new frame
+                if step % max(1, 240 // STREAM_FPS) == 0:
+                    scene.update_render()
+                    for uid, camera in cameras.items():
+                        camera.take_picture()
+                        streamer.publish(uid, camera.get_picture("Color"))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
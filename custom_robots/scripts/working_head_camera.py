@@ -12,6 +12,7 @@ import numpy as np
 import sys
 sys.path.insert(0, '/workspace/custom_robots')
 import agibot_g1
+from segmentation import get_segmentation, get_id_table, to_uint16, rle_encode
 
 print("Creating scene with rendering enabled...")
 
@@ -111,6 +112,14 @@ if hasattr(agent, 'sensors'):
             plt.savefig(output_path, bbox_inches='tight', dpi=150)
             print(f"\n✓✓ SUCCESS! Saved image to: {output_path}")
             plt.close()
+
+            # Actor/link segmentation as a compact uint16 id map
+            seg_ids = to_uint16(get_segmentation(head_camera))[0]
+            id_table = get_id_table(scene)
+            visible = [id_table.get(int(i), "unknown") for i in np.unique(seg_ids)]
+            values, lengths, _ = rle_encode(seg_ids)
+            print(f"  Segmentation shape: {seg_ids.shape}, visible: {visible}")
+            print(f"  RLE size: {values.nbytes + lengths.nbytes} bytes (raw uint16: {seg_ids.nbytes} bytes)")
             
         else:
             print("  ⚠ No RGB data returned")
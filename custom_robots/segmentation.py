@@ -0,0 +1,126 @@
+"""
+Compact actor/link segmentation for the AgibotG1 cameras.
+
+SAPIEN's "Segmentation" texture is 4 x uint32 per pixel (mesh id, actor/link id,
+and two unused channels); the "minimal" shader pack of the sensor cameras
+carries the actor/link id in channel 3 of "PositionSegmentation" instead.
+For training data we only need the actor/link id,
+which fits in a uint16 because ids are assigned per sub-scene. This module
+- extracts that channel as a (N, H, W) uint16 id map,
+- builds the id -> name table once per scene and caches it,
+- offers run-length and bit-packed encodings for storage.
+
+Usage:
+    ids = to_uint16(get_segmentation(agent.sensors["head_camera"]))  # after capture()
+    names = get_id_table(scene)  # {0: "background", 12: "cube", ...}
+    packed = bitpack_encode(ids[0], max_id=max(names))
+"""
+
+import weakref
+from typing import Dict
+
+import numpy as np
+import torch
+
+from render_quality import read_texture
+
+BACKGROUND_ID = 0
+MAX_UINT16_ID = np.iinfo(np.uint16).max
+
+_id_tables = weakref.WeakKeyDictionary()
+
+
+def build_id_table(scene) -> Dict[int, str]:
+    """Map per-scene segmentation ids to actor / link names."""
+    table = {BACKGROUND_ID: "background"}
+    for name, actor in scene.actors.items():
+        table[int(actor._objs[0].per_scene_id)] = name
+    for articulation in scene.articulations.values():
+        for link in articulation.links:
+            table[int(link._objs[0].entity.per_scene_id)] = link.name
+    if max(table) > MAX_UINT16_ID:
+        raise ValueError(f"Segmentation id {max(table)} does not fit in uint16")
+    return table
+
+
+def get_id_table(scene) -> Dict[int, str]:
+    """Cached `build_id_table`; the table is built on first use for each scene."""
+    if scene not in _id_tables:
+        _id_tables[scene] = build_id_table(scene)
+    return _id_tables[scene]
+
+
+def get_segmentation(camera) -> torch.Tensor:
+    """
+    Actor/link id map of the last picture taken by `camera`, as (N, H, W) int16.
+
+    torch has no usable uint16 dtype, so the tensor holds the uint16 bit pattern
+    in an int16 (2 bytes/pixel instead of 16); `to_uint16` reinterprets it on host.
+    Works with ManiSkill Camera sensors and cameras from add_registered_camera,
+    under any shader pack (the "minimal" pack of the sensor cameras has no
+    "Segmentation" texture; see render_quality.read_texture).
+    """
+    return read_texture(camera, "segmentation").to(torch.int16)
+
+
+def to_uint16(ids) -> np.ndarray:
+    """Copy an id map from `get_segmentation` to host and view it as uint16."""
+    if isinstance(ids, torch.Tensor):
+        ids = ids.cpu().numpy()
+    return ids.view(np.uint16) if ids.dtype == np.int16 else ids.astype(np.uint16)
+
+
+def capture_segmentation(agent) -> Dict[str, np.ndarray]:
+    """Capture every sensor of an agent and return {uid: (N, H, W) uint16 id map} on host."""
+    out = {}
+    for uid, sensor in agent.sensors.items():
+        sensor.capture()
+        out[uid] = to_uint16(get_segmentation(sensor))
+    return out
+
+
+def masks_from_ids(ids: torch.Tensor, id_table: Dict[int, str], names) -> Dict[str, torch.Tensor]:
+    """Boolean masks for the given actor/link names, computed on the same device as `ids`."""
+    name_to_id = {v: k for k, v in id_table.items()}
+    ids = ids.to(torch.int32) & 0xFFFF
+    return {name: ids == name_to_id[name] for name in names}
+
+
+def rle_encode(ids: np.ndarray):
+    """Run-length encode an id map. Returns (values uint16, lengths uint32, shape)."""
+    flat = np.ascontiguousarray(ids, dtype=np.uint16).ravel()
+    if flat.size == 0:
+        return np.zeros(0, np.uint16), np.zeros(0, np.uint32), ids.shape
+    starts = np.flatnonzero(np.diff(flat)) + 1
+    starts = np.concatenate([[0], starts])
+    lengths = np.diff(np.concatenate([starts, [flat.size]])).astype(np.uint32)
+    return flat[starts], lengths, ids.shape
+
+
+def rle_decode(values: np.ndarray, lengths: np.ndarray, shape) -> np.ndarray:
+    return np.repeat(values, lengths).reshape(shape)
+
+
+def bits_for(max_id: int) -> int:
+    """Number of bits needed to store ids in [0, max_id]."""
+    return max(1, int(max_id).bit_length())
+
+
+def bitpack_encode(ids: np.ndarray, max_id: int) -> np.ndarray:
+    """Pack each id into `bits_for(max_id)` bits. Returns a flat uint8 buffer."""
+    bits = bits_for(max_id)
+    ids = np.asarray(ids)
+    if ids.size and int(ids.max()) > max_id:
+        raise ValueError(f"Segmentation id {int(ids.max())} does not fit in {bits} bits (max_id {max_id})")
+    flat = np.ascontiguousarray(ids, dtype=np.uint16).ravel()
+    unpacked = np.unpackbits(flat.view(np.uint8).reshape(-1, 2), axis=1, bitorder="little")
+    return np.packbits(unpacked[:, :bits], bitorder="little")
+
+
+def bitpack_decode(buffer: np.ndarray, max_id: int, shape) -> np.ndarray:
+    bits = bits_for(max_id)
+    count = int(np.prod(shape))
+    unpacked = np.unpackbits(buffer, count=count * bits, bitorder="little").reshape(count, bits)
+    padded = np.zeros((count, 16), dtype=np.uint8)
+    padded[:, :bits] = unpacked
+    return np.packbits(padded, axis=1, bitorder="little").view(np.uint16).reshape(shape)
@@ -0,0 +1,202 @@
+"""
+On-device RealSense-style noise for rendered depth and RGB.
+
+Rendered images are perfect; the head camera is modelled on a D455
+(K_D455_1280x720). `SensorNoiseModel` degrades a batch of (N, H, W) depth /
+(N, H, W, 3) RGB frames in a few tensor ops on the render device:
+
+depth
+- depth-dependent Gaussian noise, sigma = base + quadratic * z^2 (stereo error
+  grows with the square of the distance),
+- dropout at depth discontinuities (stereo matching fails at object edges)
+  and random pixel dropout, plus dropout outside [min_depth, far],
+- quantization in disparity space: disparity = f * baseline / z is rounded to
+  `subpixel` pixels, so depth steps grow with z^2 like the real sensor's.
+
+rgb
+- Gaussian blur and additive Gaussian noise.
+
+Parameters are per camera profile (NOISE_PROFILES, keyed like CAMERA_FAR).
+Random numbers come from a counter-based hash of (env seed, frame, pixel)
+rather than a global generator, so every env is seedable on its own and its
+noise does not depend on which other envs are in the batch.
+
+Usage:
+    noise = SensorNoiseModel.for_camera("head_camera", num_envs, device="cuda", seeds=env_seeds)
+    depth = noise.apply_depth(depth)   # metres, 0 = no return
+    rgb = noise.apply_rgb(rgb)
+    noise.step()                       # next frame
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import torch
+
+_MASK32 = 0xFFFFFFFF
+# independent random streams per noise component
+_STREAM_DEPTH, _STREAM_EDGE, _STREAM_DROPOUT, _STREAM_RGB = 0, 1, 2, 3
+
+
+@dataclass
+class SensorNoiseConfig:
+    depth_noise_base: float = 0.001
+    """sigma (m) at zero distance"""
+    depth_noise_quadratic: float = 0.002
+    """sigma grows by this many metres per m^2 of depth"""
+    edge_threshold: float = 0.05
+    """depth jump (m) to a neighbour that marks an edge pixel"""
+    edge_dropout: float = 0.5
+    """probability that an edge pixel has no return"""
+    dropout: float = 0.002
+    """probability that any pixel has no return"""
+    min_depth: float = 0.4
+    baseline: float = 0.095
+    """stereo baseline (m) used for disparity quantization"""
+    subpixel: float = 0.08
+    """disparity resolution in pixels; 0 disables quantization"""
+    rgb_noise: float = 0.01
+    """std of additive RGB noise (0-1 scale)"""
+    blur_sigma: float = 0.5
+    """Gaussian blur sigma in pixels; 0 disables blur"""
+
+
+NOISE_PROFILES = {
+    # D455: 95 mm baseline, ~2% error at 4 m, min range ~0.4 m
+    "head": SensorNoiseConfig(),
+    # short-range wrist cameras: narrower baseline, closer min range, less noise
+    "wrist": SensorNoiseConfig(depth_noise_base=0.0005, depth_noise_quadratic=0.001, baseline=0.018,
+                               min_depth=0.07, subpixel=0.05),
+}
+
+
+def _fmix32(x: torch.Tensor) -> torch.Tensor:
+    """murmur3 finalizer on int64 tensors holding 32-bit values."""
+    x = x ^ (x >> 16)
+    x = (x * 0x85EBCA6B) & _MASK32
+    x = x ^ (x >> 13)
+    x = (x * 0xC2B2AE35) & _MASK32
+    return x ^ (x >> 16)
+
+
+class SensorNoiseModel:
+    """Batched, per-env seedable depth and RGB noise for one camera."""
+
+    def __init__(self, config: SensorNoiseConfig, focal_length: float, far: float, num_envs: int,
+                 device="cpu", seeds: Optional[Sequence[int]] = None):
+        """
+        Args:
+            config: noise parameters.
+            focal_length: fx in pixels, for disparity quantization.
+            far: far plane (m); depth beyond it is dropped.
+            num_envs: batch size N of the frames.
+            device: device of the frames.
+            seeds: one seed per env; defaults to 0..N-1.
+        """
+        self.config = config
+        self.focal_length = focal_length
+        self.far = far
+        self.device = torch.device(device)
+        self.seeds = torch.as_tensor(range(num_envs) if seeds is None else seeds, dtype=torch.int64, device=self.device)
+        self.frames = torch.zeros(num_envs, dtype=torch.int64, device=self.device)
+        self._blur_kernel = None
+
+    @classmethod
+    def for_camera(cls, uid: str, num_envs: int, device="cpu", seeds: Optional[Sequence[int]] = None,
+                   config: Optional[SensorNoiseConfig] = None) -> "SensorNoiseModel":
+        """Noise model for a registered camera, using its profile's defaults unless `config` is given."""
+        from camera_registry import AGIBOT_G1_CAMERAS
+
+        calib = AGIBOT_G1_CAMERAS[uid]
+        config = NOISE_PROFILES[calib.profile] if config is None else config
+        return cls(config, float(calib.intrinsic[0, 0]), calib.far, num_envs, device, seeds)
+
+    def step(self, env_idx: Optional[torch.Tensor] = None):
+        """Advance to the next frame (for all envs or `env_idx`)."""
+        if env_idx is None:
+            self.frames += 1
+        else:
+            self.frames[env_idx] += 1
+
+    def reset(self, env_idx: torch.Tensor, seeds: Sequence[int]):
+        """Reseed some envs (e.g. on episode reset) and restart their frame counters."""
+        self.seeds[env_idx] = torch.as_tensor(seeds, dtype=torch.int64, device=self.device)
+        self.frames[env_idx] = 0
+
+    def _uniform(self, shape, stream: int) -> torch.Tensor:
+        """(N, *shape) uniforms in (0, 1), a pure function of (seed, frame, stream, element)."""
+        n = len(self.seeds)
+        numel = 1
+        for s in shape:
+            numel *= s
+        index = torch.arange(numel, dtype=torch.int64, device=self.device).view(1, *shape)
+        key = _fmix32((self.seeds * 0x9E3779B1 + self.frames * 0x632BE5AB + stream * 0x27D4EB2F) & _MASK32)
+        x = _fmix32((index + key.view(n, *([1] * len(shape))) * 0x165667B1) & _MASK32)
+        return (x.to(torch.float32) + 0.5) / 4294967296.0
+
+    def _normal(self, shape, stream: int) -> torch.Tensor:
+        # Box-Muller on two independent hash streams
+        u1 = self._uniform(shape, 2 * stream + 100)
+        u2 = self._uniform(shape, 2 * stream + 101)
+        return torch.sqrt(-2 * torch.log(u1)) * torch.cos(2 * torch.pi * u2)
+
+    def apply_depth(self, depth: torch.Tensor) -> torch.Tensor:
+        """(N, H, W) depth in metres (0 = no return) -> noisy depth, same shape and device."""
+        cfg = self.config
+        shape = depth.shape[1:]
+        valid = depth > 0
+
+        # discontinuities: largest jump to a 4-neighbour
+        padded = torch.nn.functional.pad(depth[:, None], (1, 1, 1, 1), mode="replicate")[:, 0]
+        jump = torch.stack([
+            (padded[:, 1:-1, 2:] - depth).abs(), (padded[:, 1:-1, :-2] - depth).abs(),
+            (padded[:, 2:, 1:-1] - depth).abs(), (padded[:, :-2, 1:-1] - depth).abs(),
+        ]).amax(dim=0)
+        edge = jump > cfg.edge_threshold
+
+        sigma = cfg.depth_noise_base + cfg.depth_noise_quadratic * depth ** 2
+        noisy = depth + sigma * self._normal(shape, _STREAM_DEPTH)
+
+        if cfg.subpixel > 0:
+            fb = self.focal_length * cfg.baseline
+            disparity = fb / noisy.clamp(min=1e-6)
+            disparity = torch.round(disparity / cfg.subpixel).clamp(min=1) * cfg.subpixel
+            noisy = fb / disparity
+
+        drop = ~valid | (noisy < cfg.min_depth) | (noisy > self.far)
+        drop |= edge & (self._uniform(shape, _STREAM_EDGE) < cfg.edge_dropout)
+        drop |= self._uniform(shape, _STREAM_DROPOUT) < cfg.dropout
+        return torch.where(drop, torch.zeros_like(noisy), noisy)
+
+    def _blur(self, images: torch.Tensor) -> torch.Tensor:
+        """Separable Gaussian blur of (N, C, H, W) float images."""
+        sigma = self.config.blur_sigma
+        if self._blur_kernel is None:
+            radius = max(1, int(round(3 * sigma)))
+            x = torch.arange(-radius, radius + 1, dtype=torch.float32, device=self.device)
+            kernel = torch.exp(-0.5 * (x / sigma) ** 2)
+            self._blur_kernel = kernel / kernel.sum()
+        k = self._blur_kernel
+        c = images.shape[1]
+        r = len(k) // 2
+        images = torch.nn.functional.conv2d(torch.nn.functional.pad(images, (r, r, 0, 0), mode="replicate"),
+                                            k.view(1, 1, 1, -1).expand(c, 1, 1, -1), groups=c)
+        images = torch.nn.functional.conv2d(torch.nn.functional.pad(images, (0, 0, r, r), mode="replicate"),
+                                            k.view(1, 1, -1, 1).expand(c, 1, -1, 1), groups=c)
+        return images
+
+    def apply_rgb(self, rgb: torch.Tensor) -> torch.Tensor:
+        """(N, H, W, 3|4) RGB(A), float in [0, 1] or uint8 -> noisy image of the same dtype."""
+        cfg = self.config
+        is_uint8 = rgb.dtype == torch.uint8
+        color = rgb[..., :3].to(torch.float32) / (255.0 if is_uint8 else 1.0)
+        if cfg.blur_sigma > 0:
+            color = self._blur(color.permute(0, 3, 1, 2)).permute(0, 2, 3, 1)
+        if cfg.rgb_noise > 0:
+            color = color + cfg.rgb_noise * self._normal(color.shape[1:], _STREAM_RGB)
+        color = color.clamp(0, 1)
+        if is_uint8:
+            color = torch.round(color * 255).to(torch.uint8)
+        else:
+            color = color.to(rgb.dtype)
+        return torch.cat([color, rgb[..., 3:]], dim=-1) if rgb.shape[-1] == 4 else color
@@ -0,0 +1,338 @@
+"""
+Sphere-approximated collision model of the G1 for batched collision checks.
+
+Checking a configuration through SAPIEN means set_qpos + a physics step per
+candidate. This model is independent of SAPIEN:
+
+- the URDF is parsed once into a kinematic tree, and forward kinematics for a
+  (B, dof) batch of configurations is a handful of batched 4x4 products in torch,
+- every link's collision geometry (meshes via trimesh, boxes, cylinders,
+  spheres) is covered by a few spheres: surface samples are clustered around
+  farthest-point-sampled centers and each sphere's radius covers its cluster,
+  so the approximation is conservative,
+- self-collision tests all sphere pairs of link pairs that can collide
+  (parent/child links and pairs filtered by collision_filter.py are skipped),
+- environment collision tests against a point cloud and/or oriented boxes.
+
+The spheres are cached as JSON next to the URDF (invalidated when the URDF or
+`spheres_per_link` changes); run this file to (re)build them with other settings.
+
+Usage:
+    model = SphereCollisionModel(urdf_path, joint_names=G1_120S_ACTIVE_JOINTS, device="cuda")
+    collides = model.self_collision(qpos) | model.env_collision(qpos, points=cloud)   # (B,) bool
+"""
+
+import json
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+
+from collision_filter import load_cached_filter, urdf_hash
+from joint_freezing import rpy_to_matrix
+
+CACHE_SUFFIX = ".spheres.json"
+
+
+def cache_path(urdf_path: str) -> str:
+    return os.path.splitext(urdf_path)[0] + CACHE_SUFFIX
+
+
+def _floats(text: Optional[str], default) -> np.ndarray:
+    return np.array([float(v) for v in text.split()]) if text else np.array(default, dtype=np.float64)
+
+
+def _origin_matrix(element) -> np.ndarray:
+    T = np.eye(4)
+    origin = element.find("origin") if element is not None else None
+    if origin is not None:
+        T[:3, :3] = rpy_to_matrix(_floats(origin.get("rpy"), [0, 0, 0]))
+        T[:3, 3] = _floats(origin.get("xyz"), [0, 0, 0])
+    return T
+
+
+@dataclass
+class URDFJoint:
+    name: str
+    type: str
+    parent: str
+    child: str
+    origin: np.ndarray
+    """4x4 child-joint frame in the parent link frame"""
+    axis: np.ndarray
+    mimic: Optional[Tuple[str, float, float]] = None
+    """(joint, multiplier, offset)"""
+
+
+def parse_urdf(urdf_path: str) -> Tuple[List[str], List[URDFJoint], str]:
+    """Link names, joints ordered parents-first, and the root link."""
+    root = ET.parse(urdf_path).getroot()
+    links = [link.get("name") for link in root.findall("link")]
+    joints = []
+    for j in root.findall("joint"):
+        axis_el = j.find("axis")
+        mimic_el = j.find("mimic")
+        mimic = None
+        if mimic_el is not None:
+            mimic = (mimic_el.get("joint"), float(mimic_el.get("multiplier", 1.0)), float(mimic_el.get("offset", 0.0)))
+        axis = _floats(axis_el.get("xyz") if axis_el is not None else None, [1, 0, 0])
+        joints.append(URDFJoint(
+            name=j.get("name"), type=j.get("type"), parent=j.find("parent").get("link"),
+            child=j.find("child").get("link"), origin=_origin_matrix(j), axis=axis / np.linalg.norm(axis),
+            mimic=mimic,
+        ))
+    children = {j.child for j in joints}
+    root_link = next(link for link in links if link not in children)
+    # breadth-first from the root so every joint comes after its parent link's joint
+    ordered, frontier = [], [root_link]
+    while frontier:
+        parent = frontier.pop(0)
+        for j in joints:
+            if j.parent == parent:
+                ordered.append(j)
+                frontier.append(j.child)
+    return links, ordered, root_link
+
+
+def _resolve_mesh(urdf_path: str, filename: str) -> str:
+    if filename.startswith("package://"):
+        filename = filename[len("package://"):].split("/", 1)[1]
+    return os.path.join(os.path.dirname(urdf_path), filename)
+
+
+def link_surface_points(urdf_path: str, num_points: int = 2000) -> Dict[str, np.ndarray]:
+    """Surface samples (P, 3) of every link's collision geometry, in the link frame."""
+    import trimesh
+
+    root = ET.parse(urdf_path).getroot()
+    points = {}
+    for link in root.findall("link"):
+        meshes = []
+        for collision in link.findall("collision"):
+            geometry = collision.find("geometry")
+            T = _origin_matrix(collision)
+            shape = geometry[0]
+            if shape.tag == "mesh":
+                mesh = trimesh.load(_resolve_mesh(urdf_path, shape.get("filename")), force="mesh")
+                mesh.apply_scale(_floats(shape.get("scale"), [1, 1, 1]))
+            elif shape.tag == "box":
+                mesh = trimesh.creation.box(extents=_floats(shape.get("size"), [0, 0, 0]))
+            elif shape.tag == "cylinder":
+                mesh = trimesh.creation.cylinder(radius=float(shape.get("radius")), height=float(shape.get("length")))
+            elif shape.tag == "sphere":
+                mesh = trimesh.creation.icosphere(radius=float(shape.get("radius")))
+            else:
+                continue
+            mesh.apply_transform(T)
+            meshes.append(mesh)
+        if meshes:
+            mesh = trimesh.util.concatenate(meshes)
+            # vertices keep thin features that area-weighted sampling can miss
+            points[link.get("name")] = np.concatenate([mesh.sample(num_points), mesh.vertices])
+    return points
+
+
+def fit_spheres(points: np.ndarray, num_spheres: int, min_radius: float = 1e-3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cover `points` with `num_spheres` spheres: FPS centers, radius = farthest assigned point.
+    A sphere whose cluster is just its own center still keeps `min_radius` so that point stays covered.
+    """
+    centers = [points.mean(axis=0)]
+    dist = np.linalg.norm(points - centers[0], axis=1)
+    for _ in range(num_spheres - 1):
+        centers.append(points[dist.argmax()])
+        dist = np.minimum(dist, np.linalg.norm(points - centers[-1], axis=1))
+    centers = np.array(centers)
+    assignment = np.linalg.norm(points[:, None] - centers[None], axis=-1).argmin(axis=1)
+    # only clusters without any point (e.g. a mean center off the surface) can go
+    keep = np.array([(assignment == k).any() for k in range(len(centers))])
+    radii = np.array([
+        max(np.linalg.norm(points[assignment == k] - centers[k], axis=1).max(), min_radius) if keep[k] else 0.0
+        for k in range(len(centers))
+    ])
+    return centers[keep], radii[keep]
+
+
+def build_spheres(urdf_path: str, spheres_per_link: int = 8, num_points: int = 2000) -> Dict:
+    spheres = {}
+    for link, points in link_surface_points(urdf_path, num_points).items():
+        centers, radii = fit_spheres(points, spheres_per_link)
+        spheres[link] = {"centers": centers.tolist(), "radii": radii.tolist()}
+    return {"urdf_sha1": urdf_hash(urdf_path), "spheres_per_link": spheres_per_link, "spheres": spheres}
+
+
+def load_spheres(urdf_path: str, spheres_per_link: int = 8) -> Dict[str, Dict]:
+    """
+    The cached spheres of `urdf_path`, built (and cached) first if missing, stale
+    or built with a different `spheres_per_link`.
+    """
+    path = cache_path(urdf_path)
+    if os.path.exists(path):
+        with open(path) as f:
+            cached = json.load(f)
+        if cached["urdf_sha1"] == urdf_hash(urdf_path) and cached.get("spheres_per_link") == spheres_per_link:
+            return cached["spheres"]
+    cached = build_spheres(urdf_path, spheres_per_link)
+    with open(path, "w") as f:
+        json.dump(cached, f)
+    return cached["spheres"]
+
+
+def _axis_angle_batch(axis: torch.Tensor, angle: torch.Tensor) -> torch.Tensor:
+    """(B,) angles about a fixed unit axis -> (B, 3, 3) rotations."""
+    K = torch.zeros((3, 3), dtype=angle.dtype, device=angle.device)
+    K[0, 1], K[0, 2], K[1, 0], K[1, 2], K[2, 0], K[2, 1] = -axis[2], axis[1], axis[2], -axis[0], -axis[1], axis[0]
+    s, c = torch.sin(angle)[:, None, None], torch.cos(angle)[:, None, None]
+    return torch.eye(3, dtype=angle.dtype, device=angle.device) + s * K + (1 - c) * (K @ K)
+
+
+class SphereCollisionModel:
+    """Batched forward kinematics + sphere collision checks for one URDF."""
+
+    def __init__(self, urdf_path: str, joint_names: Optional[Sequence[str]] = None, device="cpu",
+                 spheres_per_link: int = 8, use_collision_filter: bool = True):
+        """
+        Args:
+            urdf_path: robot URDF.
+            joint_names: order of the qpos columns; defaults to the movable, non-mimic
+                joints in URDF breadth-first order. Pass G1_120S_ACTIVE_JOINTS to
+                use SAPIEN's qpos order.
+            device: torch device for all checks.
+            spheres_per_link: spheres fitted per link when the cache is built.
+            use_collision_filter: also skip link pairs filtered by collision_filter.py's cache.
+        """
+        self.device = torch.device(device)
+        links, self.joints, self.root_link = parse_urdf(urdf_path)
+        movable = [j.name for j in self.joints if j.type != "fixed" and j.mimic is None]
+        self.joint_names = list(joint_names) if joint_names is not None else movable
+        self.qpos_index = {name: i for i, name in enumerate(self.joint_names)}
+        self.joint_by_name = {j.name: j for j in self.joints}
+        self.link_index = {name: i for i, name in enumerate(links)}
+        self.origins = [torch.as_tensor(j.origin, dtype=torch.float32, device=self.device) for j in self.joints]
+        self.axes = [torch.as_tensor(j.axis, dtype=torch.float32, device=self.device) for j in self.joints]
+        self.num_links = len(links)
+
+        spheres = load_spheres(urdf_path, spheres_per_link)
+        centers, radii, owner = [], [], []
+        for link, s in spheres.items():
+            centers += s["centers"]
+            radii += s["radii"]
+            owner += [self.link_index[link]] * len(s["radii"])
+        self.centers = torch.tensor(centers, dtype=torch.float32, device=self.device)
+        self.radii = torch.tensor(radii, dtype=torch.float32, device=self.device)
+        self.owner = torch.tensor(owner, dtype=torch.long, device=self.device)
+
+        # link pairs that can never be reported as colliding
+        skip = np.eye(self.num_links, dtype=bool)
+        for j in self.joints:
+            a, b = self.link_index[j.parent], self.link_index[j.child]
+            skip[a, b] = skip[b, a] = True
+        if use_collision_filter:
+            collision_filter = load_cached_filter(urdf_path)
+            if collision_filter is not None:
+                bits = np.array([collision_filter.link_bits.get(name, 0) for name in links])
+                skip |= (bits[:, None] & bits[None, :]) != 0
+        owner_np = np.array(owner)
+        i, j = np.triu_indices(len(owner_np), k=1)
+        keep = ~skip[owner_np[i], owner_np[j]]
+        self.pair_i = torch.as_tensor(i[keep], device=self.device)
+        self.pair_j = torch.as_tensor(j[keep], device=self.device)
+
+    def _joint_value(self, name: str, qpos: torch.Tensor) -> torch.Tensor:
+        """(B,) value of a joint; mimic joints resolve their source from qpos, wherever it sits in the tree."""
+        if name in self.qpos_index:
+            return qpos[:, self.qpos_index[name]]
+        joint = self.joint_by_name.get(name)
+        if joint is not None and joint.mimic is not None:
+            source, multiplier, offset = joint.mimic
+            return self._joint_value(source, qpos) * multiplier + offset
+        return torch.zeros(qpos.shape[0], device=self.device)
+
+    def link_poses(self, qpos: torch.Tensor, base_pose: Optional[torch.Tensor] = None) -> torch.Tensor:
+        """(B, dof) configurations -> (B, L, 4, 4) link poses in the base (or `base_pose` (B, 4, 4)) frame."""
+        qpos = torch.as_tensor(qpos, dtype=torch.float32, device=self.device)
+        B = qpos.shape[0]
+        eye = torch.eye(4, device=self.device).expand(B, 4, 4)
+        poses = [None] * self.num_links
+        poses[self.link_index[self.root_link]] = eye if base_pose is None else base_pose
+        for joint, origin, axis in zip(self.joints, self.origins, self.axes):
+            T = poses[self.link_index[joint.parent]] @ origin
+            if joint.type != "fixed":
+                q = self._joint_value(joint.name, qpos)
+                motion = torch.eye(4, device=self.device).repeat(B, 1, 1)
+                if joint.type == "prismatic":
+                    motion[:, :3, 3] = q[:, None] * axis
+                else:
+                    motion[:, :3, :3] = _axis_angle_batch(axis, q)
+                T = T @ motion
+            poses[self.link_index[joint.child]] = T
+        return torch.stack(poses, dim=1)
+
+    def sphere_centers(self, qpos: torch.Tensor, base_pose: Optional[torch.Tensor] = None) -> torch.Tensor:
+        """(B, S, 3) world sphere centers."""
+        poses = self.link_poses(qpos, base_pose)[:, self.owner]
+        return (poses[..., :3, :3] @ self.centers[None, :, :, None])[..., 0] + poses[..., :3, 3]
+
+    def self_collision(self, qpos: torch.Tensor, margin: float = 0.0) -> torch.Tensor:
+        """(B,) whether any two non-skipped links overlap."""
+        centers = self.sphere_centers(qpos)
+        dist = torch.linalg.norm(centers[:, self.pair_i] - centers[:, self.pair_j], dim=-1)
+        return (dist < self.radii[self.pair_i] + self.radii[self.pair_j] + margin).any(dim=-1)
+
+    def env_collision(self, qpos: torch.Tensor, points: Optional[torch.Tensor] = None,
+                      boxes: Optional[Tuple[torch.Tensor, torch.Tensor]] = None,
+                      base_pose: Optional[torch.Tensor] = None, margin: float = 0.0,
+                      chunk_size: int = 1024) -> torch.Tensor:
+        """
+        (B,) whether the robot touches the environment.
+
+        Args:
+            points: (M, 3) obstacle point cloud in the base frame.
+            boxes: (poses (K, 4, 4), half_sizes (K, 3)) oriented obstacle boxes in the base frame.
+            chunk_size: configurations per cdist call, bounds memory for large clouds.
+        """
+        centers = self.sphere_centers(qpos, base_pose)
+        radii = self.radii + margin
+        hit = torch.zeros(centers.shape[0], dtype=torch.bool, device=self.device)
+        if points is not None:
+            points = torch.as_tensor(points, dtype=torch.float32, device=self.device)
+            for start in range(0, centers.shape[0], chunk_size):
+                c = centers[start:start + chunk_size]
+                nearest = torch.cdist(c, points[None].expand(c.shape[0], -1, -1)).amin(dim=-1)
+                hit[start:start + chunk_size] |= (nearest < radii).any(dim=-1)
+        if boxes is not None:
+            box_poses, half_sizes = (torch.as_tensor(x, dtype=torch.float32, device=self.device) for x in boxes)
+            R, t = box_poses[:, :3, :3], box_poses[:, :3, 3]
+            # sphere centers in every box frame: (B, S, K, 3)
+            local = torch.einsum("kji,bskj->bski", R, centers[:, :, None] - t)
+            outside = local.abs() - half_sizes
+            dist = torch.linalg.norm(outside.clamp(min=0), dim=-1) + outside.amax(dim=-1).clamp(max=0)
+            hit |= (dist < radii[None, :, None]).any(dim=-1).any(dim=-1)
+        return hit
+
+
+@dataclass
+class Args:
+    urdf: str = "robot_descriptions/agibot_g1_with_gripper_description/agibot_g1_with_120s.urdf"
+    spheres_per_link: int = 8
+    num_points: int = 2000
+    """surface samples per link the spheres must cover"""
+
+
+def main(args: Args):
+    cached = build_spheres(args.urdf, args.spheres_per_link, args.num_points)
+    path = cache_path(args.urdf)
+    with open(path, "w") as f:
+        json.dump(cached, f)
+    num_spheres = sum(len(s["radii"]) for s in cached["spheres"].values())
+    print(f"{num_spheres} spheres for {len(cached['spheres'])} links")
+    print(f"Saved to {path}")
+
+
+if __name__ == "__main__":
+    import tyro
+
+    main(tyro.cli(Args))
@@ -0,0 +1,201 @@
+"""
+Record scene state during rollouts, render camera images offline.
+
+Rendering inside the rollout loop ties data generation to render speed and
+fixes the camera setup at collection time. `StateRecorder` instead stores
+only what the renderer needs per step:
+
+- the raw pose (N, 7) of every non-static actor,
+- the root pose (N, 7) and qpos (N, dof) of every articulation (the G1),
+
+and `rerender` replays a recording through the registered AgibotG1 cameras
+(camera_registry.py) at any resolution / render quality tier, splitting the
+frames over a process pool where every worker owns its own scene.
+
+The scene is rebuilt by a user function `scene_fn(backend) -> (scene, robot)`
+given as "module:function", so it can be imported in the workers; actor and
+articulation names must match the recorded ones.
+
+Usage:
+    recorder = StateRecorder(scene)
+    for step in range(T):
+        ...; scene.step(); recorder.record()
+    recorder.save("rollout.npz")
+
+    python custom_robots/state_recording.py --states rollout.npz \\
+        --scene-fn record_states_example:build_scene --width 320 --height 240 --num-workers 4
+"""
+
+import importlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+ACTOR_PREFIX = "actor/"
+ROOT_POSE_PREFIX = "root_pose/"
+QPOS_PREFIX = "qpos/"
+
+
+def _to_numpy(x) -> np.ndarray:
+    return x.cpu().numpy() if hasattr(x, "cpu") else np.asarray(x)
+
+
+class StateRecorder:
+    """Buffers per-step actor poses and articulation root poses / qpos of a ManiSkillScene."""
+
+    def __init__(self, scene, actors: Optional[List[str]] = None, articulations: Optional[List[str]] = None):
+        """
+        Args:
+            scene: the ManiSkillScene being simulated.
+            actors: names of actors to record; defaults to every non-static actor.
+            articulations: names of articulations to record; defaults to all of them.
+        """
+        if actors is None:
+            actors = [name for name, actor in scene.actors.items() if actor.px_body_type != "static"]
+        if articulations is None:
+            articulations = list(scene.articulations.keys())
+        self.actors = {name: scene.actors[name] for name in actors}
+        self.articulations = {name: scene.articulations[name] for name in articulations}
+        self.frames: Dict[str, List[np.ndarray]] = {}
+
+    def record(self):
+        """Append the current state; call after every step that should be renderable."""
+        state = {}
+        for name, actor in self.actors.items():
+            state[ACTOR_PREFIX + name] = actor.pose.raw_pose
+        for name, articulation in self.articulations.items():
+            state[ROOT_POSE_PREFIX + name] = articulation.pose.raw_pose
+            state[QPOS_PREFIX + name] = articulation.get_qpos()
+        for key, value in state.items():
+            self.frames.setdefault(key, []).append(_to_numpy(value).astype(np.float32))
+
+    def __len__(self):
+        return len(next(iter(self.frames.values()), []))
+
+    def save(self, path: str):
+        """Save as npz with one (T, N, ...) array per actor pose / root pose / qpos."""
+        np.savez(path, **{key: np.stack(values) for key, values in self.frames.items()})
+        self.frames.clear()
+
+
+def apply_state(scene, state: Dict[str, np.ndarray], t: int):
+    """Put the scene into recorded step `t` (poses and qpos only, no physics step)."""
+    from mani_skill.utils.structs.pose import Pose
+
+    for key, value in state.items():
+        if key.startswith(ACTOR_PREFIX):
+            scene.actors[key[len(ACTOR_PREFIX):]].set_pose(Pose.create(value[t]))
+        elif key.startswith(ROOT_POSE_PREFIX):
+            scene.articulations[key[len(ROOT_POSE_PREFIX):]].set_root_pose(Pose.create(value[t]))
+        elif key.startswith(QPOS_PREFIX):
+            scene.articulations[key[len(QPOS_PREFIX):]].set_qpos(value[t])
+
+
+def load_scene_fn(spec: str):
+    module, _, function = spec.partition(":")
+    return getattr(importlib.import_module(module), function)
+
+
+@dataclass
+class RenderJob:
+    states: str
+    scene_fn: str
+    out_dir: str
+    uids: List[str]
+    quality: Optional[str]
+    width: Optional[int]
+    height: Optional[int]
+    depth: bool
+    render_device: str
+    start: int
+    end: int
+
+
+def _render_chunk(job: RenderJob) -> int:
+    """Worker: build the scene once, render frames [start, end) for every camera."""
+    from mani_skill.envs.utils.system.backend import BackendInfo
+    from camera_registry import add_registered_camera
+    from depth_codec import DepthCodec
+    from render_quality import read_texture
+
+    backend = BackendInfo(device="cpu", sim_device="cpu", sim_backend="physx",
+                          render_backend="auto", render_device=job.render_device)
+    scene, robot = load_scene_fn(job.scene_fn)(backend)
+    cameras = {uid: add_registered_camera(scene, robot, uid, job.quality, job.width, job.height) for uid in job.uids}
+
+    with np.load(job.states) as f:
+        state = {key: f[key][job.start:job.end] for key in f.files}
+    rgb = {uid: [] for uid in job.uids}
+    depth = {uid: [] for uid in job.uids}
+    for t in range(job.end - job.start):
+        apply_state(scene, state, t)
+        scene.update_render()
+        for uid, camera in cameras.items():
+            camera.take_picture()
+            rgb[uid].append(_to_numpy(read_texture(camera, "rgb")))
+            if job.depth:
+                depth[uid].append(_to_numpy(read_texture(camera, "depth")))
+
+    for uid in job.uids:
+        np.save(os.path.join(job.out_dir, f"{uid}_rgb_{job.start:06d}.npy"), np.stack(rgb[uid]))
+        if job.depth:
+            codes = DepthCodec.for_camera(uid).encode(np.stack(depth[uid]))
+            np.save(os.path.join(job.out_dir, f"{uid}_depth_{job.start:06d}.npy"), codes)
+    return job.end - job.start
+
+
+def rerender(states: str, scene_fn: str, out_dir: str, uids: Optional[List[str]] = None,
+             quality: Optional[str] = None, width: Optional[int] = None, height: Optional[int] = None,
+             depth: bool = False, render_device: str = "cuda", num_workers: int = 4, chunk_size: int = 100) -> int:
+    """
+    Render every recorded step of `states` through the registered cameras.
+
+    Writes `<uid>_rgb_<start>.npy` (T_chunk, N, H, W, 3) uint8 (and `_depth_` uint16
+    depth_codec codes if `depth`) per chunk of `chunk_size` steps into `out_dir`. Returns the
+    number of rendered steps.
+    """
+    from camera_registry import AGIBOT_G1_CAMERAS
+
+    uids = list(AGIBOT_G1_CAMERAS.keys()) if uids is None else uids
+    os.makedirs(out_dir, exist_ok=True)
+    with np.load(states) as f:
+        num_steps = len(f[f.files[0]])
+    jobs = [RenderJob(states, scene_fn, out_dir, uids, quality, width, height, depth, render_device,
+                      start, min(start + chunk_size, num_steps))
+            for start in range(0, num_steps, chunk_size)]
+    with ProcessPoolExecutor(num_workers) as pool:
+        return sum(pool.map(_render_chunk, jobs))
+
+
+@dataclass
+class Args:
+    states: str
+    """npz written by StateRecorder.save"""
+    scene_fn: str
+    """"module:function" building (scene, robot) from a BackendInfo"""
+    out_dir: str = "rerender"
+    uids: Optional[List[str]] = None
+    """cameras from camera_registry.AGIBOT_G1_CAMERAS; default all"""
+    quality: Optional[str] = None
+    """render quality tier for all cameras; default per camera profile"""
+    width: Optional[int] = None
+    height: Optional[int] = None
+    depth: bool = False
+    render_device: str = "cuda"
+    num_workers: int = 4
+    chunk_size: int = 100
+
+
+def main(args: Args):
+    num_steps = rerender(args.states, args.scene_fn, args.out_dir, args.uids, args.quality, args.width,
+                         args.height, args.depth, args.render_device, args.num_workers, args.chunk_size)
+    print(f"Rendered {num_steps} steps into {args.out_dir}")
+
+
+if __name__ == "__main__":
+    import tyro
+
+    main(tyro.cli(Args))
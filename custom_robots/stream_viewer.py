@@ -0,0 +1,221 @@
+"""
+Low-bandwidth MJPEG live view for headless runs.
+
+`StreamViewer` serves the latest frame of each published camera stream over
+plain HTTP as multipart MJPEG, which any browser can display:
+
+    http://localhost:8080/                    index with all streams
+    http://localhost:8080/stream/head_camera  live MJPEG stream
+    http://localhost:8080/snapshot/head_camera.jpg
+
+`publish()` is cheap and never blocks the sim loop: it drops frames above the
+configured rate and otherwise only snapshots the frame (a device-side clone for
+tensors, since ManiSkill reuses render buffers across steps). Host copy,
+resizing and JPEG encoding happen on a worker thread, and only the newest
+frame per stream is ever encoded.
+
+Usage:
+    streamer = StreamViewer(port=8080, max_fps=10, width=320)
+    streamer.start()
+    for step in range(n):
+        scene.step()
+        scene.update_render()
+        head_camera.take_picture()
+        streamer.publish("head_camera", head_camera.get_picture("Color"))
+    streamer.stop()
+"""
+
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+import numpy as np
+from PIL import Image
+
+BOUNDARY = "frame"
+
+
+def to_uint8_rgb(image) -> np.ndarray:
+    """Convert a camera picture (list / tensor / array, float or uint8, RGB(A)) to an (H, W, 3) uint8 array."""
+    if isinstance(image, list):
+        image = image[0]
+    if hasattr(image, "cpu"):
+        image = image.cpu().numpy()
+    image = np.asarray(image)
+    if image.ndim == 4:
+        image = image[0]  # first env
+    image = image[..., :3]
+    if image.dtype != np.uint8:
+        image = (np.clip(image, 0, 1) * 255).astype(np.uint8)
+    return image
+
+
+def snapshot(image):
+    """Private copy of the first env's frame, so a reused render buffer can't change it mid-encode."""
+    if isinstance(image, list):
+        image = image[0]
+    if image.ndim == 4:
+        image = image[0]
+    if hasattr(image, "clone"):
+        return image.clone()  # stays on the render device; the worker does the host copy
+    return np.array(image, copy=True)
+
+
+class StreamViewer:
+    """Serve selected camera streams as MJPEG over HTTP, encoded off the sim thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, max_fps: float = 10.0,
+                 width: Optional[int] = 320, quality: int = 70):
+        """
+        Args:
+            host: interface to bind. Keep the default outside containers; inside
+                docker bind 0.0.0.0 and publish the port to the host's 127.0.0.1.
+            port: HTTP port.
+            max_fps: per-stream frame rate cap; faster publishes are dropped.
+            width: output width in pixels (height keeps the aspect ratio), None for full size.
+            quality: JPEG quality.
+        """
+        self.host = host
+        self.port = port
+        self.frame_interval = 1.0 / max_fps
+        self.width = width
+        self.quality = quality
+
+        self._pending: Dict[str, object] = {}
+        self._last_publish: Dict[str, float] = {}
+        self._jpegs: Dict[str, bytes] = {}
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._threads = []
+
+    @property
+    def streams(self):
+        with self._cond:
+            return sorted(set(self._jpegs) | set(self._pending))
+
+    def publish(self, name: str, image):
+        """Offer a new frame for stream `name`; returns False if it was dropped by the rate cap."""
+        now = time.perf_counter()
+        if now - self._last_publish.get(name, -np.inf) < self.frame_interval:
+            return False
+        self._last_publish[name] = now
+        image = snapshot(image)
+        with self._cond:
+            # an unencoded older frame is simply replaced
+            self._pending[name] = image
+            self._cond.notify_all()
+        return True
+
+    def _encode(self, image) -> bytes:
+        pil = Image.fromarray(to_uint8_rgb(image))
+        if self.width is not None and pil.width != self.width:
+            pil = pil.resize((self.width, max(1, round(pil.height * self.width / pil.width))), Image.BILINEAR)
+        buf = io.BytesIO()
+        pil.save(buf, format="JPEG", quality=self.quality)
+        return buf.getvalue()
+
+    def _encode_loop(self):
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._pending and not self._stop.is_set():
+                    self._cond.wait(timeout=0.5)
+                pending, self._pending = self._pending, {}
+            for name, image in pending.items():
+                jpeg = self._encode(image)
+                with self._cond:
+                    self._jpegs[name] = jpeg
+                    self._cond.notify_all()
+
+    def latest(self, name: str) -> Optional[bytes]:
+        with self._cond:
+            return self._jpegs.get(name)
+
+    def wait_for_frame(self, name: str, last: Optional[bytes], timeout: float = 1.0) -> Optional[bytes]:
+        """Block until stream `name` has a frame different from `last`."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._stop.is_set() or self._jpegs.get(name) is not last, timeout=timeout)
+            return self._jpegs.get(name)
+
+    def start(self):
+        viewer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/":
+                    links = "".join(
+                        f'<h3>{name}</h3><img src="/stream/{name}"><br>' for name in viewer.streams
+                    )
+                    body = f"<html><body>{links or 'no streams yet, refresh later'}</body></html>".encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                elif self.path.startswith("/snapshot/") and self.path.endswith(".jpg"):
+                    jpeg = viewer.latest(self.path[len("/snapshot/"):-len(".jpg")])
+                    if jpeg is None:
+                        self.send_error(404)
+                        return
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/jpeg")
+                    self.send_header("Content-Length", str(len(jpeg)))
+                    self.end_headers()
+                    self.wfile.write(jpeg)
+                elif self.path.startswith("/stream/"):
+                    name = self.path[len("/stream/"):]
+                    self.send_response(200)
+                    self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+                    self.end_headers()
+                    jpeg = None
+                    try:
+                        while not viewer._stop.is_set():
+                            new = viewer.wait_for_frame(name, jpeg)
+                            if new is None or new is jpeg:
+                                continue
+                            jpeg = new
+                            self.wfile.write(
+                                f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                f"Content-Length: {len(jpeg)}\r\n\r\n".encode()
+                            )
+                            self.wfile.write(jpeg)
+                            self.wfile.write(b"\r\n")
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass
+                else:
+                    self.send_error(404)
+
+        self._stop.clear()
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._threads = [
+            threading.Thread(target=self._encode_loop, daemon=True, name="stream_encoder"),
+            threading.Thread(target=self._server.serve_forever, daemon=True, name="stream_http"),
+        ]
+        for thread in self._threads:
+            thread.start()
+        print(f"Streaming cameras at http://{self.host}:{self.port}/")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
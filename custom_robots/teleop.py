@@ -0,0 +1,263 @@
+"""
+Low-latency IK teleoperation of both G1 arms.
+
+Every control tick the loop
+
+1. polls a 6-DOF input source for left/right hand pose commands,
+2. solves IK for the arm chain of each commanded hand (`left_joint1..7` /
+   `right_joint1..7`) with the articulation's Pinocchio model, warm-started
+   from the previous solution and capped at a few iterations so it always
+   finishes inside the tick,
+3. sends the result as PD joint position targets (env.step),
+
+and records the input-to-motion latency: from the moment a command was read
+to the moment the env step that applied it returned.
+
+Input sources (all return absolute target poses in the robot base frame):
+- `KeyboardInput`: SAPIEN viewer keys nudge the active hand (see KEYS, `m` switches hands)
+- `SpaceMouseInput`: 3Dconnexion device through the optional `pyspacemouse` package
+- `ReplayInput`: a JSON-lines file of targets, e.g. written by `--record`
+
+Usage:
+    python custom_robots/teleop.py --input keyboard
+    python custom_robots/teleop.py --input replay --replay-file demo_commands.jsonl
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import sapien
+
+from joint_freezing import LEFT_ARM_JOINTS, RIGHT_ARM_JOINTS
+from reachability import EE_PARENT_JOINT
+from domain_randomization import axis_angle_to_quat, quat_multiply
+
+ARM_JOINTS = {"left": LEFT_ARM_JOINTS, "right": RIGHT_ARM_JOINTS}
+HANDS = ("left", "right")
+
+# key -> (translation axis or None, rotation axis or None, sign)
+KEYS = {
+    "i": (0, None, 1), "k": (0, None, -1),
+    "j": (1, None, 1), "l": (1, None, -1),
+    "u": (2, None, 1), "o": (2, None, -1),
+    "r": (None, 0, 1), "f": (None, 0, -1),
+    "t": (None, 1, 1), "g": (None, 1, -1),
+    "y": (None, 2, 1), "h": (None, 2, -1),
+}
+
+
+def pose_to_list(pose: sapien.Pose) -> List[float]:
+    return [*map(float, pose.p), *map(float, pose.q)]
+
+
+class IncrementalInput:
+    """Turns per-tick (dp, drot) deltas of the active hand into absolute targets."""
+
+    def __init__(self, initial: Dict[str, sapien.Pose]):
+        self.targets = dict(initial)
+        self.hand = "left"
+
+    def apply(self, dp: np.ndarray, drot: np.ndarray) -> Dict[str, sapien.Pose]:
+        if not (dp.any() or drot.any()):
+            return {}
+        pose = self.targets[self.hand]
+        # rotation deltas are about base-frame axes
+        q = quat_multiply(axis_angle_to_quat(drot), pose.q)
+        self.targets[self.hand] = sapien.Pose(pose.p + dp, q / np.linalg.norm(q))
+        return {self.hand: self.targets[self.hand]}
+
+
+class KeyboardInput(IncrementalInput):
+    def __init__(self, viewer, initial: Dict[str, sapien.Pose], speed: float = 0.005, rot_speed: float = 0.02):
+        super().__init__(initial)
+        self.window = viewer.window
+        self.speed, self.rot_speed = speed, rot_speed
+
+    def poll(self) -> Dict[str, sapien.Pose]:
+        if self.window.key_press("m"):
+            self.hand = "right" if self.hand == "left" else "left"
+            print(f"Controlling {self.hand} hand")
+        dp, drot = np.zeros(3), np.zeros(3)
+        for key, (t_axis, r_axis, sign) in KEYS.items():
+            if self.window.key_down(key):
+                if t_axis is not None:
+                    dp[t_axis] += sign * self.speed
+                else:
+                    drot[r_axis] += sign * self.rot_speed
+        return self.apply(dp, drot)
+
+
+class SpaceMouseInput(IncrementalInput):
+    def __init__(self, initial: Dict[str, sapien.Pose], speed: float = 0.01, rot_speed: float = 0.04,
+                 deadzone: float = 0.05):
+        try:
+            import pyspacemouse
+        except ImportError as e:
+            raise ImportError("SpaceMouseInput needs `pip install pyspacemouse`") from e
+        super().__init__(initial)
+        if not pyspacemouse.open():
+            raise RuntimeError("No SpaceMouse found")
+        self.device = pyspacemouse
+        self.speed, self.rot_speed, self.deadzone = speed, rot_speed, deadzone
+        self.button_was_down = False
+
+    def poll(self) -> Dict[str, sapien.Pose]:
+        state = self.device.read()
+        button = bool(state.buttons and state.buttons[0])
+        if button and not self.button_was_down:
+            self.hand = "right" if self.hand == "left" else "left"
+            print(f"Controlling {self.hand} hand")
+        self.button_was_down = button
+        axes = np.array([state.x, state.y, state.z, state.roll, state.pitch, state.yaw])
+        axes[np.abs(axes) < self.deadzone] = 0
+        return self.apply(axes[:3] * self.speed, axes[3:] * self.rot_speed)
+
+
+class ReplayInput:
+    """One JSON object per tick: {"left": [x, y, z, qw, qx, qy, qz], "right": [...]} (hands optional)."""
+
+    def __init__(self, path: str):
+        with open(path) as f:
+            self.commands = [json.loads(line) for line in f if line.strip()]
+        self.tick = 0
+
+    def done(self) -> bool:
+        return self.tick >= len(self.commands)
+
+    def poll(self) -> Dict[str, sapien.Pose]:
+        if self.done():
+            return {}
+        command = self.commands[self.tick]
+        self.tick += 1
+        return {hand: sapien.Pose(p=v[:3], q=v[3:]) for hand, v in command.items()}
+
+
+class ArmIK:
+    """Warm-started, iteration-capped IK for one arm chain on the articulation's Pinocchio model."""
+
+    def __init__(self, robot, hand: str, max_iterations: int = 20, eps: float = 1e-3, damping: float = 1e-3):
+        self.model = robot.create_pinocchio_model()
+        ee_link = robot.active_joints_map[EE_PARENT_JOINT[hand]].parent_link
+        self.ee_index = robot.links.index(ee_link)
+        self.mask = np.zeros(robot.max_dof, dtype=np.int32)
+        for name in ARM_JOINTS[hand]:
+            self.mask[robot.active_joints_map[name].active_index[0].item()] = 1
+        self.max_iterations, self.eps, self.damping = max_iterations, eps, damping
+
+    def ee_pose(self, qpos: np.ndarray) -> sapien.Pose:
+        self.model.compute_forward_kinematics(qpos)
+        return self.model.get_link_pose(self.ee_index)
+
+    def solve(self, target: sapien.Pose, qpos: np.ndarray) -> np.ndarray:
+        """Joint targets moving the EE towards `target`; only the arm joints change."""
+        result, _, _ = self.model.compute_inverse_kinematics(
+            self.ee_index, target, initial_qpos=qpos, active_qmask=self.mask,
+            eps=self.eps, max_iterations=self.max_iterations, damp=self.damping,
+        )
+        # an unconverged solve is still the closest point after max_iterations; keep tracking
+        return np.where(self.mask.astype(bool), result, qpos)
+
+
+class LatencyStats:
+    def __init__(self):
+        self.samples: List[float] = []
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+
+    def report(self, control_period: float) -> str:
+        if not self.samples:
+            return "no commands received"
+        ms = np.array(self.samples) * 1000
+        within = (ms <= control_period * 1000).mean() * 100
+        return (f"input-to-motion latency over {len(ms)} commands: p50 {np.percentile(ms, 50):.2f} ms, "
+                f"p95 {np.percentile(ms, 95):.2f} ms, max {ms.max():.2f} ms "
+                f"(control tick {control_period * 1000:.1f} ms, {within:.1f}% within one tick)")
+
+
+@dataclass
+class Args:
+    input: str = "keyboard"
+    """keyboard, spacemouse or replay"""
+    replay_file: Optional[str] = None
+    record: Optional[str] = None
+    """write every tick's targets as JSON lines (replayable with --input replay)"""
+    env_id: str = "EmptyEnv-v1"
+    robot_uid: str = "agibot_g1_120s"
+    num_steps: Optional[int] = None
+    realtime: bool = True
+    """sleep to hold the control rate instead of running as fast as possible"""
+
+
+def main(args: Args):
+    import gymnasium as gym
+    import mani_skill.envs  # Required to register environments
+    import agibot_g1  # Register the AgibotG1 agents
+
+    use_viewer = args.input == "keyboard"
+    env = gym.make(args.env_id, robot_uids=args.robot_uid, obs_mode="none", control_mode="pd_joint_pos",
+                   render_mode="human" if use_viewer else None, sim_backend="cpu")
+    env.reset(seed=0)
+    unwrapped = env.unwrapped
+    robot = unwrapped.agent.robot
+    control_period = 1.0 / unwrapped.control_freq
+
+    solvers = {hand: ArmIK(robot, hand) for hand in HANDS}
+    qpos = robot.get_qpos()[0].cpu().numpy().astype(np.float64)
+    targets = {hand: solvers[hand].ee_pose(qpos) for hand in HANDS}
+    viewer = env.render() if use_viewer else None
+    if args.input == "keyboard":
+        source = KeyboardInput(viewer, targets)
+    elif args.input == "spacemouse":
+        source = SpaceMouseInput(targets)
+    elif args.input == "replay":
+        source = ReplayInput(args.replay_file)
+    else:
+        raise ValueError(f"Unknown input '{args.input}', choose keyboard, spacemouse or replay")
+
+    record = open(args.record, "w") if args.record else None
+    latency = LatencyStats()
+    ik_times = []
+    step = 0
+    while args.num_steps is None or step < args.num_steps:
+        tick_start = time.perf_counter()
+        commands = source.poll()
+        stamp = time.perf_counter()
+
+        ik_start = time.perf_counter()
+        for hand, target in commands.items():
+            qpos = solvers[hand].solve(target, qpos)
+            targets[hand] = target
+        if commands:
+            ik_times.append(time.perf_counter() - ik_start)
+        env.step(qpos.astype(np.float32))
+        if commands:
+            latency.add(time.perf_counter() - stamp)
+        if record is not None:
+            record.write(json.dumps({hand: pose_to_list(targets[hand]) for hand in HANDS}) + "\n")
+
+        if viewer is not None:
+            env.render()
+            if viewer.closed:
+                break
+        if isinstance(source, ReplayInput) and source.done():
+            break
+        step += 1
+        if args.realtime:
+            time.sleep(max(0.0, control_period - (time.perf_counter() - tick_start)))
+
+    if record is not None:
+        record.close()
+    env.close()
+    if ik_times:
+        print(f"IK: mean {np.mean(ik_times) * 1000:.2f} ms per tick")
+    print(latency.report(control_period))
+
+
+if __name__ == "__main__":
+    import tyro
+
+    main(tyro.cli(Args))
@@ -0,0 +1,51 @@
+import itertools
+
+import numpy as np
+
+from collision_filter import CollisionFilter, clique_cover, filter_from_counts, filtered_pairs
+
+NUM_SAMPLES = 10
+
+
+def toy_counts():
+    # links 0-2 always touch each other, 3 never touches anything, 1-4 touch sometimes
+    counts = np.zeros((5, 5), dtype=np.int64)
+    for i, j in itertools.combinations(range(3), 2):
+        counts[i, j] = counts[j, i] = NUM_SAMPLES
+    counts[1, 4] = counts[4, 1] = 3
+    return counts
+
+
+def test_filtered_pairs_never_or_always():
+    pairs = filtered_pairs(toy_counts(), NUM_SAMPLES)
+    assert (1, 4) not in pairs
+    assert len(pairs) == 9
+
+
+def test_clique_cover_covers_only_filtered_pairs():
+    pairs = filtered_pairs(toy_counts(), NUM_SAMPLES)
+    cliques = clique_cover(5, pairs, max_bits=24)
+    covered = {pair for clique in cliques for pair in itertools.combinations(clique, 2)}
+    assert covered == set(pairs)
+
+
+def test_clique_cover_respects_max_bits():
+    pairs = list(itertools.combinations(range(6), 2))
+    # a complete graph is one clique; with a single bit every pair is still covered
+    assert len(clique_cover(6, pairs, max_bits=1)) == 1
+    # two disjoint edges need two cliques, one bit leaves one uncovered
+    assert len(clique_cover(4, [(0, 1), (2, 3)], max_bits=1)) == 1
+
+
+def test_filter_bits_and_save_load_round_trip(tmp_path):
+    names = [f"link{i}" for i in range(5)]
+    collision_filter = filter_from_counts(names, toy_counts(), NUM_SAMPLES, max_bits=24, urdf_sha1="toy")
+    bits = collision_filter.link_bits
+    for i, j in itertools.combinations(range(5), 2):
+        filtered = bool(bits.get(names[i], 0) & bits.get(names[j], 0))
+        assert filtered == ((i, j) != (1, 4)), f"pair {names[i]}-{names[j]}"
+    assert collision_filter.num_filtered_pairs == collision_filter.num_covered_pairs == 9
+
+    path = tmp_path / "toy.collision_filter.json"
+    collision_filter.save(str(path))
+    assert CollisionFilter.load(str(path)) == collision_filter
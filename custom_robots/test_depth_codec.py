@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+
+from depth_codec import DepthCodec, compress_chunk, decompress_chunk
+
+
+def test_encode_decode_within_one_step():
+    codec = DepthCodec(near=0.1, far=10.0)
+    depth = np.random.default_rng(0).uniform(codec.near, codec.far, size=(4, 32, 48)).astype(np.float32)
+    decoded = codec.decode(codec.encode(depth))
+    assert np.abs(decoded - depth).max() <= codec.scale / 2 + 1e-5
+
+
+def test_out_of_range_is_no_return():
+    codec = DepthCodec(near=0.1, far=10.0)
+    codes = codec.encode(np.array([0.05, 0.1, 10.0, 10.5, np.nan, np.inf], dtype=np.float32))
+    assert codes.tolist()[0] == 0 and codes.tolist()[3:] == [0, 0, 0]
+    assert codes[1] == 1 and codes[2] <= np.iinfo(np.uint16).max
+    assert codec.decode(codes, invalid=-1.0)[0] == -1.0
+
+
+def test_scale_coarsens_to_fit_range():
+    codec = DepthCodec(near=1.0, far=200.0)
+    assert codec.scale > 0.001
+    assert codec.encode(np.array([200.0], dtype=np.float32))[0] == np.iinfo(np.uint16).max
+
+
+@pytest.mark.parametrize("method", ["zlib", "lzma"])
+def test_compress_round_trip(method):
+    codes = np.random.default_rng(1).integers(0, 2 ** 16, size=(3, 16, 20), dtype=np.uint16)
+    assert np.array_equal(decompress_chunk(compress_chunk(codes, method)), codes)
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        compress_chunk(np.zeros((2, 2), dtype=np.uint16), method="gzip")
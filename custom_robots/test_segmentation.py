@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+
+from segmentation import bitpack_decode, bitpack_encode, bits_for, rle_decode, rle_encode
+
+
+def id_map(shape=(2, 24, 32), max_id=300, seed=0):
+    # blocky like a real segmentation, so runs are longer than one pixel
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, max_id + 1, size=(shape[0], shape[1] // 4, shape[2] // 4), dtype=np.uint16)
+    return np.repeat(np.repeat(coarse, 4, axis=1), 4, axis=2)
+
+
+def test_rle_round_trip():
+    ids = id_map()
+    values, lengths, shape = rle_encode(ids)
+    assert lengths.sum() == ids.size and len(values) < ids.size
+    np.testing.assert_array_equal(rle_decode(values, lengths, shape), ids)
+
+
+def test_rle_empty():
+    ids = np.zeros((0, 4), dtype=np.uint16)
+    np.testing.assert_array_equal(rle_decode(*rle_encode(ids)), ids)
+
+
+@pytest.mark.parametrize("max_id", [1, 255, 300, np.iinfo(np.uint16).max])
+def test_bitpack_round_trip(max_id):
+    ids = id_map(max_id=max_id)
+    packed = bitpack_encode(ids, max_id)
+    assert packed.nbytes == -(-ids.size * bits_for(max_id) // 8)
+    np.testing.assert_array_equal(bitpack_decode(packed, max_id, ids.shape), ids)
+
+
+def test_bitpack_rejects_ids_above_max_id():
+    with pytest.raises(ValueError):
+        bitpack_encode(np.array([[3, 9]], dtype=np.uint16), max_id=7)
@@ -0,0 +1,51 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from sensor_noise import SensorNoiseConfig, SensorNoiseModel
+
+
+def make_model(seeds):
+    return SensorNoiseModel(SensorNoiseConfig(), focal_length=640.0, far=6.0, num_envs=len(seeds), seeds=seeds)
+
+
+def frames(num_envs):
+    depth = torch.full((num_envs, 16, 20), 2.0)
+    depth[:, :, 10:] = 1.0  # an edge for the discontinuity dropout
+    depth[:, 0, 0] = 0.0
+    rgb = torch.rand((1, 16, 20, 3), generator=torch.Generator().manual_seed(0)).expand(num_envs, -1, -1, -1)
+    return depth, (rgb * 255).round().to(torch.uint8)
+
+
+def test_same_seeds_same_noise():
+    depth, rgb = frames(2)
+    a, b = make_model([7, 3]), make_model([7, 3])
+    assert torch.equal(a.apply_depth(depth), b.apply_depth(depth))
+    assert torch.equal(a.apply_rgb(rgb), b.apply_rgb(rgb))
+
+
+def test_env_noise_independent_of_batch():
+    depth, rgb = frames(2)
+    pair, single = make_model([7, 3]), make_model([3])
+    assert torch.equal(pair.apply_depth(depth)[1], single.apply_depth(depth[1:])[0])
+    assert torch.equal(pair.apply_rgb(rgb)[1], single.apply_rgb(rgb[1:])[0])
+
+
+def test_seeds_and_frames_change_noise():
+    depth, _ = frames(2)
+    model = make_model([7, 3])
+    first = model.apply_depth(depth)
+    assert not torch.equal(first[0], first[1])
+    model.step()
+    assert not torch.equal(model.apply_depth(depth), first)
+    # reseeding restarts the env's sequence
+    model.reset(torch.tensor([0, 1]), [7, 3])
+    assert torch.equal(model.apply_depth(depth), first)
+
+
+def test_no_return_stays_dropped():
+    depth, rgb = frames(1)
+    model = make_model([0])
+    assert model.apply_depth(depth)[0, 0, 0] == 0
+    noisy = model.apply_rgb(rgb)
+    assert noisy.dtype == torch.uint8 and noisy.shape == rgb.shape
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from trajectory_dataset import TrajectoryDataset, TrajectoryWriter
+
+FIELDS = {"qpos": ((3,), "float32"), "rgb": ((2, 2, 3), "uint8")}
+
+
+def make_episode(length, seed):
+    rng = np.random.default_rng(seed)
+    return {
+        "qpos": rng.standard_normal((length, 3)).astype(np.float32),
+        "rgb": rng.integers(0, 256, size=(length, 2, 2, 3), dtype=np.uint8),
+    }
+
+
+@pytest.fixture
+def episodes():
+    return [make_episode(length, seed) for seed, length in enumerate([5, 3, 7])]
+
+
+@pytest.fixture
+def root(tmp_path, episodes):
+    with TrajectoryWriter(str(tmp_path), FIELDS) as writer:
+        for episode in episodes:
+            writer.add_episode(**episode)
+    return str(tmp_path)
+
+
+def test_round_trip(root, episodes):
+    dataset = TrajectoryDataset(root)
+    assert len(dataset) == 15 and dataset.num_episodes == 3
+    for e, episode in enumerate(episodes):
+        for name, array in dataset.episode(e).items():
+            np.testing.assert_array_equal(array, episode[name])
+    assert dataset.locate(6) == (1, 1)
+    assert dataset.global_index(1, 1) == 6
+    np.testing.assert_array_equal(dataset[6]["qpos"], episodes[1]["qpos"][1])
+
+
+def test_window_clips_to_episode(root, episodes):
+    dataset = TrajectoryDataset(root)
+    window = dataset.window(6, horizon=4)["qpos"]
+    expected = episodes[1]["qpos"][[1, 2, 2, 2]]
+    np.testing.assert_array_equal(window, expected)
+    np.testing.assert_array_equal(dataset.window(0, horizon=5)["qpos"], episodes[0]["qpos"])
+
+
+def test_index_validation(root, episodes):
+    dataset = TrajectoryDataset(root)
+    assert dataset.locate(-1) == (2, 6)
+    np.testing.assert_array_equal(dataset.window(-1, horizon=2)["qpos"], episodes[2]["qpos"][[6, 6]])
+    with pytest.raises(IndexError):
+        dataset.locate(15)
+    with pytest.raises(IndexError):
+        dataset.window(-16, horizon=1)
+    with pytest.raises(ValueError):
+        dataset.window(0, horizon=0)
+
+
+def test_append_and_rollback(root, episodes):
+    with TrajectoryWriter(root) as writer:
+        writer.add_episode(**make_episode(4, seed=10))
+        assert len(writer.episodes) == 4
+        writer.rollback(2)
+    dataset = TrajectoryDataset(root)
+    assert dataset.num_episodes == 2 and len(dataset) == 8
+    for e in range(2):
+        np.testing.assert_array_equal(dataset.episode(e)["rgb"], episodes[e]["rgb"])
+
+    # bytes of an unfinished episode are dropped by the next writer
+    with open(f"{root}/qpos.bin", "ab") as f:
+        f.write(b"\0" * 24)
+    with TrajectoryWriter(root) as writer:
+        writer.add_episode(**episodes[2])
+    dataset = TrajectoryDataset(root)
+    np.testing.assert_array_equal(dataset.episode(2)["qpos"], episodes[2]["qpos"])
+
+
+def test_mismatched_fields_raise(root):
+    with pytest.raises(ValueError):
+        TrajectoryWriter(root, {"qpos": ((4,), "float32")})
@@ -0,0 +1,128 @@
+"""
+Interactive viewer decoupled from the simulation rate.
+
+Calling `viewer.render()` inside the sim loop ties physics to the window's
+frame rate. `ThreadedViewer` runs the simulation on a worker thread that steps
+as fast as it can, while the calling (main) thread keeps the window alive and
+renders at most `max_fps` frames per second. The window and its event loop
+stay on the main thread, which is what GLFW requires.
+
+Render poses are only synced when the viewer asks for a new frame, so the sim
+thread does not pay for `update_render()` on every step either. Syncing and
+rendering are serialized by a lock, and so is stepping: the viewer UI can
+change sim state (dragging actors, setting joints), so `step_fn` never runs
+while `viewer.render()` does. SAPIEN's `viewer.render()` loops internally
+while paused and keeps holding the lock, so pressing pause blocks the sim
+thread until it is resumed; the sim thread also checks `viewer.paused` under
+the lock before every step.
+
+Usage:
+    viewer = scene.px.create_viewer()  # or env.render() for a gym env
+    def sim_step(step):
+        move_specific_joints(robot, joints, delta=0.01)
+        scene.step()
+    ThreadedViewer(scene, viewer, max_fps=30).run(sim_step, num_steps=10000)
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class ThreadedViewer:
+    """Step the simulation on a worker thread and render the viewer at a capped rate."""
+
+    def __init__(self, scene, viewer, max_fps: float = 30.0):
+        """
+        Args:
+            scene: the ManiSkillScene (or anything with update_render()) being viewed.
+            viewer: an open SAPIEN viewer.
+            max_fps: upper bound on window frames per second.
+        """
+        self.scene = scene
+        self.viewer = viewer
+        self.frame_time = 1.0 / max_fps
+        self._lock = threading.Lock()
+        self._frame_requested = threading.Event()
+        self._frame_ready = threading.Event()
+        self._frame_rendered = threading.Event()
+        self._stop = threading.Event()
+        self.sim_steps = 0
+        self.frames = 0
+        self.error: Optional[BaseException] = None
+
+    @property
+    def paused(self) -> bool:
+        return bool(getattr(self.viewer, "paused", False))
+
+    def _sim_loop(self, step_fn: Callable[[int], object], num_steps: Optional[int]):
+        try:
+            while not self._stop.is_set() and (num_steps is None or self.sim_steps < num_steps):
+                with self._lock:
+                    # the viewer is not rendering while we hold the lock, so its state is stable
+                    if self.paused:
+                        stepped = False
+                    else:
+                        step_fn(self.sim_steps)
+                        self.sim_steps += 1
+                        stepped = True
+                        served = self._frame_requested.is_set()
+                        if served:
+                            self.scene.update_render()
+                            self._frame_requested.clear()
+                            self._frame_rendered.clear()
+                            self._frame_ready.set()
+                if not stepped:
+                    time.sleep(self.frame_time)
+                elif served:
+                    # hand the lock to the render thread; Lock is not fair and would otherwise starve it
+                    self._frame_rendered.wait(timeout=self.frame_time)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self._stop.set()
+
+    def run(self, step_fn: Callable[[int], object], num_steps: Optional[int] = None, keep_open: bool = False):
+        """
+        Run `step_fn(step)` on the sim thread until `num_steps` steps are done or
+        the window is closed. With keep_open=True the window stays interactive
+        after the simulation finished, until the user closes it.
+        """
+        sim_thread = threading.Thread(target=self._sim_loop, args=(step_fn, num_steps), daemon=True)
+        sim_thread.start()
+        start = time.perf_counter()
+
+        while not self.viewer.closed:
+            frame_start = time.perf_counter()
+            if self._stop.is_set() or self.paused:
+                # the sim thread is not serving frame requests; sync here so
+                # camera moves in the window still redraw
+                with self._lock:
+                    self.scene.update_render()
+            else:
+                self._frame_requested.set()
+                # don't hang the window on a slow step: render whatever was synced last
+                self._frame_ready.wait(timeout=self.frame_time)
+                self._frame_ready.clear()
+            with self._lock:
+                # returns only once the viewer is unpaused, holding off the sim thread meanwhile
+                self.viewer.render()
+            self._frame_rendered.set()
+            self.frames += 1
+            if self._stop.is_set() and not keep_open:
+                break
+            remaining = self.frame_time - (time.perf_counter() - frame_start)
+            if remaining > 0:
+                time.sleep(remaining)
+
+        self._stop.set()
+        sim_thread.join()
+        elapsed = time.perf_counter() - start
+        if self.error is not None:
+            raise self.error
+        return {
+            "sim_steps": self.sim_steps,
+            "frames": self.frames,
+            "sim_steps_per_second": self.sim_steps / elapsed if elapsed > 0 else 0.0,
+            "fps": self.frames / elapsed if elapsed > 0 else 0.0,
+        }
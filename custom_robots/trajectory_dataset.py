@@ -0,0 +1,212 @@
+"""
+Memory-mapped trajectory dataset for AgibotG1 rollouts.
+
+Every field (qpos, actions, per-camera uint8 RGB, uint16 depth, ...) has a
+fixed per-step shape and dtype, so it is stored as one flat binary file of
+steps back to back. Episodes are appended; an index of (start, length) per
+episode is rewritten atomically after each episode, so a crashed writer
+leaves a readable dataset of the completed episodes.
+
+    root/
+        meta.json          field -> per-step shape and dtype
+        episodes.npy       (E, 2) int64 start step / length
+        <field>.bin        raw (num_steps, *shape) array
+
+`TrajectoryDataset` maps the files read-only with np.memmap: a step or a
+window is a view into the page cache, found in O(1) from the index, with no
+image decoding and no per-file opens. The maps are opened lazily per
+process, so the dataset can be handed to a multi-worker torch DataLoader.
+
+Usage:
+    with TrajectoryWriter("/workspace/g1_data", {"qpos": ((36,), "float32"),
+                                                "head_camera.rgb": ((720, 1280, 3), "uint8")}) as writer:
+        writer.add_episode(qpos=qpos, **{"head_camera.rgb": rgb})   # leading dim T
+    dataset = TrajectoryDataset("/workspace/g1_data")
+    step = dataset[12345]                        # dict of views
+    window = dataset.window(12345, horizon=16)   # for action-chunk policies
+"""
+
+import json
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+META_FILE = "meta.json"
+INDEX_FILE = "episodes.npy"
+
+
+def _field_path(root: str, name: str) -> str:
+    return os.path.join(root, name.replace("/", ".") + ".bin")
+
+
+def _atomic_save(path: str, array: np.ndarray):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class TrajectoryWriter:
+    """Appends episodes to a dataset directory (creating it, or continuing an existing one)."""
+
+    def __init__(self, root: str, fields: Optional[Dict[str, Tuple[Sequence[int], str]]] = None):
+        """
+        Args:
+            root: dataset directory.
+            fields: field name -> (per-step shape, dtype). Required for a new
+                dataset; must match meta.json when appending to an existing one.
+        """
+        self.root = root
+        meta_path = os.path.join(root, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            self.fields = {k: (tuple(v["shape"]), np.dtype(v["dtype"])) for k, v in meta.items()}
+            if fields is not None and {k: (tuple(s), np.dtype(d)) for k, (s, d) in fields.items()} != self.fields:
+                raise ValueError(f"Fields do not match the existing dataset in {root}")
+            self.episodes = np.load(os.path.join(root, INDEX_FILE)).tolist()
+        else:
+            if fields is None:
+                raise ValueError(f"No dataset in {root}, fields are required to create one")
+            os.makedirs(root, exist_ok=True)
+            self.fields = {k: (tuple(s), np.dtype(d)) for k, (s, d) in fields.items()}
+            with open(meta_path, "w") as f:
+                json.dump({k: {"shape": list(s), "dtype": d.str} for k, (s, d) in self.fields.items()}, f, indent=2)
+            self.episodes = []
+            _atomic_save(os.path.join(root, INDEX_FILE), np.zeros((0, 2), dtype=np.int64))
+        self.num_steps = sum(length for _, length in self.episodes)
+
+        self.files = {}
+        for name, (shape, dtype) in self.fields.items():
+            f = open(_field_path(root, name), "ab")
+            # drop the bytes of an episode that was being written when a previous writer died
+            f.truncate(self.num_steps * int(np.prod(shape)) * dtype.itemsize)
+            self.files[name] = f
+
+    def add_episode(self, **arrays: np.ndarray) -> int:
+        """Append one episode; every field is required, all with the same length T. Returns its index."""
+        missing = set(self.fields) - set(arrays)
+        if missing:
+            raise ValueError(f"Missing fields {sorted(missing)}")
+        length = None
+        for name, (shape, dtype) in self.fields.items():
+            array = np.asarray(arrays[name])
+            if array.shape[1:] != shape:
+                raise ValueError(f"Field {name} has step shape {array.shape[1:]}, expected {shape}")
+            if length is not None and len(array) != length:
+                raise ValueError(f"Field {name} has {len(array)} steps, expected {length}")
+            length = len(array)
+            self.files[name].write(np.ascontiguousarray(array, dtype=dtype).tobytes())
+        for f in self.files.values():
+            f.flush()
+            os.fsync(f.fileno())
+        # the index is only extended once the data is on disk
+        self.episodes.append((self.num_steps, length))
+        self.num_steps += length
+        _atomic_save(os.path.join(self.root, INDEX_FILE), np.array(self.episodes, dtype=np.int64).reshape(-1, 2))
+        return len(self.episodes) - 1
+
+    def rollback(self, num_episodes: int):
+        """Drop every episode after the first `num_episodes` (e.g. ones written after the last checkpoint)."""
+        if num_episodes >= len(self.episodes):
+            return
+        self.episodes = self.episodes[:num_episodes]
+        self.num_steps = sum(length for _, length in self.episodes)
+        _atomic_save(os.path.join(self.root, INDEX_FILE), np.array(self.episodes, dtype=np.int64).reshape(-1, 2))
+        for name, (shape, dtype) in self.fields.items():
+            self.files[name].truncate(self.num_steps * int(np.prod(shape)) * dtype.itemsize)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrajectoryDataset:
+    """Read-only, random-access view of a dataset written by TrajectoryWriter."""
+
+    def __init__(self, root: str, fields: Optional[Sequence[str]] = None):
+        """
+        Args:
+            root: dataset directory.
+            fields: fields to return; defaults to all.
+        """
+        self.root = root
+        with open(os.path.join(root, META_FILE)) as f:
+            meta = json.load(f)
+        names = list(meta.keys()) if fields is None else list(fields)
+        self.fields = {k: (tuple(meta[k]["shape"]), np.dtype(meta[k]["dtype"])) for k in names}
+        self.episodes = np.load(os.path.join(root, INDEX_FILE))
+        self.num_steps = int(self.episodes[:, 1].sum()) if len(self.episodes) else 0
+        # step -> episode lookup table, 4 bytes per step
+        self.step_episode = np.repeat(np.arange(len(self.episodes), dtype=np.int32), self.episodes[:, 1])
+        self._arrays: Optional[Dict[str, np.memmap]] = None
+
+    @property
+    def arrays(self) -> Dict[str, np.memmap]:
+        # opened on first use so every DataLoader worker maps the files itself
+        if self._arrays is None:
+            self._arrays = {
+                # np.memmap cannot map zero bytes
+                name: np.memmap(_field_path(self.root, name), dtype=dtype, mode="r", shape=(self.num_steps, *shape))
+                if self.num_steps > 0 else np.empty((0, *shape), dtype=dtype)
+                for name, (shape, dtype) in self.fields.items()
+            }
+        return self._arrays
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_arrays"] = None
+        return state
+
+    def __len__(self) -> int:
+        return self.num_steps
+
+    @property
+    def num_episodes(self) -> int:
+        return len(self.episodes)
+
+    def _step_index(self, index: int) -> int:
+        # negative indices count from the end, as for __getitem__
+        if not -self.num_steps <= index < self.num_steps:
+            raise IndexError(f"Step {index} out of range for {self.num_steps} steps")
+        return index % self.num_steps
+
+    def locate(self, index: int) -> Tuple[int, int]:
+        """Global step index -> (episode, step within episode)."""
+        index = self._step_index(index)
+        episode = int(self.step_episode[index])
+        return episode, index - int(self.episodes[episode, 0])
+
+    def global_index(self, episode: int, step: int) -> int:
+        return int(self.episodes[episode, 0]) + step
+
+    def __getitem__(self, index: int) -> Dict[str, np.ndarray]:
+        return {name: array[index] for name, array in self.arrays.items()}
+
+    def window(self, index: int, horizon: int) -> Dict[str, np.ndarray]:
+        """
+        `horizon` consecutive steps starting at `index`, clipped to the end of its
+        episode (the last step is repeated), e.g. an action chunk for a step.
+        """
+        if horizon <= 0:
+            raise ValueError(f"horizon must be positive, got {horizon}")
+        index = self._step_index(index)
+        episode = int(self.step_episode[index])
+        last = int(self.episodes[episode].sum()) - 1
+        steps = np.minimum(np.arange(index, index + horizon), last)
+        if steps[-1] == index + horizon - 1:
+            return {name: array[index:index + horizon] for name, array in self.arrays.items()}
+        return {name: array[steps] for name, array in self.arrays.items()}
+
+    def episode(self, episode: int) -> Dict[str, np.ndarray]:
+        start, length = self.episodes[episode]
+        return {name: array[start:start + length] for name, array in self.arrays.items()}
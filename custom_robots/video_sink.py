@@ -0,0 +1,202 @@
+"""
+Background video encoding of camera streams during rollouts.
+
+Encoding (or even PNG-saving) every frame in the simulation loop is what
+forces scripts to keep only every 50th frame. `VideoSink` runs one encoder
+process per camera (imageio + ffmpeg with a local software codec, libx264 by
+default). The loop only hands frames to that camera's bounded queue: GPU
+frames are converted to uint8 on the device (an asynchronous kernel), and the
+device-to-host copy and pickling happen on a feeder thread. When an encoder
+falls behind, the backpressure policy decides:
+
+    "block"  the loop waits for a free slot (no frame is lost)
+    "drop"   the frame is dropped and counted (the loop never waits)
+
+If an encoder process dies, the next `put` (or episode call) raises
+RuntimeError instead of waiting forever.
+
+Every episode goes to its own file, `<out_dir>/<camera>/episode_<n>.mp4`.
+
+Usage:
+    with VideoSink("/workspace/videos", ["head_camera"], fps=20, policy="drop") as sink:
+        sink.start_episode(0)
+        for step in range(T):
+            ...
+            sink.put("head_camera", rgb)   # (H, W, 3) uint8 or float in [0, 1]
+        sink.end_episode()
+    print(sink.stats())
+"""
+
+import multiprocessing as mp
+import os
+import queue
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+POLICIES = ("block", "drop")
+POLL_INTERVAL = 0.5
+"""seconds between encoder liveness checks while waiting on a full queue"""
+
+
+def _encoder_loop(frames: mp.Queue, out_dir: str, fps: int, codec: str, quality: int):
+    import imageio
+
+    os.makedirs(out_dir, exist_ok=True)
+    writer = None
+    while True:
+        kind, payload = frames.get()
+        if kind == "frame":
+            if writer is not None:
+                writer.append_data(payload)
+        elif kind == "start":
+            if writer is not None:
+                writer.close()
+            path = os.path.join(out_dir, f"episode_{payload:06d}.mp4")
+            writer = imageio.get_writer(path, fps=fps, codec=codec, quality=quality, macro_block_size=1)
+        elif kind in ("end", "stop"):
+            if writer is not None:
+                writer.close()
+                writer = None
+            if kind == "stop":
+                return
+
+
+def to_uint8_frame(frame) -> np.ndarray:
+    """(H, W, 3|4) numpy or torch image, float in [0, 1] or uint8 -> contiguous (H, W, 3) uint8."""
+    if hasattr(frame, "cpu"):
+        frame = frame.cpu().numpy()
+    frame = np.asarray(frame)[..., :3]
+    if frame.dtype != np.uint8:
+        frame = (np.clip(frame, 0, 1) * 255).astype(np.uint8)
+    return np.ascontiguousarray(frame)
+
+
+def _snapshot(frame):
+    """
+    (H, W, 3) uint8 copy of `frame` that stays valid after the next picture.
+    Torch frames stay on their device, so this does not wait for the GPU.
+    """
+    if hasattr(frame, "cpu"):
+        frame = frame[..., :3]
+        if frame.is_floating_point():
+            return (frame.clamp(0, 1) * 255).byte()
+        return frame.clone()
+    return np.array(np.asarray(frame)[..., :3])
+
+
+class VideoSink:
+    """Per-camera encoder processes fed through bounded queues."""
+
+    def __init__(self, out_dir: str, cameras: List[str], fps: int = 20, max_queue: int = 64,
+                 policy: str = "block", codec: str = "libx264", quality: int = 7):
+        """
+        Args:
+            out_dir: videos go to out_dir/<camera>/episode_<n>.mp4.
+            cameras: camera names, one encoder process each.
+            fps: playback frame rate of the videos.
+            max_queue: frames buffered per camera before the policy applies.
+            policy: "block" or "drop" when a camera's queue is full.
+            codec: ffmpeg codec name.
+            quality: imageio quality, 0 (worst) to 10 (best).
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy '{policy}', choose from {POLICIES}")
+        self.policy = policy
+        ctx = mp.get_context("spawn")
+        self.queues: Dict[str, mp.Queue] = {}
+        """encoder input, host uint8 frames"""
+        self.pending: Dict[str, queue.Queue] = {}
+        """frames the loop handed over that the feeder thread has not copied to the host yet"""
+        self.processes: Dict[str, mp.Process] = {}
+        self.feeders: Dict[str, threading.Thread] = {}
+        for name in cameras:
+            self.queues[name] = ctx.Queue(maxsize=max_queue)
+            self.pending[name] = queue.Queue(maxsize=max_queue)
+            self.processes[name] = ctx.Process(
+                target=_encoder_loop,
+                args=(self.queues[name], os.path.join(out_dir, name), fps, codec, quality),
+                daemon=True,
+            )
+            self.processes[name].start()
+            self.feeders[name] = threading.Thread(target=self._feed, args=(name,), daemon=True)
+            self.feeders[name].start()
+        self.submitted = {name: 0 for name in cameras}
+        self.dropped = {name: 0 for name in cameras}
+
+    def _check_alive(self, camera: str):
+        process = self.processes[camera]
+        if not process.is_alive():
+            raise RuntimeError(f"Video encoder of '{camera}' exited with code {process.exitcode}")
+
+    def _put(self, q, camera: str, item):
+        """Blocking put that raises instead of hanging when the encoder is gone."""
+        while True:
+            self._check_alive(camera)
+            try:
+                q.put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                pass
+
+    def _feed(self, camera: str):
+        # device-to-host copies and pickling happen here, not in the simulation loop
+        while True:
+            kind, payload = self.pending[camera].get()
+            if kind == "frame":
+                payload = to_uint8_frame(payload)
+            try:
+                self._put(self.queues[camera], camera, (kind, payload))
+            except RuntimeError:
+                # the loop sees the dead encoder on its next put
+                return
+            if kind == "stop":
+                return
+
+    def _control(self, kind: str, payload=None):
+        # control messages are never dropped
+        for name, q in self.pending.items():
+            self._put(q, name, (kind, payload))
+
+    def start_episode(self, episode: int):
+        """Frames from now on go to episode_<episode>.mp4 (closing the previous file)."""
+        self._control("start", episode)
+
+    def end_episode(self):
+        self._control("end")
+
+    def put(self, camera: str, frame) -> bool:
+        """Queue one frame of `camera`; returns False if it was dropped."""
+        self._check_alive(camera)
+        item = ("frame", _snapshot(frame))
+        self.submitted[camera] += 1
+        if self.policy == "block":
+            self._put(self.pending[camera], camera, item)
+            return True
+        try:
+            self.pending[camera].put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped[camera] += 1
+            return False
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: {"submitted": self.submitted[name], "dropped": self.dropped[name]} for name in self.queues}
+
+    def close(self):
+        """Finish the current files and wait for the encoders to flush."""
+        # a feeder whose encoder already died has returned or will never get the stop
+        stopped = [name for name in self.pending if self.processes[name].is_alive()]
+        for name in stopped:
+            self._put(self.pending[name], name, ("stop", None))
+        for name in stopped:
+            self.feeders[name].join()
+        for process in self.processes.values():
+            process.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,174 @@
+"""
+Renderer and asset warm-up to remove first-frame latency.
+
+The first take_picture() of a fresh process compiles shaders, builds Vulkan
+pipelines, uploads textures and loads meshes. This entry point builds the
+AgibotG1 scenes once with every registered camera under every render quality
+tier (i.e. every shader pack and lighting setup we use),
+renders all textures from them, and (optionally) resets a few ManiSkill envs,
+so that the on-disk driver shader/pipeline caches and the ManiSkill asset
+cache are populated. Run it once in an image and commit it (see
+docker/warmup.sh) and workers start warm.
+
+The cache locations come from the environment; `configure_cache_dirs` points
+them at one directory so they can be baked into the image.
+
+Usage:
+    python custom_robots/warmup.py
+    python custom_robots/warmup.py --cache-dir /opt/render_cache --env-ids PickCube-v1
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from render_quality import TIER_ORDER, apply_shader_pack, get_tier, setup_lighting, texture_names
+
+ROBOT_URDFS = [
+    "robot_descriptions/agibot_g1_with_gripper_description/agibot_g1_with_omnipicker.urdf",
+    "robot_descriptions/agibot_g1_with_gripper_description/agibot_g1_with_120s.urdf",
+]
+
+
+def configure_cache_dirs(cache_dir: str):
+    """
+    Point the driver shader caches and the ManiSkill asset dir at `cache_dir`.
+    Must run before sapien / mani_skill are imported; existing settings win.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    defaults = {
+        # NVIDIA driver Vulkan/GL pipeline cache
+        "__GL_SHADER_DISK_CACHE": "1",
+        "__GL_SHADER_DISK_CACHE_PATH": os.path.join(cache_dir, "nv"),
+        "__GL_SHADER_DISK_CACHE_SKIP_CLEANUP": "1",
+        "__GL_SHADER_DISK_CACHE_SIZE": str(4 * 1024 ** 3),
+        # Mesa (llvmpipe / lavapipe CPU rendering) shader cache
+        "MESA_SHADER_CACHE_DIR": os.path.join(cache_dir, "mesa"),
+        "MESA_SHADER_CACHE_MAX_SIZE": "4G",
+        # ManiSkill downloaded assets
+        "MS_ASSET_DIR": os.path.join(cache_dir, "maniskill"),
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+    for key in ("__GL_SHADER_DISK_CACHE_PATH", "MESA_SHADER_CACHE_DIR", "MS_ASSET_DIR"):
+        os.makedirs(os.environ[key], exist_ok=True)
+
+
+def _timed_capture(camera, textures: List[str]):
+    start = time.perf_counter()
+    camera.take_picture()
+    for texture in textures:
+        camera.get_picture(texture)
+    return time.perf_counter() - start
+
+
+def warm_scene(urdf_path: str, quality: str, render_device: str):
+    """Build one robot scene with all registered cameras at `quality` and render each of its textures twice."""
+    from mani_skill.envs.scene import ManiSkillScene
+    from mani_skill.envs.utils.system.backend import BackendInfo
+    from mani_skill.utils.structs.types import SimConfig
+    from camera_registry import AGIBOT_G1_CAMERAS
+
+    backend = BackendInfo(
+        device="cpu",
+        sim_device="cpu",
+        sim_backend="physx",
+        render_backend="auto",
+        render_device=render_device,
+    )
+    scene = ManiSkillScene(sim_config=SimConfig(sim_freq=100, control_freq=20), backend=backend)
+    tier = setup_lighting(scene, quality)
+
+    loader = scene.create_urdf_loader()
+    loader.fix_root_link = True
+    robot = loader.load(urdf_path)
+
+    # cameras pick up the shader pack that is active when they are created
+    apply_shader_pack(tier)
+    cameras = []
+    for uid, calib in AGIBOT_G1_CAMERAS.items():
+        if calib.mount_link not in robot.links_map:
+            continue
+        cameras.append(scene.add_camera(
+            name=f"{uid}_{tier.name}",
+            mount=robot.links_map[calib.mount_link],
+            pose=calib.mount_pose,
+            width=calib.width,
+            height=calib.height,
+            intrinsic=calib.intrinsic,
+            near=calib.near,
+            far=calib.far,
+        ))
+
+    scene.step()
+    scene.update_render()
+    # only the textures this pack renders ("minimal" has no Position / Segmentation)
+    textures = texture_names(tier.shader_pack)
+    timings = {}
+    for camera in cameras:
+        cold = _timed_capture(camera, textures)
+        warm = _timed_capture(camera, textures)
+        timings[camera.name] = (cold, warm)
+    return timings
+
+
+def warm_env(env_id: str, robot_uid: Optional[str], obs_mode: str):
+    """Reset and step a ManiSkill env once so its assets are downloaded and loaded."""
+    import gymnasium as gym
+    import mani_skill.envs  # noqa: F401
+    import agibot_g1  # noqa: F401
+
+    kwargs = dict(obs_mode=obs_mode, render_mode="rgb_array", num_envs=1, sim_backend="cpu")
+    if robot_uid is not None:
+        kwargs["robot_uids"] = robot_uid
+    start = time.perf_counter()
+    env = gym.make(env_id, **kwargs)
+    env.reset(seed=0)
+    env.step(env.action_space.sample())
+    env.render()
+    env.close()
+    return time.perf_counter() - start
+
+
+@dataclass
+class Args:
+    cache_dir: str = "/opt/render_cache"
+    """directory the shader and asset caches are written to"""
+    render_device: str = "cuda"
+    """render device for the warm-up scenes, e.g. "cuda" or "cpu" """
+    qualities: List[str] = field(default_factory=lambda: list(TIER_ORDER))
+    """render quality tiers to warm; the ray-traced tier is skipped if the GPU can't render it"""
+    urdfs: List[str] = field(default_factory=lambda: list(ROBOT_URDFS))
+    env_ids: List[str] = field(default_factory=lambda: ["PickCube-v1"])
+    """ManiSkill envs to reset once (downloads and loads their assets)"""
+    robot_uid: Optional[str] = "agibot_g1_omni_picker"
+    obs_mode: str = "rgbd"
+
+
+def main(args: Args):
+    configure_cache_dirs(args.cache_dir)
+    for urdf in args.urdfs:
+        for quality in args.qualities:
+            print(f"Warming {os.path.basename(urdf)} at quality '{quality}' "
+                  f"(shader pack '{get_tier(quality).shader_pack}')...")
+            try:
+                timings = warm_scene(urdf, quality, args.render_device)
+            except RuntimeError as e:
+                # only ray tracing may be unsupported; anything else is a real failure
+                if get_tier(quality).shader_pack != "rt":
+                    raise
+                print(f"  skipped: {e}")
+                continue
+            for name, (cold, warm) in timings.items():
+                print(f"  {name}: first capture {cold * 1000:.1f} ms, second {warm * 1000:.1f} ms")
+    for env_id in args.env_ids:
+        print(f"Warming env {env_id}...")
+        print(f"  make + reset + step + render took {warm_env(env_id, args.robot_uid, args.obs_mode):.2f} s")
+    print(f"Done. Caches written to {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    import tyro
+
+    main(tyro.cli(Args))
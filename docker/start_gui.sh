@@ -1,5 +1,9 @@
 xhost +
 
+# use the image with baked shader/asset caches (docker/warmup.sh) if it has been built
+IMAGE=maniskill:warm
+sudo docker image inspect $IMAGE > /dev/null 2>&1 || IMAGE=maniskill:latest
+
 sudo docker run -it --rm \
 --gpus all \
 --shm-size=8g \
@@ -14,5 +18,5 @@ sudo docker run -it --rm \
 -v $HOME/.Xauthority:/root/.Xauthority:rw \
 -v ${PWD}:/workspace \
 --name maniskill \
-maniskill:latest \
+$IMAGE \
 /bin/bash
\ No newline at end of file
@@ -1,8 +1,13 @@
+# use the image with baked shader/asset caches (docker/warmup.sh) if it has been built
+IMAGE=maniskill:warm
+sudo docker image inspect $IMAGE > /dev/null 2>&1 || IMAGE=maniskill:latest
+
 sudo docker run -it --rm \
 --gpus all \
 --shm-size=8g \
 -e NVIDIA_DRIVER_CAPABILITIES=compute,utility,graphics \
+-p 127.0.0.1:8080:8080 \
 -v ${PWD}:/workspace \
 --name maniskill \
-maniskill:latest \
+$IMAGE \
 /bin/bash
\ No newline at end of file
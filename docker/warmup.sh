@@ -0,0 +1,10 @@
+# Run the renderer/asset warm-up once in a GPU container and bake the caches into maniskill:warm
+# (start_headless.sh / start_gui.sh use maniskill:warm when it exists)
+sudo docker run --gpus all \
+-e NVIDIA_DRIVER_CAPABILITIES=compute,utility,graphics \
+-v ${PWD}:/workspace \
+--name maniskill_warmup \
+maniskill:latest \
+python custom_robots/warmup.py --cache-dir /opt/render_cache && \
+sudo docker commit --change 'CMD ["/bin/bash"]' maniskill_warmup maniskill:warm
+sudo docker rm maniskill_warmup